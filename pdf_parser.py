@@ -1,59 +1,21 @@
 """
 PDF parsing utilities for clinical trial documents.
+
+Text extraction and the pooled OpenAI client are inherited from
+src.utils.pdf_parser; this module only overrides the criteria prompt and
+its fallback defaults.
 """
-import pdfplumber
-import openai
 import json
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict
+
+from src.utils.pdf_parser import PDFParser as BasePDFParser
 
 logger = logging.getLogger(__name__)
 
-class PDFParser:
+class PDFParser(BasePDFParser):
     """Handles PDF parsing and AI-powered content extraction."""
     
-    def __init__(self, openai_api_key: str):
-        self.client = openai.OpenAI(api_key=openai_api_key)
-        logger.info("PDFParser initialized with new OpenAI client")
-    
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract all text from PDF file."""
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                all_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-            logger.info(f"Extracted {len(all_text)} characters from {pdf_path}")
-            return all_text
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF {pdf_path}: {e}")
-            raise
-    
-    def extract_criteria_sections(self, pdf_path: str) -> Tuple[List[str], List[str]]:
-        """Extract inclusion and exclusion criteria sections."""
-        inclusion = []
-        exclusion = []
-        
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if not text:
-                        continue
-                    
-                    lines = text.split("\n")
-                    for line in lines:
-                        line_lower = line.lower().strip()
-                        if "inclusion" in line_lower and len(line.strip()) > 10:
-                            inclusion.append(line.strip())
-                        elif "exclusion" in line_lower and len(line.strip()) > 10:
-                            exclusion.append(line.strip())
-            
-            logger.info(f"Extracted {len(inclusion)} inclusion and {len(exclusion)} exclusion criteria")
-            return inclusion, exclusion
-            
-        except Exception as e:
-            logger.error(f"Error extracting criteria from PDF {pdf_path}: {e}")
-            return [], []
-    
     def interpret_criteria_with_ai(self, text: str) -> Dict:
         """Use AI to interpret and structure trial criteria."""
         prompt = f"""
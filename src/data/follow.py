@@ -0,0 +1,187 @@
+"""
+Incremental reading of an append-only patient CSV.
+
+CSVFollower remembers the byte offset and row count it has consumed, so
+each poll parses only the rows appended since the last one. The position
+can be checkpointed to a small JSON state file to survive restarts.
+
+A poll reads at most max_bytes (plus the rest of a line that is longer),
+and the rows it returns are only consumed once the caller commits them.
+A file that was rotated (new inode), truncated or rewritten in place is
+detected and read again from the top.
+"""
+import csv
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 16 * 2**20
+
+# Bytes just before the offset, remembered to detect in-place rewrites
+TAIL_BYTES = 64
+
+# Fixed patient column dtypes, so every chunk has the same types whether or
+# not it happens to contain blank cells. These are the dtypes DataLoader
+# infers, widened to hold missing values.
+PATIENT_DTYPES = {
+    "patient_id": "str",
+    "age": "float64",
+    "gender": "str",
+    "stage": "str",
+    "mutation_status": "str",
+    "smoker": "boolean",
+    "performance_status": "float64",
+}
+
+
+class CSVFollower:
+    """Tails a CSV file, returning only newly appended complete rows."""
+
+    def __init__(self, filepath: str, state_path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.filepath = Path(filepath)
+        self.state_path = Path(state_path) if state_path else None
+        self.max_bytes = max_bytes
+        self.offset = 0
+        self.rows = 0
+        self.header: Optional[List[str]] = None
+        self.inode: Optional[int] = None
+        self.mtime_ns: Optional[int] = None
+        self.tail = b""
+        self._pending: Optional[Dict] = None
+
+        if self.state_path and self.state_path.exists():
+            self._load_state()
+        logger.info(f"CSVFollower on {self.filepath} at offset {self.offset} ({self.rows} rows)")
+
+    def read_new_rows(self) -> pd.DataFrame:
+        """
+        Parse rows appended since the last commit.
+
+        A trailing line without a newline is treated as still being
+        written and is left for the next call. The position only moves on
+        once commit() is called, after the caller has handled the rows;
+        calling again without committing returns the same rows. Positions
+        that carry no rows (e.g. just the header) are committed directly.
+        """
+        self._pending = None
+        stat = self.filepath.stat()
+
+        with open(self.filepath, "rb") as f:
+            reason = self._restart_reason(f, stat)
+            if reason:
+                logger.warning(f"{self.filepath} {reason}; restarting from the top")
+                self.offset, self.rows, self.header, self.tail = 0, 0, None, b""
+            self.inode = stat.st_ino
+
+            f.seek(self.offset)
+            data = b""
+            while True:
+                block = f.read(self.max_bytes)
+                data += block
+                end = data.rfind(b"\n") + 1
+                # Keep reading only while a single line is longer than max_bytes
+                if end or len(block) < self.max_bytes:
+                    break
+
+        if end == 0:
+            return self._empty()
+        data = data[:end]
+
+        header = self.header
+        header_bytes = 0
+        if header is None:
+            header_bytes = data.index(b"\n") + 1
+            # utf-8-sig drops a byte order mark, as pd.read_csv does for the whole file
+            header = next(csv.reader(data[:header_bytes].decode("utf-8-sig").splitlines()))
+
+        rows = data[header_bytes:]
+        new_rows = self._parse_rows(rows, header) if rows.strip() else None
+        self._pending = {
+            "offset": self.offset + len(data),
+            "rows": self.rows + (len(new_rows) if new_rows is not None else 0),
+            "header": header,
+            "mtime_ns": stat.st_mtime_ns,
+            "tail": (self.tail + data)[-TAIL_BYTES:],
+        }
+
+        if new_rows is None:
+            self.commit()
+            return self._empty()
+
+        logger.info(f"Read {len(new_rows)} new rows from {self.filepath} (total {self._pending['rows']})")
+        return new_rows
+
+    def commit(self) -> None:
+        """Mark the rows returned by the last read_new_rows() as handled."""
+        if self._pending is None:
+            return
+        self.offset = self._pending["offset"]
+        self.rows = self._pending["rows"]
+        self.header = self._pending["header"]
+        self.mtime_ns = self._pending["mtime_ns"]
+        self.tail = self._pending["tail"]
+        self._pending = None
+
+    def _parse_rows(self, rows: bytes, header: List[str]) -> pd.DataFrame:
+        dtypes = {column: dtype for column, dtype in PATIENT_DTYPES.items() if column in header}
+        try:
+            return pd.read_csv(io.BytesIO(rows), header=None, names=header, dtype=dtypes)
+        except ValueError as e:
+            # Malformed values are left for validation rather than stalling the follower
+            logger.warning(f"Rows in {self.filepath} do not fit the patient dtypes ({e}); parsing untyped")
+            return pd.read_csv(io.BytesIO(rows), header=None, names=header)
+
+    def _restart_reason(self, f, stat) -> Optional[str]:
+        """Why the file can no longer be continued from the offset, if it can't."""
+        if self.offset == 0:
+            return None
+        if self.inode is not None and stat.st_ino != self.inode:
+            return "was replaced (new inode)"
+        if stat.st_size < self.offset:
+            return f"shrank below offset {self.offset}"
+        if self.mtime_ns is not None and stat.st_mtime_ns < self.mtime_ns:
+            return "has an older modification time"
+        if self.tail:
+            f.seek(self.offset - len(self.tail))
+            if f.read(len(self.tail)) != self.tail:
+                return "was rewritten"
+        return None
+
+    def state(self) -> Dict:
+        return {
+            "offset": self.offset,
+            "rows": self.rows,
+            "header": self.header,
+            "inode": self.inode,
+            "mtime_ns": self.mtime_ns,
+            "tail": self.tail.hex(),
+        }
+
+    def _empty(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=self.header or [])
+
+    def _load_state(self) -> None:
+        with open(self.state_path, "r") as f:
+            state = json.load(f)
+        self.offset = state["offset"]
+        self.rows = state["rows"]
+        self.header = state["header"]
+        # Older state files only have the position
+        self.inode = state.get("inode")
+        self.mtime_ns = state.get("mtime_ns")
+        self.tail = bytes.fromhex(state.get("tail", ""))
+
+    def checkpoint(self) -> None:
+        """Persist the committed position to the state file, if configured."""
+        if self.state_path is None:
+            return
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.state(), f)
+        tmp_path.replace(self.state_path)
@@ -3,24 +3,62 @@ Data loading and management functions.
 """
 import pandas as pd
 import json
+import hashlib
 import logging
 from pathlib import Path
 from typing import Dict, Optional, List
 
+from src.data.manifest import TrialManifest
+from src.data.storage import StorageBackend
+from src.data.validation import CohortValidator
+from src.matching.search import TrialSearchIndex
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_TRIAL_FILES = [
+    "trials/egfr.json", 
+    "trials/pd-l1.json", 
+    "trials/kras_g12c.json", 
+    "trials/combo.json", 
+    "trials/early_stage.json"
+]
+
 class DataLoader:
     """Handles loading of patient and trial data."""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", backend: Optional[StorageBackend] = None,
+                 search_index: Optional[TrialSearchIndex] = None):
         self.data_dir = Path(data_dir)
+        self.backend = backend
+        self.search_index = search_index
         logger.info(f"DataLoader initialized with data_dir: {data_dir}")
     
-    def load_patients(self, filename: str = "sample_patients.csv") -> pd.DataFrame:
-        """Load patient data from CSV file."""
+    def load_patients(self, filename: str = "sample_patients.csv",
+                      validator: Optional[CohortValidator] = None, chunksize: int = 100_000) -> pd.DataFrame:
+        """
+        Load patient data from CSV file, or from the storage backend if set.
+        
+        With a validator, the CSV is read chunk by chunk and each chunk is
+        validated as it arrives; violations are collected in the validator.
+        """
+        if self.backend is not None:
+            patients = self.backend.load_patients()
+            logger.info(f"Loaded {len(patients)} patients from {type(self.backend).__name__}")
+            if validator is not None:
+                validator.validate_chunk(patients)
+            return patients
+        
         try:
             filepath = self.data_dir / filename
-            patients = pd.read_csv(filepath)
+            if validator is None:
+                patients = pd.read_csv(filepath)
+            else:
+                chunks = []
+                for chunk in pd.read_csv(filepath, chunksize=chunksize):
+                    validator.validate_chunk(chunk)
+                    chunks.append(chunk)
+                patients = pd.concat(chunks, ignore_index=True) if chunks else pd.read_csv(filepath)
+                logger.info(f"Validated {filepath}: {validator.summary()}")
             logger.info(f"Loaded {len(patients)} patients from {filepath}")
             return patients
         except Exception as e:
@@ -28,15 +66,22 @@ class DataLoader:
             raise
     
     def load_trials(self, trial_files: Optional[List[str]] = None) -> Dict:
-        """Load trial data from JSON files."""
+        """
+        Load trial data from JSON files, or from the storage backend if set.
+        
+        Loaded trials are also indexed in search_index when one is set.
+        """
+        trials = self._read_trials(trial_files)
+        if self.search_index is not None:
+            self.search_index.apply_trial_changes(trials, [])
+        return trials
+    
+    def _read_trials(self, trial_files: Optional[List[str]]) -> Dict:
+        if self.backend is not None:
+            return self.backend.load_trials(trial_files)
+        
         if trial_files is None:
-            trial_files = [
-                "trials/egfr.json", 
-                "trials/pd-l1.json", 
-                "trials/kras_g12c.json", 
-                "trials/combo.json", 
-                "trials/early_stage.json"
-            ]
+            trial_files = DEFAULT_TRIAL_FILES
         
         trials = {}
         
@@ -55,6 +100,76 @@ class DataLoader:
         logger.info(f"Loaded {len(trials)} total trials")
         return trials
     
+    def discover_trial_files(self, pattern: str = "trials/*.json") -> List[str]:
+        """List trial files under data_dir, relative to it, in sorted order."""
+        return sorted(path.relative_to(self.data_dir).as_posix() for path in self.data_dir.glob(pattern))
+    
+    def reload_trials(self, manifest: TrialManifest, trial_files: Optional[List[str]] = None) -> Dict:
+        """
+        Re-parse only trial files that were added or changed since the last reload.
+        
+        With a storage backend, stored trials are compared by the content
+        hashes the backend reports and only added or changed ones are loaded.
+        
+        Args:
+            manifest: TrialManifest holding the state of the previous reload
+            trial_files: Trial files to track; when None, discovered on disk
+                (or every stored trial with a backend)
+            
+        Returns:
+            Dictionary with "updated" (trial file -> trial data for added or
+            changed files) and "removed" (list of trial files)
+        """
+        if self.backend is not None:
+            changes = manifest.diff_hashes(self.backend.trial_hashes(trial_files))
+            changed_files = changes["added"] + changes["changed"]
+            updated = self.backend.load_trials(changed_files) if changed_files else {}
+        else:
+            if trial_files is None:
+                trial_files = self.discover_trial_files()
+            
+            changes = manifest.diff(self.data_dir, trial_files)
+            updated = {}
+            
+            for trial_file in changes["added"] + changes["changed"]:
+                try:
+                    with open(self.data_dir / trial_file, 'r') as f:
+                        updated[trial_file] = json.load(f)
+                except Exception as e:
+                    logger.error(f"Error reloading trial from {trial_file}: {e}")
+        
+        if self.search_index is not None and (updated or changes["removed"]):
+            self.search_index.apply_trial_changes(updated, changes["removed"])
+        
+        if updated or changes["removed"]:
+            logger.info(
+                f"Trial reload: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+                f"{len(changes['removed'])} removed"
+            )
+        return {"updated": updated, "removed": changes["removed"]}
+    
+    def data_version(self, filename: str = "sample_patients.csv",
+                     trial_files: Optional[List[str]] = None) -> str:
+        """
+        Cheap fingerprint of the patient and trial files on disk.
+        
+        Built from file sizes and modification times, so it changes whenever
+        a source file is rewritten without reading any file contents. Trial
+        files are discovered when not given, so added or removed trials
+        change the version too.
+        """
+        if trial_files is None:
+            trial_files = self.discover_trial_files()
+        
+        parts = []
+        for relative_path in [filename] + list(trial_files):
+            try:
+                stat = (self.data_dir / relative_path).stat()
+                parts.append(f"{relative_path}:{stat.st_mtime_ns}:{stat.st_size}")
+            except FileNotFoundError:
+                parts.append(f"{relative_path}:missing")
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:16]
+    
     def validate_patient_data(self, patients: pd.DataFrame) -> bool:
         """Validate patient data structure."""
         required_columns = [
@@ -69,4 +184,20 @@ class DataLoader:
         
         logger.info("Patient data validation passed")
         return True
+    
+    def validate_patient_values(self, patients: pd.DataFrame) -> pd.DataFrame:
+        """
+        Check patient values: domains, types and patient_id uniqueness.
+        
+        Returns:
+            DataFrame with one row per violated rule (rule, column, violations,
+            sample_ids); empty when every value is valid
+        """
+        validator = CohortValidator()
+        validator.validate_chunk(patients)
+        if validator.valid:
+            logger.info("Patient value validation passed")
+        else:
+            logger.warning(f"Patient value validation: {validator.summary()}")
+        return validator.report()
 
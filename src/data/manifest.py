@@ -0,0 +1,150 @@
+"""
+Change detection for trial definition files.
+
+TrialManifest records (path, mtime, size, content hash) for every trial
+file. A rescan only stats the files and hashes the ones whose stat
+changed, so unchanged trials are never re-read or re-parsed.
+TrialReloader applies the resulting changes to a running TrialMatchEngine.
+"""
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def file_fingerprint(filepath: Path, content_hash: Optional[str] = None) -> Dict:
+    """Stat a file and (unless given) hash its contents."""
+    stat = filepath.stat()
+    if content_hash is None:
+        content_hash = hashlib.sha256(filepath.read_bytes()).hexdigest()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": content_hash}
+
+
+class TrialManifest:
+    """Tracks the last seen fingerprint of each trial file."""
+
+    def __init__(self):
+        self.entries: Dict[str, Dict] = {}
+
+    def diff(self, data_dir: Path, trial_files: List[str]) -> Dict[str, List[str]]:
+        """
+        Compare trial files on disk to the manifest and record the new state.
+
+        Returns:
+            Dictionary with "added", "changed" and "removed" trial file lists
+        """
+        changes = {"added": [], "changed": [], "removed": []}
+        seen = set()
+
+        for trial_file in trial_files:
+            filepath = data_dir / trial_file
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                continue
+            seen.add(trial_file)
+
+            previous = self.entries.get(trial_file)
+            if previous and (previous["mtime_ns"], previous["size"]) == (stat.st_mtime_ns, stat.st_size):
+                continue
+
+            fingerprint = file_fingerprint(filepath)
+            self.entries[trial_file] = fingerprint
+            if previous is None:
+                changes["added"].append(trial_file)
+            elif previous["sha256"] != fingerprint["sha256"]:
+                changes["changed"].append(trial_file)
+
+        for trial_file in list(self.entries):
+            if trial_file not in seen:
+                del self.entries[trial_file]
+                changes["removed"].append(trial_file)
+
+        return changes
+
+    def diff_hashes(self, content_hashes: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Compare content hashes reported by a storage backend to the manifest.
+
+        Like diff(), but for trials that are not files on disk.
+
+        Returns:
+            Dictionary with "added", "changed" and "removed" trial file lists
+        """
+        changes = {"added": [], "changed": [], "removed": []}
+
+        for trial_file, content_hash in content_hashes.items():
+            previous = self.entries.get(trial_file)
+            if previous is None:
+                changes["added"].append(trial_file)
+            elif previous["sha256"] != content_hash:
+                changes["changed"].append(trial_file)
+            self.entries[trial_file] = {"sha256": content_hash}
+
+        for trial_file in list(self.entries):
+            if trial_file not in content_hashes:
+                del self.entries[trial_file]
+                changes["removed"].append(trial_file)
+
+        return changes
+
+
+class TrialReloader:
+    """Keeps a TrialMatchEngine in sync with the trial files on disk (or the loader's storage backend)."""
+
+    def __init__(self, loader, engine, trial_files: Optional[List[str]] = None,
+                 min_interval: float = 2.0):
+        """
+        Args:
+            loader: DataLoader used to parse trial files
+            engine: TrialMatchEngine receiving incremental updates
+            trial_files: Fixed list of trial files; discovered from the
+                trials directory on each refresh when None
+            min_interval: Minimum seconds between two disk scans
+        """
+        self.loader = loader
+        self.engine = engine
+        self.trial_files = trial_files
+        self.min_interval = min_interval
+        self.manifest = TrialManifest()
+        self._listeners: List[Callable[[Dict, List[str]], None]] = []
+        self._last_scan = float("-inf")
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[Dict, List[str]], None]) -> None:
+        """
+        Register listener(updated, removed) to receive every applied change.
+
+        The listener is first called with the engine's current trials so
+        it starts in sync without missing a concurrent refresh.
+        """
+        with self._lock:
+            listener(dict(self.engine.trials), [])
+            self._listeners.append(listener)
+
+    def refresh(self, force: bool = False) -> Optional[Dict]:
+        """
+        Rescan trial files and apply any changes to the engine.
+
+        Returns:
+            The applied changes, or None if the scan was throttled
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_scan < self.min_interval:
+                return None
+            self._last_scan = now
+
+            changes = self.loader.reload_trials(self.manifest, self.trial_files)
+            if changes["updated"] or changes["removed"]:
+                self.engine.apply_trial_changes(changes["updated"], changes["removed"])
+                for listener in self._listeners:
+                    try:
+                        listener(changes["updated"], changes["removed"])
+                    except Exception as e:
+                        logger.error(f"Error in trial reload listener: {e}")
+            return changes
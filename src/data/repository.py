@@ -0,0 +1,73 @@
+"""
+In-memory patient repository with constant-time id lookup and prefix search.
+"""
+import bisect
+import logging
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class PatientRepository:
+    """Indexes a patient DataFrame by patient_id for fast row access."""
+
+    def __init__(self, patients: pd.DataFrame):
+        self.patients = patients.reset_index(drop=True)
+        self._positions: Dict[str, int] = {}
+        self._sorted_keys: List[str] = []
+        self._sorted_ids: List[str] = []
+        self._build_index()
+        logger.info(f"PatientRepository indexed {len(self._positions)} patients")
+
+    def _build_index(self) -> None:
+        """Build the id->row hash index and the sorted prefix-search keys."""
+        duplicates = 0
+        for position, patient_id in enumerate(self.patients["patient_id"].astype(str)):
+            if patient_id in self._positions:
+                duplicates += 1
+                continue
+            self._positions[patient_id] = position
+
+        if duplicates:
+            logger.warning(f"Ignored {duplicates} duplicate patient_id rows (first occurrence kept)")
+
+        entries = sorted((patient_id.casefold(), patient_id) for patient_id in self._positions)
+        self._sorted_keys = [key for key, _ in entries]
+        self._sorted_ids = [patient_id for _, patient_id in entries]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, patient_id) -> bool:
+        return str(patient_id) in self._positions
+
+    def get(self, patient_id) -> Optional[pd.Series]:
+        """Return the patient row for an id, or None if it is unknown."""
+        position = self._positions.get(str(patient_id))
+        if position is None:
+            return None
+        return self.patients.iloc[position]
+
+    def search(self, prefix: str = "", limit: int = 50) -> List[str]:
+        """
+        Return up to `limit` patient ids starting with `prefix` (case-insensitive).
+
+        Args:
+            prefix: Leading characters of the patient id; empty matches all
+            limit: Maximum number of ids to return
+
+        Returns:
+            Sorted list of matching patient ids
+        """
+        key = (prefix or "").strip().casefold()
+        start = bisect.bisect_left(self._sorted_keys, key)
+        results = []
+
+        for index in range(start, len(self._sorted_keys)):
+            if len(results) >= limit or not self._sorted_keys[index].startswith(key):
+                break
+            results.append(self._sorted_ids[index])
+
+        return results
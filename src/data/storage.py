@@ -0,0 +1,327 @@
+"""
+Pluggable storage backends for patient and trial data.
+
+DataLoader reads the flat CSV/JSON files by default. A StorageBackend can
+be passed to it instead so data comes from an indexed local store.
+SQLiteBackend is the first implementation:
+
+    python -m src.data.storage --db trialmatch.db   # bulk import data/
+"""
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PATIENT_COLUMNS = [
+    'patient_id', 'age', 'gender', 'stage',
+    'mutation_status', 'smoker', 'performance_status'
+]
+
+
+class StorageBackend(ABC):
+    """Interface implemented by patient/trial storage backends."""
+
+    @abstractmethod
+    def save_patients(self, patients: pd.DataFrame, replace: bool = False) -> int:
+        """Insert or update patient rows, returning the number written."""
+
+    @abstractmethod
+    def save_trials(self, trials: Dict, replace: bool = False) -> int:
+        """Insert or update trials keyed by trial file, returning the number written."""
+
+    @abstractmethod
+    def load_patients(self) -> pd.DataFrame:
+        """Return every stored patient."""
+
+    @abstractmethod
+    def load_trials(self, trial_files: Optional[List[str]] = None) -> Dict:
+        """Return stored trials keyed by trial file, optionally filtered."""
+
+    def query_patients(self, trial_criteria: Dict) -> pd.DataFrame:
+        """
+        Return candidate patients for a trial.
+
+        Backends may push down any subset of the criteria; the result must
+        be a superset of the eligible patients; the engine re-checks it.
+        """
+        return self.load_patients()
+
+    def trial_hashes(self, trial_files: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Content hash of each stored trial, keyed by trial file.
+
+        DataLoader.reload_trials compares these to find changed trials. The
+        default re-serializes every trial; backends can override it with
+        something cheaper.
+        """
+        return {
+            trial_file: hashlib.sha256(json.dumps(trial, sort_keys=True).encode()).hexdigest()
+            for trial_file, trial in self.load_trials(trial_files).items()
+        }
+
+
+class SQLiteBackend(StorageBackend):
+    """Stores patients and trials in indexed SQLite tables."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS patients (
+            patient_id TEXT PRIMARY KEY,
+            age INTEGER,
+            gender TEXT,
+            stage TEXT,
+            mutation_status TEXT,
+            smoker INTEGER,
+            performance_status INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_patients_stage ON patients(stage);
+        CREATE INDEX IF NOT EXISTS idx_patients_mutation ON patients(mutation_status);
+        CREATE INDEX IF NOT EXISTS idx_patients_ps ON patients(performance_status);
+
+        CREATE TABLE IF NOT EXISTS trials (
+            trial_file TEXT PRIMARY KEY,
+            trial_id TEXT,
+            title TEXT,
+            description TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_trials_trial_id ON trials(trial_id);
+    """
+
+    def __init__(self, db_path: str = "trialmatch.db"):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        logger.info(f"SQLiteBackend initialized with db: {self.db_path}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def save_patients(self, patients: pd.DataFrame, replace: bool = False) -> int:
+        """
+        Insert or update patient rows in a single transaction.
+
+        Raises:
+            ValueError: If required columns are missing or a patient_id
+                appears more than once in patients
+        """
+        rows = self._patient_rows(patients)
+        placeholders = ", ".join("?" for _ in PATIENT_COLUMNS)
+
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM patients")
+            # Only rows saved earlier are updated; duplicates within the batch were rejected above
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO patients ({', '.join(PATIENT_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+        logger.info(f"Saved {len(rows)} patients to {self.db_path}")
+        return len(rows)
+
+    def _patient_rows(self, patients: pd.DataFrame) -> List[Tuple]:
+        missing_columns = set(PATIENT_COLUMNS) - set(patients.columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        duplicates = patients.loc[patients["patient_id"].duplicated(), "patient_id"]
+        if not duplicates.empty:
+            raise ValueError(
+                f"{len(duplicates)} duplicate patient_id values, e.g. {duplicates.astype(str).unique()[:5].tolist()}"
+            )
+
+        return [
+            tuple(_to_sql_value(value) for value in row)
+            for row in patients[PATIENT_COLUMNS].itertuples(index=False, name=None)
+        ]
+
+    def import_patients_csv(self, filepath: str, chunksize: int = 100_000, validator=None) -> int:
+        """
+        Bulk import a patient CSV chunk by chunk, replacing existing rows.
+
+        The import is one transaction of plain INSERTs, so a patient_id that
+        appears twice anywhere in the file aborts it and the previous rows
+        are kept.
+
+        A CohortValidator, if given, checks each chunk before it is saved.
+        Other invalid rows are still imported; violations are collected in
+        the validator.
+
+        Raises:
+            ValueError: If the file contains duplicate patient_id values
+        """
+        placeholders = ", ".join("?" for _ in PATIENT_COLUMNS)
+        total = 0
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM patients")
+            for chunk in pd.read_csv(filepath, chunksize=chunksize):
+                if validator is not None:
+                    validator.validate_chunk(chunk)
+                rows = self._patient_rows(chunk)
+                try:
+                    self._conn.executemany(
+                        f"INSERT INTO patients ({', '.join(PATIENT_COLUMNS)}) VALUES ({placeholders})",
+                        rows
+                    )
+                except sqlite3.IntegrityError as e:
+                    raise ValueError(f"Duplicate patient_id in {filepath} near row {total + 1}: {e}") from e
+                total += len(rows)
+        logger.info(f"Imported {total} patients from {filepath}")
+        return total
+
+    def save_trials(self, trials: Dict, replace: bool = False) -> int:
+        rows = [
+            (
+                trial_file,
+                trial.get("trial_id"),
+                trial.get("title"),
+                trial.get("description"),
+                json.dumps(trial)
+            )
+            for trial_file, trial in trials.items()
+        ]
+
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM trials")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO trials (trial_file, trial_id, title, description, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"Saved {len(rows)} trials to {self.db_path}")
+        return len(rows)
+
+    def delete_trials(self, trial_files: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM trials WHERE trial_file = ?", [(f,) for f in trial_files])
+
+    def load_patients(self) -> pd.DataFrame:
+        return self._read_patients("SELECT * FROM patients", [])
+
+    def load_trials(self, trial_files: Optional[List[str]] = None) -> Dict:
+        sql = "SELECT trial_file, data FROM trials"
+        params: List[Any] = []
+        if trial_files is not None:
+            sql += f" WHERE trial_file IN ({', '.join('?' for _ in trial_files)})"
+            params = list(trial_files)
+
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY rowid", params).fetchall()
+
+        trials = {trial_file: json.loads(data) for trial_file, data in rows}
+        logger.info(f"Loaded {len(trials)} trials from {self.db_path}")
+        return trials
+
+    def trial_hashes(self, trial_files: Optional[List[str]] = None) -> Dict[str, str]:
+        """Hash the stored JSON text of each trial without parsing it."""
+        sql = "SELECT trial_file, data FROM trials"
+        params: List[Any] = []
+        if trial_files is not None:
+            sql += f" WHERE trial_file IN ({', '.join('?' for _ in trial_files)})"
+            params = list(trial_files)
+
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY rowid", params).fetchall()
+        return {trial_file: hashlib.sha256(data.encode()).hexdigest() for trial_file, data in rows}
+
+    def query_patients(self, trial_criteria: Dict) -> pd.DataFrame:
+        """Select candidates with the stage, mutation and PS criteria pushed into SQL."""
+        where, params = build_patient_filter(trial_criteria)
+        sql = "SELECT * FROM patients"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._read_patients(sql, params)
+
+    def _read_patients(self, sql: str, params: List[Any]) -> pd.DataFrame:
+        with self._lock:
+            patients = pd.read_sql_query(sql + " ORDER BY rowid", self._conn, params=params)
+        patients['smoker'] = patients['smoker'].map(lambda v: v if pd.isna(v) else bool(v))
+        return patients
+
+
+def build_patient_filter(trial_criteria: Dict) -> Tuple[List[str], List[Any]]:
+    """
+    Translate simple criteria into SQL WHERE clauses.
+
+    Criteria whose values are not plain scalars or lists are left out, so
+    the filter only ever narrows to a superset of eligible patients.
+    """
+    where: List[str] = []
+    params: List[Any] = []
+
+    stages = trial_criteria.get("stage")
+    # A single stage string is a substring test in the engine, so only lists are pushed down
+    if "stage" in trial_criteria and isinstance(stages, (list, tuple, set)) and _is_value_list(stages):
+        stages = _as_list(stages)
+        where.append(f"stage IN ({', '.join('?' for _ in stages)})" if stages else "0")
+        params.extend(stages)
+
+    mutation_required = trial_criteria.get("mutation_required")
+    if mutation_required and _is_value_list(mutation_required):
+        mutations = _as_list(mutation_required)
+        where.append(f"mutation_status IN ({', '.join('?' for _ in mutations)})")
+        params.extend(mutations)
+
+    ps_max = trial_criteria.get("performance_status_max", 2)
+    if isinstance(ps_max, (int, float)) and not isinstance(ps_max, bool):
+        # NULL performance status passes the engine's "> max" check
+        where.append("(performance_status IS NULL OR performance_status <= ?)")
+        params.append(ps_max)
+
+    return where, params
+
+
+def _as_list(value: Any) -> List:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _is_value_list(value: Any) -> bool:
+    return all(isinstance(v, (str, int, float)) for v in _as_list(value))
+
+
+def _to_sql_value(value: Any) -> Any:
+    """Convert pandas/numpy scalars to types sqlite3 understands."""
+    if pd.isna(value):
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Bulk import the CSV/JSON data directory into a SQLite database."""
+    from src.data.loader import DataLoader
+    from src.data.validation import CohortValidator
+
+    parser = argparse.ArgumentParser(description="Import patient and trial data into SQLite")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--patients-file", default="sample_patients.csv")
+    parser.add_argument("--db", default="trialmatch.db")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    backend = SQLiteBackend(args.db)
+    validator = CohortValidator()
+    patient_count = backend.import_patients_csv(Path(args.data_dir) / args.patients_file, validator=validator)
+    if not validator.valid:
+        print(f"Validation: {validator.summary()}")
+    trial_count = backend.save_trials(DataLoader(args.data_dir).load_trials(), replace=True)
+    backend.close()
+    print(f"Imported {patient_count} patients and {trial_count} trials into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
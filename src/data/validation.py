@@ -0,0 +1,162 @@
+"""
+Value-level validation of patient cohorts.
+
+CohortValidator checks domains, types and uniqueness with vectorized
+column operations, one pass per chunk, so very large registries can be
+validated while they are read. Violations are aggregated into a compact
+report of counts per rule with a few sample patient ids per rule:
+
+    validator = CohortValidator()
+    for chunk in pd.read_csv(path, chunksize=100_000):
+        validator.validate_chunk(chunk)
+    validator.report()
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+VALID_STAGES = frozenset([
+    "0", "I", "IA", "IB", "II", "IIA", "IIB", "III", "IIIA", "IIIB", "IIIC", "IV", "IVA", "IVB"
+])
+VALID_GENDERS = frozenset(["Male", "Female"])
+BOOLEAN_STRINGS = ["True", "False", "true", "false"]
+
+# column -> (minimum, maximum, integers only)
+NUMERIC_RANGES: Dict[str, Tuple[float, float, bool]] = {
+    "age": (0, 120, False),
+    "performance_status": (0, 4, True),
+}
+
+REQUIRED_COLUMNS = ['patient_id', 'age', 'gender', 'stage', 'mutation_status', 'smoker', 'performance_status']
+
+REPORT_COLUMNS = ["rule", "column", "violations", "sample_ids"]
+
+
+class CohortValidator:
+    """Accumulates per-rule violation counts and sample ids over one or more chunks."""
+
+    def __init__(self, stages=VALID_STAGES, genders=VALID_GENDERS, sample_size: int = 5):
+        self.stages = list(stages)
+        self.genders = list(genders)
+        self.sample_size = sample_size
+        self.rows = 0
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._samples: Dict[Tuple[str, str], List[str]] = {}
+        # Sorted 64-bit hashes of every patient_id seen in earlier chunks
+        self._seen_ids = np.empty(0, dtype=np.uint64)
+
+    def _record(self, rule: str, column: str, mask: pd.Series, chunk: pd.DataFrame) -> None:
+        count = int(mask.sum())
+        if not count:
+            return
+        key = (rule, column)
+        self._counts[key] = self._counts.get(key, 0) + count
+        samples = self._samples.setdefault(key, [])
+        if len(samples) < self.sample_size:
+            rows = chunk.loc[mask].head(self.sample_size - len(samples))
+            samples.extend(_sample_labels(rows))
+
+    def validate_chunk(self, chunk: pd.DataFrame) -> pd.Series:
+        """
+        Validate one chunk and add its violations to the running report.
+
+        Returns:
+            Boolean Series aligned with chunk.index, True for rows without violations
+        """
+        self.rows += len(chunk)
+        invalid = pd.Series(False, index=chunk.index)
+
+        def check(rule: str, column: str, mask: pd.Series) -> None:
+            nonlocal invalid
+            self._record(rule, column, mask, chunk)
+            invalid |= mask
+
+        all_rows = pd.Series(True, index=chunk.index)
+        for column in REQUIRED_COLUMNS:
+            if column not in chunk.columns:
+                check("missing_column", column, all_rows)
+
+        if "patient_id" in chunk.columns:
+            ids = chunk["patient_id"]
+            check("missing", "patient_id", ids.isna())
+            hashes = pd.util.hash_pandas_object(ids.dropna().astype(str), index=False)
+            positions = np.searchsorted(self._seen_ids, hashes.values)
+            seen = self._seen_ids[positions.clip(max=len(self._seen_ids) - 1)] == hashes.values \
+                if len(self._seen_ids) else np.zeros(len(hashes), dtype=bool)
+            duplicate = hashes.duplicated() | seen
+            check("duplicate", "patient_id", duplicate.reindex(chunk.index, fill_value=False))
+            new_ids = np.sort(hashes.values[~duplicate.values])
+            self._seen_ids = np.insert(self._seen_ids, np.searchsorted(self._seen_ids, new_ids), new_ids)
+
+        for column, (minimum, maximum, integer) in NUMERIC_RANGES.items():
+            if column not in chunk.columns:
+                continue
+            raw = chunk[column]
+            if pd.api.types.is_bool_dtype(raw):
+                # Booleans are numeric to pandas but never a valid age or PS
+                values = pd.Series(float("nan"), index=raw.index)
+            elif pd.api.types.is_numeric_dtype(raw):
+                values = raw
+            else:
+                values = pd.to_numeric(raw.mask(raw.map(lambda v: isinstance(v, bool))), errors="coerce")
+            check("missing", column, raw.isna())
+            check("type", column, values.isna() & raw.notna())
+            out_of_range = (values < minimum) | (values > maximum)
+            if integer:
+                out_of_range |= values.notna() & (values % 1 != 0)
+            check("range", column, out_of_range)
+
+        for column, domain in [("stage", self.stages), ("gender", self.genders)]:
+            if column in chunk.columns:
+                check("domain", column, ~chunk[column].isin(domain))
+
+        if "smoker" in chunk.columns:
+            smoker = chunk["smoker"]
+            if pd.api.types.is_numeric_dtype(smoker) and not pd.api.types.is_bool_dtype(smoker):
+                # 1/0 compare equal to True/False but are not booleans
+                check("type", "smoker", pd.Series(True, index=chunk.index))
+            elif not pd.api.types.is_bool_dtype(smoker):
+                is_bool = smoker.map(lambda v: isinstance(v, (bool, np.bool_)))
+                check("type", "smoker", ~(is_bool | smoker.isin(BOOLEAN_STRINGS)))
+
+        if "mutation_status" in chunk.columns:
+            mutation = chunk["mutation_status"]
+            if not (pd.api.types.is_string_dtype(mutation) or mutation.isna().all()):
+                check("type", "mutation_status", mutation.notna() & ~mutation.map(lambda v: isinstance(v, str)))
+
+        return ~invalid
+
+    @property
+    def valid(self) -> bool:
+        return not self._counts
+
+    def report(self) -> pd.DataFrame:
+        """Violations per rule: rule, column, violations and sample_ids."""
+        rows = [
+            {"rule": rule, "column": column, "violations": count, "sample_ids": self._samples[(rule, column)]}
+            for (rule, column), count in self._counts.items()
+        ]
+        return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+    def summary(self) -> str:
+        if self.valid:
+            return f"{self.rows} patients, no violations"
+        parts = [f"{column} {rule}: {count}" for (rule, column), count in self._counts.items()]
+        return f"{self.rows} patients, {sum(self._counts.values())} violations ({'; '.join(parts)})"
+
+
+def _sample_labels(rows: pd.DataFrame) -> List[str]:
+    """Patient ids of sample rows, or their row labels where there is no id."""
+    ids = rows["patient_id"] if "patient_id" in rows.columns else pd.Series(None, index=rows.index, dtype=object)
+    return [str(pid) if pd.notna(pid) else f"row {label}" for label, pid in ids.items()]
+
+
+def validate_patients(patients: pd.DataFrame, validator: Optional[CohortValidator] = None) -> pd.DataFrame:
+    """Validate a whole cohort in one call and return the violation report."""
+    validator = validator or CohortValidator()
+    validator.validate_chunk(patients)
+    return validator.report()
@@ -0,0 +1,215 @@
+"""
+Precomputed cohort analytics with incremental maintenance.
+
+Trial eligibility only depends on a patient's (stage, mutation_status,
+performance_status), so the cohort is kept as a joint histogram over
+those three fields. Each distinct cell is checked against each trial once:
+
+- adding or removing patients touches only the cells in the delta,
+- adding or amending a trial re-evaluates the cells (not the patients),
+- every summary is maintained as a running counter, so reads cost
+  O(number of categories) regardless of cohort size.
+"""
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from src.matching.engine import TrialMatchEngine
+
+logger = logging.getLogger(__name__)
+
+CELL_FIELDS = ['stage', 'mutation_status', 'performance_status']
+BREAKDOWN_FIELDS = ['stage', 'mutation_status']
+
+Cell = Tuple
+
+
+def cell_counts(patients: pd.DataFrame) -> Counter:
+    """Joint histogram of a patient frame over CELL_FIELDS; missing values become None."""
+    if patients.empty:
+        return Counter()
+    sizes = patients.groupby(CELL_FIELDS, dropna=False, sort=False).size()
+    return Counter({
+        tuple(_plain(value) for value in key): int(count)
+        for key, count in sizes.items()
+    })
+
+
+def cells_frame(cells: Iterable[Cell]) -> pd.DataFrame:
+    """Turn histogram cells back into a frame the engine can evaluate."""
+    frame = pd.DataFrame.from_records(list(cells), columns=CELL_FIELDS)
+    if frame['performance_status'].isna().all():
+        frame['performance_status'] = frame['performance_status'].astype(float)
+    return frame
+
+
+def _label(value) -> str:
+    """Display label for a category; missing values are shown as "None"."""
+    return "None" if value is None else value
+
+
+def _plain(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+class CohortAnalytics:
+    """Maintains cohort counts and per-trial eligibility aggregates."""
+
+    def __init__(self, engine: Optional[TrialMatchEngine] = None):
+        self.engine = engine or TrialMatchEngine()
+        self.trials: Dict = {}
+        self.cells: Counter = Counter()
+        self.field_counts: Dict[str, Counter] = {field: Counter() for field in BREAKDOWN_FIELDS}
+        self.stage_mutation: Counter = Counter()
+
+        self._eligible_cells: Dict[str, Set[Cell]] = {}
+        self.trial_eligible: Counter = Counter()
+        self.trial_breakdown: Dict[str, Dict[str, Counter]] = {}
+        self._lock = threading.RLock()
+
+    # -- updates -----------------------------------------------------------
+
+    def add_patients(self, patients: pd.DataFrame) -> None:
+        delta = cell_counts(patients)
+        with self._lock:
+            self._apply_cells(delta, sign=1)
+
+    def remove_patients(self, patients: pd.DataFrame) -> None:
+        delta = cell_counts(patients)
+        with self._lock:
+            self._apply_cells(delta, sign=-1)
+
+    def apply_trial_changes(self, updated: Dict, removed: List[str]) -> None:
+        """Add/replace/remove trials; only the existing cells are re-evaluated."""
+        with self._lock:
+            self._apply_trials(updated, removed)
+        logger.info(f"Analytics applied {len(updated)} updated and {len(removed)} removed trials")
+
+    def _apply_trials(self, updated: Dict, removed: List[str]) -> None:
+        for trial_file in list(removed) + list(updated):
+            self._drop_trial(trial_file)
+
+        if updated and self.cells:
+            frame = cells_frame(self.cells)
+            keys = list(self.cells)
+            for trial_file, trial in updated.items():
+                mask = self.engine.eligible_mask(frame, trial["criteria"]).to_numpy()
+                self._eligible_cells[trial_file] = {cell for cell, ok in zip(keys, mask) if ok}
+        for trial_file in updated:
+            self._eligible_cells.setdefault(trial_file, set())
+            self.trials[trial_file] = updated[trial_file]
+            self._rebuild_trial(trial_file)
+
+    def _drop_trial(self, trial_file: str) -> None:
+        self.trials.pop(trial_file, None)
+        self._eligible_cells.pop(trial_file, None)
+        self.trial_eligible.pop(trial_file, None)
+        self.trial_breakdown.pop(trial_file, None)
+
+    def _rebuild_trial(self, trial_file: str) -> None:
+        breakdown = {field: Counter() for field in BREAKDOWN_FIELDS}
+        total = 0
+        for cell in self._eligible_cells[trial_file]:
+            count = self.cells[cell]
+            total += count
+            for field, value in zip(CELL_FIELDS, cell):
+                if field in breakdown:
+                    breakdown[field][value] += count
+        self.trial_eligible[trial_file] = total
+        self.trial_breakdown[trial_file] = breakdown
+
+    def _apply_cells(self, delta: Counter, sign: int) -> None:
+        new_cells = [cell for cell in delta if cell not in self.cells]
+        if new_cells and self.trials:
+            frame = cells_frame(new_cells)
+            for trial_file, trial in self.trials.items():
+                mask = self.engine.eligible_mask(frame, trial["criteria"]).to_numpy()
+                self._eligible_cells[trial_file].update(c for c, ok in zip(new_cells, mask) if ok)
+
+        eligible_for = {
+            cell: [f for f, cells in self._eligible_cells.items() if cell in cells]
+            for cell in delta
+        }
+
+        for cell, count in delta.items():
+            change = sign * count
+            values = dict(zip(CELL_FIELDS, cell))
+            self.cells[cell] += change
+            for field in BREAKDOWN_FIELDS:
+                self.field_counts[field][values[field]] += change
+            self.stage_mutation[(values['stage'], values['mutation_status'])] += change
+            for trial_file in eligible_for[cell]:
+                self.trial_eligible[trial_file] += change
+                for field in BREAKDOWN_FIELDS:
+                    self.trial_breakdown[trial_file][field][values[field]] += change
+
+            if self.cells[cell] <= 0:
+                del self.cells[cell]
+                for cells in self._eligible_cells.values():
+                    cells.discard(cell)
+
+        for counter in [*self.field_counts.values(), self.stage_mutation]:
+            for key in [k for k, v in counter.items() if v <= 0]:
+                del counter[key]
+
+    # -- reads -------------------------------------------------------------
+
+    def cell_snapshot(self) -> Counter:
+        """Copy of the joint (stage, mutation_status, performance_status) histogram."""
+        with self._lock:
+            return Counter(self.cells)
+
+    @property
+    def total_patients(self) -> int:
+        with self._lock:
+            return sum(self.field_counts['stage'].values())
+
+    def counts(self, field: str = 'mutation_status') -> pd.Series:
+        """Patient counts per value of a breakdown field, largest first."""
+        with self._lock:
+            return _counter_series(self.field_counts[field], field)
+
+    def stage_mutation_crosstab(self) -> pd.DataFrame:
+        with self._lock:
+            counts = {tuple(map(_label, key)): v for key, v in self.stage_mutation.items()}
+        if not counts:
+            return pd.DataFrame()
+        series = pd.Series(counts)
+        series.index = series.index.set_names(BREAKDOWN_FIELDS)
+        return series.unstack(fill_value=0).sort_index()
+
+    def eligibility_summary(self) -> pd.DataFrame:
+        """Eligible count and rate for every trial."""
+        with self._lock:
+            total = self.total_patients
+            rows = [
+                {
+                    'trial_file': trial_file,
+                    'trial_id': trial.get('trial_id', 'Unknown'),
+                    'title': trial.get('title', ''),
+                    'eligible': self.trial_eligible[trial_file],
+                    'eligibility_rate': self.trial_eligible[trial_file] / total if total else 0.0,
+                }
+                for trial_file, trial in self.trials.items()
+            ]
+        return pd.DataFrame(rows, columns=['trial_file', 'trial_id', 'title', 'eligible', 'eligibility_rate'])
+
+    def eligibility_by(self, trial_file: str, field: str = 'mutation_status') -> pd.DataFrame:
+        """Patients, eligible patients and eligibility rate per value of a field for one trial."""
+        with self._lock:
+            patients = self.counts(field)
+            eligible = _counter_series(self.trial_breakdown[trial_file][field], field)
+        table = pd.DataFrame({'patients': patients, 'eligible': eligible}).fillna(0).astype(int)
+        table['eligibility_rate'] = table['eligible'] / table['patients'].where(table['patients'] > 0)
+        return table.sort_values('patients', ascending=False)
+
+
+def _counter_series(counter: Counter, name: str) -> pd.Series:
+    series = pd.Series({_label(k): v for k, v in counter.items() if v > 0}, dtype="int64")
+    series.index.name = name
+    return series.sort_values(ascending=False)
@@ -1,9 +1,13 @@
 """
 Core matching engine for patient-trial matching.
 """
+import numbers
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Tuple, Any
+
+from src.utils.helpers import paginate
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +16,8 @@ class TrialMatchEngine:
     
     def __init__(self):
         self.trials = {}
+        # Column-wise criteria of self.trials for trial_mask, rebuilt when the trials dict is swapped
+        self._criteria_index = None
         logger.info("TrialMatchEngine initialized")
     
     def load_trials(self, trials_data: Dict) -> None:
@@ -19,6 +25,20 @@ class TrialMatchEngine:
         self.trials = trials_data
         logger.info(f"Loaded {len(trials_data)} trials")
     
+    def apply_trial_changes(self, updated: Dict, removed: List[str]) -> None:
+        """
+        Incrementally add, replace or remove trials.
+        
+        A new dict is swapped in rather than mutating the current one, so
+        callers iterating over engine.trials are never disturbed.
+        """
+        trials = dict(self.trials)
+        trials.update(updated)
+        for trial_file in removed:
+            trials.pop(trial_file, None)
+        self.trials = trials
+        logger.info(f"Applied {len(updated)} updated and {len(removed)} removed trials ({len(trials)} total)")
+    
     def match_patient_to_trial(self, patient: pd.Series, trial_criteria: Dict) -> Tuple[bool, List[str]]:
         """
         Match a patient to a specific trial.
@@ -63,20 +83,227 @@ class TrialMatchEngine:
             reasons.append(f"Error during matching: {str(e)}")
             return False, reasons
     
+    def eligible_mask(self, patients: pd.DataFrame, trial_criteria: Dict) -> pd.Series:
+        """
+        Vectorized equivalent of match_patient_to_trial over a whole cohort.
+        
+        Args:
+            patients: Patient data as pandas DataFrame
+            trial_criteria: Trial eligibility criteria
+            
+        Returns:
+            Boolean Series aligned with patients.index, True where eligible
+        """
+        try:
+            mask = pd.Series(True, index=patients.index)
+            
+            if "stage" in trial_criteria:
+                stages = trial_criteria["stage"]
+                mask &= _accepted(patients["stage"], lambda stage: stage in stages)
+            
+            mutation_required = trial_criteria.get("mutation_required", None)
+            if mutation_required:
+                mask &= _accepted(patients["mutation_status"], lambda mutation: _mutation_accepted(mutation, mutation_required))
+            
+            ps_max = trial_criteria.get("performance_status_max", 2)
+            if not isinstance(ps_max, numbers.Real):
+                # The row-wise comparison raises for every patient, so none are eligible
+                raise TypeError(f"performance_status_max must be a number, got {ps_max!r}")
+            mask &= ~(patients["performance_status"] > ps_max)
+            
+            return mask
+            
+        except Exception as e:
+            logger.error(f"Error in eligible_mask: {e}")
+            return pd.Series(False, index=patients.index)
+    
+    def _trial_criteria_index(self) -> Dict:
+        trials = self.trials
+        index = self._criteria_index
+        if index is not None and index["trials"] is trials:
+            return index
+        
+        trial_files = list(trials)
+        criteria = [trials[trial_file]["criteria"] for trial_file in trial_files]
+        # Trials whose criteria do not fit the column-wise layout are checked with match_patient_to_trial
+        row_wise = np.array([not _column_wise(c) for c in criteria], dtype=bool)
+        stage_rows = [
+            (position, stage)
+            for position, c in enumerate(criteria)
+            if not row_wise[position] and "stage" in c
+            for stage in c["stage"]
+        ]
+        mutation_rows = [
+            (position, mutation)
+            for position, c in enumerate(criteria)
+            if not row_wise[position] and c.get("mutation_required", None)
+            for mutation in _as_list(c["mutation_required"])
+        ]
+        titles = [trials[trial_file].get("title", "") for trial_file in trial_files]
+        index = {
+            "trials": trials,
+            "trial_files": np.array(trial_files, dtype=object),
+            "stage_positions": np.array([position for position, _ in stage_rows], dtype=int),
+            "stage_values": np.array([stage for _, stage in stage_rows], dtype=object),
+            "has_stage": np.array(["stage" in c for c in criteria], dtype=bool) & ~row_wise,
+            "mutation_positions": np.array([position for position, _ in mutation_rows], dtype=int),
+            "mutation_values": np.array([mutation for _, mutation in mutation_rows], dtype=object),
+            "has_mutation": np.array([bool(c.get("mutation_required", None)) for c in criteria], dtype=bool) & ~row_wise,
+            "ps_max": np.array([np.inf if row_wise[position] else c.get("performance_status_max", 2)
+                                for position, c in enumerate(criteria)], dtype=float),
+            "row_wise_positions": np.flatnonzero(row_wise),
+            "title_order": np.array(sorted(range(len(trial_files)), key=titles.__getitem__), dtype=int),
+        }
+        self._criteria_index = index
+        return index
+    
+    def trial_mask(self, patient: pd.Series) -> pd.Series:
+        """
+        Vectorized equivalent of match_patient_to_trial over every loaded trial.
+        
+        The trial-side counterpart of eligible_mask: the criteria of all
+        trials are held column-wise, so one patient is checked against every
+        trial with a few array operations. Trials with criteria that do not
+        fit that layout (e.g. a non-numeric performance_status_max) are
+        checked one by one with match_patient_to_trial.
+        
+        Returns:
+            Boolean Series indexed by trial file, True where eligible
+        """
+        index = self._trial_criteria_index()
+        return pd.Series(self._match_trials(index, patient), index=index["trial_files"])
+    
+    def _match_trials(self, index: Dict, patient: pd.Series) -> np.ndarray:
+        try:
+            stage_ok = np.zeros(len(index["trial_files"]), dtype=bool)
+            stage_ok[index["stage_positions"][index["stage_values"] == patient["stage"]]] = True
+            
+            mutation_ok = np.zeros(len(index["trial_files"]), dtype=bool)
+            mutation_ok[index["mutation_positions"][index["mutation_values"] == patient["mutation_status"]]] = True
+            
+            mask = (
+                (~index["has_stage"] | stage_ok)
+                & (~index["has_mutation"] | mutation_ok)
+                & ~(patient["performance_status"] > index["ps_max"])
+            )
+        except Exception as e:
+            logger.error(f"Error in trial_mask: {e}")
+            mask = np.zeros(len(index["trial_files"]), dtype=bool)
+        
+        for position in index["row_wise_positions"]:
+            criteria = index["trials"][index["trial_files"][position]]["criteria"]
+            mask[position] = self.match_patient_to_trial(patient, criteria)[0]
+        return mask
+    
+    def find_eligible_patients(self, patients: Any, trial_criteria: Dict) -> pd.DataFrame:
+        """
+        Return the eligible patients for a trial.
+        
+        Args:
+            patients: Patient DataFrame, or a StorageBackend whose
+                query_patients() pushes simple criteria down for candidate
+                selection (e.g. SQLiteBackend)
+            trial_criteria: Trial eligibility criteria
+            
+        Returns:
+            DataFrame of eligible patients
+        """
+        if not isinstance(patients, pd.DataFrame):
+            patients = patients.query_patients(trial_criteria)
+        
+        return patients[self.eligible_mask(patients, trial_criteria)]
+    
+    def _build_match(self, trial_file: str, is_match: bool, reasons: List[str]) -> Dict:
+        """Build the match dictionary returned to callers for one trial."""
+        trial = self.trials[trial_file]
+        return {
+            "trial_file": trial_file,
+            "trial_title": trial["title"],
+            "trial_id": trial.get("trial_id", "Unknown"),
+            "is_match": is_match,
+            "reasons": reasons,
+            "description": trial.get("description", "")
+        }
+    
     def find_matches_for_patient(self, patient: pd.Series) -> List[Dict]:
         """Find all matching trials for a patient."""
         matches = []
         
         for trial_file, trial in self.trials.items():
             is_match, reasons = self.match_patient_to_trial(patient, trial["criteria"])
-            matches.append({
-                "trial_file": trial_file,
-                "trial_title": trial["title"],
-                "trial_id": trial.get("trial_id", "Unknown"),
-                "is_match": is_match,
-                "reasons": reasons,
-                "description": trial.get("description", "")
-            })
+            matches.append(self._build_match(trial_file, is_match, reasons))
         
         return matches
+    
+    def rank_trials_for_patient(self, patient: pd.Series) -> List[Tuple[str, bool]]:
+        """
+        Evaluate every trial for a patient with trial_mask, matches first, then by title.
+        
+        Returns:
+            List of (trial_file, is_match) tuples
+        """
+        index = self._trial_criteria_index()
+        mask = self._match_trials(index, patient)
+        title_order = index["title_order"]
+        order = np.concatenate([title_order[mask[title_order]], title_order[~mask[title_order]]])
+        return [(index["trial_files"][position], bool(mask[position])) for position in order]
+    
+    def get_match_page(self, patient: pd.Series, page: int = 1, page_size: int = 10) -> Tuple[List[Dict], int]:
+        """
+        Return one page of ranked trial matches for a patient.
+        
+        Trials are ranked with the vectorized trial_mask. Reasons are only
+        worked out for the trials on the requested page, so per-trial cost
+        depends on page_size, not trial count.
+        
+        Returns:
+            Tuple of (matches_on_page, total_pages)
+        """
+        ranked = self.rank_trials_for_patient(patient)
+        page_items, total_pages = paginate(ranked, page, page_size)
+        matches = []
+        for trial_file, is_match in page_items:
+            _, reasons = self.match_patient_to_trial(patient, self.trials[trial_file]["criteria"])
+            matches.append(self._build_match(trial_file, is_match, reasons))
+        return matches, total_pages
+
+
+def _as_list(value: Any) -> List:
+    """Wrap scalar criteria values so they can be used with isin()."""
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _column_wise(trial_criteria: Dict) -> bool:
+    """Whether trial_mask can hold these criteria as arrays with the row-wise matcher's semantics."""
+    mutation_required = trial_criteria.get("mutation_required", None)
+    return (
+        isinstance(trial_criteria.get("stage", []), (list, tuple, set))
+        and (not mutation_required or isinstance(mutation_required, (list, str)))
+        and isinstance(trial_criteria.get("performance_status_max", 2), numbers.Real)
+    )
+
+
+def _mutation_accepted(mutation: Any, mutation_required: Any) -> bool:
+    """The mutation rule of match_patient_to_trial: membership for lists, equality otherwise."""
+    if isinstance(mutation_required, list):
+        return mutation in mutation_required
+    return mutation == mutation_required
+
+
+def _accepted(values: pd.Series, accepts: Callable[[Any], bool]) -> pd.Series:
+    """
+    Apply a row-wise criterion check to a column by evaluating it once per distinct value.
+    
+    Values for which the check raises are rejected, as match_patient_to_trial does.
+    """
+    allowed = []
+    for value in values.unique():
+        try:
+            if accepts(value):
+                allowed.append(value)
+        except Exception:
+            pass
+    return values.isin(allowed)
 
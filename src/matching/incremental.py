@@ -0,0 +1,122 @@
+"""
+Append-only incremental matching for newly registered patients.
+
+Only rows appended to the registry CSV since the last poll are parsed and
+matched, so the work per poll scales with the number of new patients and
+not with the size of the registry. Results are appended to a JSON Lines
+stream, one record per new patient:
+
+    python -m src.matching.incremental data/registry.csv matches.jsonl --follow
+"""
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.data.follow import CSVFollower
+from src.matching.analytics import CohortAnalytics
+from src.matching.engine import TrialMatchEngine
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalMatcher:
+    """Matches the rows a CSVFollower yields and appends results to a stream."""
+
+    def __init__(self, engine: TrialMatchEngine, follower: CSVFollower, output_path: str,
+                 analytics: Optional[CohortAnalytics] = None):
+        self.engine = engine
+        self.follower = follower
+        self.output_path = Path(output_path)
+        self.analytics = analytics
+
+    def match_rows(self, patients: pd.DataFrame) -> List[Dict]:
+        """Match a batch of patients against every loaded trial."""
+        masks = {
+            trial_file: self.engine.eligible_mask(patients, trial["criteria"]).to_numpy()
+            for trial_file, trial in self.engine.trials.items()
+        }
+        trial_ids = {
+            trial_file: trial.get("trial_id", "Unknown")
+            for trial_file, trial in self.engine.trials.items()
+        }
+        matched_at = pd.Timestamp.now().isoformat()
+
+        records = []
+        for position, patient_id in enumerate(patients["patient_id"]):
+            records.append({
+                "patient_id": str(patient_id),
+                "matched_trials": [trial_ids[f] for f, mask in masks.items() if mask[position]],
+                "matched_at": matched_at
+            })
+        return records
+
+    def process_new(self) -> int:
+        """
+        Match rows appended since the last call; returns the number processed.
+
+        Rows are read in bounded chunks. Each chunk's position is committed
+        and checkpointed only after its results were written, so a failed
+        write leaves the rows to be read again.
+        """
+        processed = 0
+        while True:
+            new_rows = self.follower.read_new_rows()
+            if new_rows.empty:
+                return processed
+
+            records = self.match_rows(new_rows)
+            with open(self.output_path, "a") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+            self.follower.commit()
+            self.follower.checkpoint()
+            if self.analytics is not None:
+                self.analytics.add_patients(new_rows)
+            processed += len(records)
+            logger.info(f"Matched {len(records)} new patients (registry rows: {self.follower.rows})")
+
+    def follow(self, poll_interval: float = 1.0, max_polls: Optional[int] = None) -> None:
+        """Poll the registry until interrupted (or for max_polls polls)."""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            self.process_new()
+            polls += 1
+            time.sleep(poll_interval)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.data.loader import DataLoader
+
+    parser = argparse.ArgumentParser(description="Match newly appended registry patients")
+    parser.add_argument("patients_csv")
+    parser.add_argument("output", help="JSON Lines file results are appended to")
+    parser.add_argument("--state", default=None, help="Checkpoint file (default: <output>.state.json)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--follow", action="store_true", help="Keep polling for new rows")
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    engine = TrialMatchEngine()
+    engine.load_trials(DataLoader(args.data_dir).load_trials())
+    follower = CSVFollower(args.patients_csv, args.state or f"{args.output}.state.json")
+    matcher = IncrementalMatcher(engine, follower, args.output)
+
+    if args.follow:
+        try:
+            matcher.follow(args.interval)
+        except KeyboardInterrupt:
+            logger.info("Stopped following")
+    else:
+        matcher.process_new()
+
+
+if __name__ == "__main__":
+    main()
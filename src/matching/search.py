@@ -0,0 +1,149 @@
+"""
+Keyword search over trial text.
+
+TrialSearchIndex keeps an inverted index (term -> {trial_file: term
+frequency}) over each trial's title, description, raw_inclusion and
+raw_exclusion, and ranks hits with BM25. A query only touches the postings
+of its own terms, so it stays fast as the number of trials grows. Trials
+are added, replaced and removed one at a time, which lets the index
+follow TrialReloader changes without a rebuild.
+"""
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ["title", "description", "raw_inclusion", "raw_exclusion"]
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the to with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric tokens, without stopwords."""
+    return [token for token in re.findall(r"[a-z0-9]+", text.lower()) if token not in STOPWORDS]
+
+
+def trial_text(trial: Dict) -> str:
+    """Concatenate the searchable fields of a trial; list fields are joined by line."""
+    parts = []
+    for field in SEARCH_FIELDS:
+        value = trial.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+class TrialSearchIndex:
+    """BM25-ranked inverted index of trial text, updated incrementally."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._info: Dict[str, Dict] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, trial_file: str) -> None:
+        for term in self._terms.pop(trial_file, []):
+            postings = self._postings[term]
+            postings.pop(trial_file, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(trial_file, 0)
+        self._info.pop(trial_file, None)
+
+    def apply_trial_changes(self, updated: Dict, removed: List[str]) -> None:
+        """Index added or changed trials and drop removed ones (TrialReloader listener)."""
+        with self._lock:
+            for trial_file in removed:
+                self._remove(trial_file)
+            for trial_file, trial in updated.items():
+                self._remove(trial_file)
+                frequencies = Counter(tokenize(trial_text(trial)))
+                for term, count in frequencies.items():
+                    self._postings[term][trial_file] = count
+                self._terms[trial_file] = list(frequencies)
+                self._lengths[trial_file] = sum(frequencies.values())
+                self._total_length += self._lengths[trial_file]
+                self._info[trial_file] = {
+                    "trial_id": trial.get("trial_id", "Unknown"),
+                    "title": trial.get("title", ""),
+                }
+        logger.info(f"Search index: {len(updated)} indexed, {len(removed)} removed ({len(self)} trials)")
+
+    def search(self, query: str, limit: Optional[int] = 20) -> List[Dict]:
+        """
+        Rank trials for a keyword query.
+
+        Args:
+            query: Free-text keywords
+            limit: Maximum number of hits, or None for all of them
+
+        Returns:
+            List of hits with trial_file, trial_id, title and score, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._lengths)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[str, float] = defaultdict(float)
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for trial_file, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[trial_file] / average_length)
+                    scores[trial_file] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0])) if limit is None \
+                else heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+            return [
+                {"trial_file": trial_file, **self._info[trial_file], "score": score}
+                for trial_file, score in ranked
+            ]
+
+    def search_eligible(self, query: str, patient: pd.Series, engine, limit: int = 20) -> List[Dict]:
+        """
+        Rank only the trials the patient is eligible for.
+
+        Hits are checked against the engine in rank order and the scan
+        stops as soon as `limit` eligible trials are found.
+
+        Returns:
+            Search hits with the engine's reasons added
+        """
+        results = []
+        for hit in self.search(query, limit=None):
+            trial = engine.trials.get(hit["trial_file"])
+            if trial is None:
+                continue
+            is_match, reasons = engine.match_patient_to_trial(patient, trial["criteria"])
+            if is_match:
+                results.append(dict(hit, reasons=reasons))
+                if len(results) >= limit:
+                    break
+        return results
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, trial_file: str) -> bool:
+        return trial_file in self._lengths
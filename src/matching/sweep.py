@@ -0,0 +1,185 @@
+"""
+What-if criteria sweeps over a cohort histogram.
+
+The cohort is reduced once to a joint histogram H[stage, mutation, PS].
+A cumulative sum along the PS axis turns "PS <= t" into a single lookup,
+so the eligible count for any (stage set, mutation set, PS threshold) is
+a masked sum over a small stage x mutation matrix. A whole grid of
+variants is evaluated with one einsum per threshold, independent of the
+number of patients.
+"""
+import logging
+from collections import Counter
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.matching.analytics import cell_counts
+
+logger = logging.getLogger(__name__)
+
+# ECOG performance status scale
+PS_VALUES = [0, 1, 2, 3, 4]
+
+
+class CriteriaSweep:
+    """Eligible-count queries for criteria variants, matching TrialMatchEngine semantics."""
+
+    def __init__(self, cells: Counter):
+        """
+        Args:
+            cells: Joint histogram {(stage, mutation_status, performance_status): count},
+                as produced by analytics.cell_counts or CohortAnalytics.cells
+        """
+        self.stages = sorted({stage for stage, _, _ in cells}, key=_sort_key)
+        self.mutations = sorted({mutation for _, mutation, _ in cells}, key=_sort_key)
+        self.ps_values = sorted({ps for _, _, ps in cells if _is_number(ps)})
+        stage_index = {value: i for i, value in enumerate(self.stages)}
+        mutation_index = {value: i for i, value in enumerate(self.mutations)}
+        ps_index = {value: i for i, value in enumerate(self.ps_values)}
+
+        histogram = np.zeros((len(self.stages), len(self.mutations), len(self.ps_values)), dtype=np.int64)
+        # Missing PS always passes the engine's "> max" check; non-numeric PS never does
+        self._missing_ps = np.zeros((len(self.stages), len(self.mutations)), dtype=np.int64)
+
+        for (stage, mutation, ps), count in cells.items():
+            i, j = stage_index[stage], mutation_index[mutation]
+            if ps is None:
+                self._missing_ps[i, j] += count
+            elif _is_number(ps):
+                histogram[i, j, ps_index[ps]] += count
+
+        self._cumulative = np.cumsum(histogram, axis=2)
+        self.total = int(sum(cells.values()))
+        logger.info(
+            f"CriteriaSweep built over {self.total} patients "
+            f"({len(self.stages)} stages x {len(self.mutations)} mutations x {len(self.ps_values)} PS values)"
+        )
+
+    @classmethod
+    def from_patients(cls, patients: pd.DataFrame) -> "CriteriaSweep":
+        return cls(cell_counts(patients))
+
+    def _matrix_at(self, ps_max: float) -> np.ndarray:
+        """Stage x mutation counts of patients with PS <= ps_max (or missing)."""
+        position = int(np.searchsorted(self.ps_values, ps_max, side="right")) - 1
+        if position < 0:
+            return self._missing_ps.copy()
+        return self._cumulative[:, :, position] + self._missing_ps
+
+    def _mask(self, values: Sequence, selected: Optional[Sequence]) -> np.ndarray:
+        if selected is None:
+            return np.ones(len(values), dtype=np.int64)
+        selected = {selected} if isinstance(selected, str) else set(selected)
+        return np.array([value in selected for value in values], dtype=np.int64)
+
+    def count(self, stages: Optional[Sequence] = None, mutations: Optional[Sequence] = None,
+              ps_max: float = 2) -> int:
+        """
+        Eligible patients for one variant.
+
+        Args:
+            stages: Allowed stages, or None for no stage criterion
+            mutations: Required mutations, or None/empty for no mutation criterion
+            ps_max: Maximum allowed performance status
+        """
+        matrix = self._matrix_at(ps_max)
+        return int(self._mask(self.stages, stages) @ matrix @ self._mask(self.mutations, mutations or None))
+
+    def sweep(self, stage_options: List[Optional[Sequence]], mutation_options: List[Optional[Sequence]],
+              ps_max_options: List[float]) -> pd.DataFrame:
+        """
+        Eligible counts for every combination of the given options.
+
+        Returns:
+            DataFrame with columns stages, mutations, performance_status_max, eligible
+        """
+        stage_masks = np.array([self._mask(self.stages, s) for s in stage_options]).reshape(
+            len(stage_options), len(self.stages))
+        mutation_masks = np.array([self._mask(self.mutations, m or None) for m in mutation_options]).reshape(
+            len(mutation_options), len(self.mutations))
+
+        rows = []
+        for ps_max in ps_max_options:
+            grid = np.einsum("as,sm,bm->ab", stage_masks, self._matrix_at(ps_max), mutation_masks)
+            for (a, stages), (b, mutations) in product(enumerate(stage_options), enumerate(mutation_options)):
+                rows.append({
+                    "stages": _option_label(stages),
+                    "mutations": _option_label(mutations or None),
+                    "performance_status_max": ps_max,
+                    "eligible": int(grid[a, b]),
+                })
+        return pd.DataFrame(rows, columns=["stages", "mutations", "performance_status_max", "eligible"])
+
+    def trial_variants(self, criteria: Dict, add_stages: Optional[List[str]] = None,
+                       ps_max_options: Optional[List[float]] = None) -> pd.DataFrame:
+        """
+        What-if grid around a trial's criteria.
+
+        Stage options are the trial's stages plus each stage in add_stages
+        (and all of them together). PS options default to the trial's
+        maximum and its neighbours. A `change` column gives the difference
+        from the trial as written.
+        """
+        base_stages = None
+        if "stage" in criteria:
+            stages = criteria["stage"]
+            base_stages = [stages] if isinstance(stages, str) else list(stages)
+        mutations = criteria.get("mutation_required") or None
+        if mutations is not None and not isinstance(mutations, (list, tuple, set)):
+            mutations = [mutations]
+        base_ps = criteria.get("performance_status_max", 2)
+
+        stage_options: List[Optional[List]] = [base_stages]
+        extra = [stage for stage in (add_stages or []) if base_stages is not None and stage not in base_stages]
+        stage_options += [base_stages + [stage] for stage in extra]
+        if len(extra) > 1:
+            stage_options.append(base_stages + extra)
+
+        if not _is_number(base_ps):
+            # The engine rejects every patient when the limit is missing or not a number
+            if ps_max_options is None:
+                ps_max_options = list(PS_VALUES)
+            baseline = 0
+        else:
+            if ps_max_options is None:
+                ps_max_options = sorted({max(base_ps - 1, 0), base_ps, min(base_ps + 1, 4)})
+            baseline = self.count(base_stages, mutations, base_ps)
+
+        grid = self.sweep(stage_options, [mutations], ps_max_options)
+        grid["change"] = grid["eligible"] - baseline
+        return grid
+
+
+def ps_max_choices(criteria: Dict) -> Tuple[List[float], List[float]]:
+    """
+    Options and default selection for what-if PS limits around a trial.
+
+    Options are PS_VALUES plus the trial's own limit, with integral floats
+    shown as ints. A missing or non-numeric limit gives an empty default.
+    """
+    base_ps = criteria.get("performance_status_max", 2)
+    if not _is_number(base_ps) or not np.isfinite(base_ps):
+        return list(PS_VALUES), []
+    if float(base_ps).is_integer():
+        base_ps = int(base_ps)
+    return sorted(set(PS_VALUES) | {base_ps}), [base_ps]
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool) \
+        and not pd.isna(value)
+
+
+def _sort_key(value):
+    return (value is None, str(value))
+
+
+def _option_label(option: Optional[Sequence]) -> str:
+    if option is None:
+        return "any"
+    if isinstance(option, str):
+        return option
+    return ", ".join(str(value) for value in option)
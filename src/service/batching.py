@@ -0,0 +1,178 @@
+"""
+Micro-batching of concurrent single-patient match requests.
+
+Requests are queued on a bounded queue. Each worker takes the first
+waiting request, then keeps collecting for up to batch_window_ms (or until
+max_batch requests) and evaluates the whole batch with one vectorized
+eligibility pass per trial. A full queue rejects new work immediately so
+callers can apply backpressure instead of piling up latency.
+"""
+import logging
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.matching.engine import TrialMatchEngine
+
+logger = logging.getLogger(__name__)
+
+
+class Backpressure(Exception):
+    """Raised when the request queue is full."""
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram in milliseconds."""
+
+    BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf]
+
+    def __init__(self):
+        self._counts = [0] * len(self.BUCKETS_MS)
+        self._total = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float) -> None:
+        index = next(i for i, bound in enumerate(self.BUCKETS_MS) if latency_ms <= bound)
+        with self._lock:
+            self._counts[index] += 1
+            self._total += 1
+            self._sum_ms += latency_ms
+            self._max_ms = max(self._max_ms, latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-th quantile."""
+        with self._lock:
+            counts, total, max_ms = list(self._counts), self._total, self._max_ms
+        if total == 0:
+            return None
+
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS_MS, counts):
+            cumulative += count
+            if cumulative >= q * total:
+                return min(bound, max_ms)
+        return max_ms
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts, total = list(self._counts), self._total
+            mean_ms = self._sum_ms / total if total else None
+            max_ms = self._max_ms
+        return {
+            "count": total,
+            "mean_ms": mean_ms,
+            "max_ms": max_ms,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+            "buckets": [
+                {"le_ms": "inf" if math.isinf(bound) else bound, "count": count}
+                for bound, count in zip(self.BUCKETS_MS, counts)
+            ],
+        }
+
+
+class MicroBatcher:
+    """Gathers concurrent patient requests into vectorized batch evaluations."""
+
+    def __init__(self, engine: TrialMatchEngine, workers: int = 4, max_batch: int = 64,
+                 batch_window_ms: float = 5.0, max_queue: int = 1024):
+        self.engine = engine
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.batched_requests = 0
+
+    def start(self) -> "MicroBatcher":
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"match-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"MicroBatcher started with {self.workers} workers")
+        return self
+
+    def close(self) -> None:
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+
+    def submit(self, patient: Dict) -> Future:
+        """Queue one patient for matching; raises Backpressure if the queue is full."""
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((patient, future))
+        except queue.Full:
+            raise Backpressure(f"Request queue full ({self._queue.maxsize} pending)")
+        return future
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _collect_batch(self) -> List:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker_loop(self) -> None:
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            try:
+                results = self.evaluate([patient for patient, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"Error evaluating batch of {len(batch)}: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.batched_requests += len(batch)
+
+    def evaluate(self, patients: List[Dict]) -> List[List[Dict]]:
+        """Match a list of patients against every trial in one vectorized pass."""
+        trials = self.engine.trials
+        cohort = pd.DataFrame(patients)
+        masks = {
+            trial_file: self.engine.eligible_mask(cohort, trial["criteria"]).to_numpy()
+            for trial_file, trial in trials.items()
+        }
+
+        return [
+            [
+                {
+                    "trial_file": trial_file,
+                    "trial_id": trial.get("trial_id", "Unknown"),
+                    "trial_title": trial.get("title", ""),
+                    "is_match": bool(masks[trial_file][position]),
+                }
+                for trial_file, trial in trials.items()
+            ]
+            for position in range(len(patients))
+        ]
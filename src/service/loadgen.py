@@ -0,0 +1,101 @@
+"""
+Load generator for the matching service.
+
+Sends synthetic single-patient POST /match/patient requests from a pool
+of keep-alive connections and reports client-side p50/p99 latency,
+throughput and rejected (503) requests:
+
+    python -m src.service.loadgen --url http://127.0.0.1:8765 --requests 5000 --concurrency 64
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+STAGES = ["I", "II", "III", "IIIA", "IIIB", "IV"]
+MUTATIONS = ["EGFR+", "KRAS G12C+", "PD-L1 High", "None"]
+
+
+def synthetic_patient(rng: random.Random, index: int) -> Dict:
+    return {
+        "patient_id": f"LG{index:07d}",
+        "age": rng.randint(30, 85),
+        "gender": rng.choice(["Male", "Female"]),
+        "stage": rng.choice(STAGES),
+        "mutation_status": rng.choice(MUTATIONS),
+        "smoker": rng.random() < 0.5,
+        "performance_status": rng.randint(0, 4),
+    }
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_load(url: str, requests: int, concurrency: int, seed: int = 0) -> Dict:
+    """Fire `requests` match requests with `concurrency` parallel clients."""
+    target = urlparse(url)
+    local = threading.local()
+    rng = random.Random(seed)
+    bodies = [json.dumps(synthetic_patient(rng, i)).encode() for i in range(requests)]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+
+    def send(body: bytes) -> None:
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        start = time.perf_counter()
+        try:
+            local.conn.request("POST", "/match/patient", body, {"Content-Type": "application/json"})
+            response = local.conn.getresponse()
+            response.read()
+            status = response.status
+        except (http.client.HTTPException, OSError):
+            local.conn.close()
+            del local.conn
+            status = -1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(elapsed_ms)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, bodies))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": requests / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p99_ms": percentile(latencies, 0.99),
+        "statuses": statuses,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load test the matching service")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run_load(args.url, args.requests, args.concurrency, args.seed)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
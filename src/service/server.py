@@ -0,0 +1,268 @@
+"""
+Standalone HTTP matching service over TrialMatchEngine.
+
+Endpoints (JSON):
+    POST /match/patient                patient record -> trial matches
+    GET  /patients/<patient_id>/trials known patient -> trial matches
+    GET  /trials/<trial_id>/patients   eligible patients (?page=&page_size=)
+    GET  /metrics/latency              latency histogram and batching stats
+    GET  /health
+
+Patient -> trial requests go through a MicroBatcher. When its queue is
+full the service answers 503 with Retry-After.
+
+    python -m src.service.server --port 8765
+"""
+import argparse
+import json
+import logging
+import numbers
+import re
+import time
+from concurrent.futures import TimeoutError as FuturesTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from src.data.repository import PatientRepository
+from src.matching.engine import TrialMatchEngine
+from src.service.batching import Backpressure, LatencyHistogram, MicroBatcher
+from src.utils.helpers import page_count
+
+logger = logging.getLogger(__name__)
+
+MATCH_FIELDS = ['stage', 'mutation_status', 'performance_status']
+
+
+def coerce_match_fields(patient: Dict) -> Dict:
+    """
+    Check and normalise the fields used for matching.
+    
+    One mistyped record would otherwise fail the vectorized evaluation of
+    every patient batched with it, so bad input is rejected up front.
+    
+    Raises:
+        ValueError: If a field is missing or has the wrong type
+    """
+    missing = [field for field in MATCH_FIELDS if field not in patient]
+    if missing:
+        raise ValueError(f"Missing patient fields: {missing}")
+
+    stage = patient["stage"]
+    if not isinstance(stage, str) or not stage.strip():
+        raise ValueError(f"stage must be a non-empty string, got {stage!r}")
+
+    mutation = patient["mutation_status"]
+    if mutation is not None and not isinstance(mutation, str):
+        # Missing mutations come through as NaN from loaded patient rows
+        if not (isinstance(mutation, numbers.Real) and pd.isna(mutation)):
+            raise ValueError(f"mutation_status must be a string or null, got {mutation!r}")
+        mutation = None
+
+    ps = patient["performance_status"]
+    if isinstance(ps, str) and ps.strip().isdigit():
+        ps = int(ps)
+    if isinstance(ps, bool) or not isinstance(ps, numbers.Real) or pd.isna(ps) or ps != int(ps):
+        raise ValueError(f"performance_status must be an integer, got {patient['performance_status']!r}")
+
+    return dict(patient, stage=stage.strip(), mutation_status=mutation, performance_status=int(ps))
+
+
+class MatchingService:
+    """Request handling logic, independent of the HTTP transport."""
+
+    def __init__(self, engine: TrialMatchEngine, patients: pd.DataFrame,
+                 batcher: MicroBatcher, request_timeout: float = 10.0):
+        self.engine = engine
+        self.patients = patients
+        self.repository = PatientRepository(patients)
+        self.batcher = batcher
+        self.request_timeout = request_timeout
+        self.latency = LatencyHistogram()
+
+    def match_patient(self, patient: Dict) -> Tuple[int, Dict]:
+        if not isinstance(patient, dict):
+            return 400, {"error": "Patient record must be a JSON object"}
+        try:
+            patient = coerce_match_fields(patient)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        matches = self.batcher.submit(patient).result(timeout=self.request_timeout)
+        return 200, {"patient_id": patient.get("patient_id"), "matches": matches}
+
+    def match_known_patient(self, patient_id: str) -> Tuple[int, Dict]:
+        patient = self.repository.get(patient_id)
+        if patient is None:
+            return 404, {"error": f"Unknown patient {patient_id}"}
+        return self.match_patient(patient.to_dict())
+
+    def eligible_patients(self, trial_id: str, page: int, page_size: int) -> Tuple[int, Dict]:
+        trial = next(
+            (t for f, t in self.engine.trials.items() if t.get("trial_id") == trial_id or f == trial_id),
+            None
+        )
+        if trial is None:
+            return 404, {"error": f"Unknown trial {trial_id}"}
+
+        eligible = self.engine.find_eligible_patients(self.patients, trial["criteria"])
+        # Only the requested page is serialized, so cost follows page_size rather than cohort size
+        total_pages = page_count(len(eligible), page_size)
+        page = min(max(page, 1), total_pages)
+        start = (page - 1) * page_size
+        page_records = json.loads(eligible.iloc[start:start + page_size].to_json(orient="records"))
+        return 200, {
+            "trial_id": trial.get("trial_id"),
+            "total": len(eligible),
+            "page": page,
+            "total_pages": total_pages,
+            "patients": page_records,
+        }
+
+    def metrics(self) -> Dict:
+        batches = self.batcher.batches
+        return {
+            "latency": self.latency.snapshot(),
+            "batches": batches,
+            "mean_batch_size": self.batcher.batched_requests / batches if batches else None,
+            "queue_depth": self.batcher.queue_depth(),
+        }
+
+
+class MatchRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the MatchingService attached to the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    ROUTES = [
+        ("GET", re.compile(r"^/health$"), "_health"),
+        ("GET", re.compile(r"^/metrics/latency$"), "_metrics"),
+        ("GET", re.compile(r"^/patients/(?P<patient_id>[^/]+)/trials$"), "_patient_trials"),
+        ("GET", re.compile(r"^/trials/(?P<trial_id>.+)/patients$"), "_trial_patients"),
+        ("POST", re.compile(r"^/match/patient$"), "_match_patient"),
+    ]
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    @property
+    def service(self) -> MatchingService:
+        return self.server.service
+
+    def _dispatch(self, method: str) -> None:
+        start = time.perf_counter()
+        url = urlparse(self.path)
+        try:
+            for route_method, pattern, handler_name in self.ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    status, body = getattr(self, handler_name)(parse_qs(url.query), **match.groupdict())
+                    break
+            else:
+                status, body = 404, {"error": f"No route for {method} {url.path}"}
+        except Backpressure as e:
+            status, body = 503, {"error": str(e)}
+        except FuturesTimeout:
+            status, body = 504, {"error": "Timed out waiting for a match worker"}
+        except json.JSONDecodeError as e:
+            status, body = 400, {"error": f"Invalid JSON body: {e}"}
+        except Exception as e:
+            logger.error(f"Error handling {method} {url.path}: {e}")
+            status, body = 500, {"error": str(e)}
+
+        self._send_json(status, body)
+        if url.path != "/metrics/latency":
+            self.service.latency.record((time.perf_counter() - start) * 1000)
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _health(self, query):
+        return 200, {"status": "ok", "trials": len(self.service.engine.trials)}
+
+    def _metrics(self, query):
+        return 200, self.service.metrics()
+
+    def _match_patient(self, query):
+        return self.service.match_patient(self._read_json())
+
+    def _patient_trials(self, query, patient_id):
+        return self.service.match_known_patient(patient_id)
+
+    def _trial_patients(self, query, trial_id):
+        try:
+            page = int(query.get("page", ["1"])[0])
+            page_size = int(query.get("page_size", ["100"])[0])
+        except ValueError:
+            return 400, {"error": "page and page_size must be integers"}
+        if page_size < 1:
+            return 400, {"error": "page_size must be at least 1"}
+        return self.service.eligible_patients(trial_id, page, page_size)
+
+
+class MatchServer(ThreadingHTTPServer):
+    """Threading server with a listen backlog sized for bursts of clients."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def create_server(service: MatchingService, host: str = "127.0.0.1", port: int = 8765) -> MatchServer:
+    """Build (but do not start) the HTTP server for a service."""
+    server = MatchServer((host, port), MatchRequestHandler)
+    server.service = service
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.data.loader import DataLoader
+
+    parser = argparse.ArgumentParser(description="Run the TrialMatch HTTP matching service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    loader = DataLoader(args.data_dir)
+    engine = TrialMatchEngine()
+    engine.load_trials(loader.load_trials())
+    batcher = MicroBatcher(engine, args.workers, args.max_batch, args.batch_window_ms, args.max_queue).start()
+
+    server = create_server(MatchingService(engine, loader.load_patients(), batcher), args.host, args.port)
+    logger.info(f"Matching service listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+End-to-end load harness for the Streamlit app.
+
+Runs many scripted coordinator sessions concurrently through Streamlit's
+AppTest. Each session opens the app, selects a patient, switches trial
+and exports the eligible patients. The harness reports rerun latency
+percentiles per phase and peak memory. Concurrent sessions run in worker
+processes. Sessions in the same worker share its st.cache_data and
+st.cache_resource state, as sessions do on a real server.
+
+The app reads a synthetic cohort of the requested size from a temporary
+data directory (TRIALMATCH_DATA_DIR):
+
+    python -m src.utils.app_load --patients 10000 --sessions 50 --concurrency 10 --max-p95-ms 2000
+
+The exit status is non-zero if any session fails or, when --max-p95-ms
+is given, if an interactive phase is slower than the budget at p95.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.service.loadgen import percentile, synthetic_patient
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = Path(__file__).resolve().parents[2] / "streamlit_app.py"
+DEFAULT_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+PHASES = ["initial_load", "select_patient", "switch_trial", "export"]
+
+
+def write_synthetic_cohort(data_dir: str, patients: int, seed: int = 0,
+                           trials_dir: Optional[str] = None) -> Path:
+    """Write a patient CSV of the given size and copy the trial definitions next to it."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    cohort = pd.DataFrame([synthetic_patient(rng, i) for i in range(patients)])
+    cohort.to_csv(data_dir / "sample_patients.csv", index=False)
+    shutil.copytree(Path(trials_dir or DEFAULT_DATA_DIR / "trials"), data_dir / "trials", dirs_exist_ok=True)
+    return data_dir
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, where the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _find(widgets, label: str):
+    return next((widget for widget in widgets if widget.label == label), None)
+
+
+def run_session(session: int, seed: int = 0, timeout: float = 120) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+    """
+    Script one coordinator session.
+
+    Returns:
+        Tuple of ([(phase, seconds), ...], error message or None)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed * 100003 + session)
+    timings = []
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+
+    def timed(phase, action) -> bool:
+        start = time.perf_counter()
+        action()
+        timings.append((phase, time.perf_counter() - start))
+        return not at.exception
+
+    try:
+        if not timed("initial_load", at.run):
+            return timings, f"initial_load: {at.exception[0].value}"
+
+        patient_select = _find(at.selectbox, "Select Patient ID")
+        patient = rng.choice(patient_select.options)
+        if not timed("select_patient", patient_select.select(patient).run):
+            return timings, f"select_patient: {at.exception[0].value}"
+
+        trial_select = _find(at.selectbox, "Select Clinical Trial")
+        choices = [option for option in trial_select.options if option != trial_select.value]
+        trial = rng.choice(choices or trial_select.options)
+        if not timed("switch_trial", trial_select.select(trial).run):
+            return timings, f"switch_trial: {at.exception[0].value}"
+
+        # Trials without eligible patients have nothing to export
+        prepare = next((button for button in at.button if (button.key or "").startswith(f"prepare_{trial}_")), None)
+        if prepare is not None and not timed("export", prepare.click().run):
+            return timings, f"export: {at.exception[0].value}"
+    except Exception as e:
+        return timings, f"{type(e).__name__}: {e}"
+
+    return timings, None
+
+
+def summarize(timings: List[Tuple[str, float]]) -> pd.DataFrame:
+    """Per-phase count and latency percentiles in milliseconds."""
+    rows = []
+    for phase in PHASES:
+        values = sorted(seconds * 1000 for name, seconds in timings if name == phase)
+        if not values:
+            continue
+        rows.append({
+            "phase": phase,
+            "reruns": len(values),
+            "p50_ms": round(percentile(values, 0.50), 1),
+            "p95_ms": round(percentile(values, 0.95), 1),
+            "p99_ms": round(percentile(values, 0.99), 1),
+            "max_ms": round(values[-1], 1),
+        })
+    return pd.DataFrame(rows, columns=["phase", "reruns", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+
+
+def _run_worker(sessions: List[int], seed: int, timeout: float) -> Tuple[List[Tuple[str, float]], List[str], Optional[float]]:
+    """Run sessions one after another in a worker process; returns timings, errors and peak RSS."""
+    # AppTest logs every rerun; keep the harness output readable
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    timings: List[Tuple[str, float]] = []
+    errors: List[str] = []
+    for session in sessions:
+        session_timings, error = run_session(session, seed, timeout)
+        timings.extend(session_timings)
+        if error:
+            errors.append(f"session {session}: {error}")
+    return timings, errors, peak_rss_mb()
+
+
+def run_app_load(sessions: int, concurrency: int, seed: int = 0, timeout: float = 120) -> Dict:
+    """
+    Run `sessions` scripted sessions, `concurrency` at a time, against the app.
+
+    AppTest swaps process-global Streamlit state on every rerun, so it is
+    not safe to drive from several threads. Each concurrent stream of
+    sessions therefore runs in its own worker process, which behaves like
+    one server replica with its own caches. TRIALMATCH_DATA_DIR must point
+    at the data to serve before this is called (see write_synthetic_cohort).
+
+    Returns:
+        Dictionary with phases (DataFrame), errors, elapsed_seconds and
+        peak_rss_mb (the largest worker's peak)
+    """
+    workers = max(1, min(concurrency, sessions))
+    assignments = [list(range(sessions))[i::workers] for i in range(workers)]
+
+    timings: List[Tuple[str, float]] = []
+    errors: List[str] = []
+    peaks: List[float] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_worker, assigned, seed, timeout) for assigned in assignments]
+        for future in futures:
+            worker_timings, worker_errors, peak = future.result()
+            timings.extend(worker_timings)
+            errors.extend(worker_errors)
+            if peak is not None:
+                peaks.append(peak)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "sessions": sessions,
+        "concurrency": workers,
+        "phases": summarize(timings),
+        "errors": errors,
+        "elapsed_seconds": elapsed,
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Concurrent session load test for the Streamlit app")
+    parser.add_argument("--patients", type=int, default=5000, help="Synthetic cohort size")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds allowed per rerun")
+    parser.add_argument("--max-p95-ms", type=float, default=None,
+                        help="Fail if an interactive phase's p95 rerun latency exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_synthetic_cohort(data_dir, args.patients, args.seed)
+        os.environ["TRIALMATCH_DATA_DIR"] = data_dir
+        result = run_app_load(args.sessions, args.concurrency, args.seed, args.timeout)
+
+    phases = result["phases"]
+    over_budget = []
+    if args.max_p95_ms is not None:
+        interactive = phases[phases["phase"] != "initial_load"]
+        over_budget = interactive.loc[interactive["p95_ms"] > args.max_p95_ms, "phase"].tolist()
+
+    if args.json:
+        print(json.dumps(dict(result, phases=phases.to_dict(orient="records"), patients=args.patients,
+                              over_budget=over_budget), indent=2))
+    else:
+        print(f"{args.sessions} sessions x {args.patients} patients, concurrency {args.concurrency}: "
+              f"{result['elapsed_seconds']:.1f}s, peak RSS {result['peak_rss_mb'] or float('nan'):.0f} MB")
+        print(phases.to_string(index=False))
+        for error in result["errors"]:
+            print(f"ERROR {error}")
+        if over_budget:
+            print(f"p95 over {args.max_p95_ms:.0f} ms: {', '.join(over_budget)}")
+
+    if result["errors"] or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
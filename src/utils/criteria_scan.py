@@ -0,0 +1,155 @@
+"""
+Early-exit scan for the eligibility sections of a protocol PDF.
+
+Eligibility criteria usually sit in the first 20-40 pages of protocols
+that run to 200+. scan_eligibility_sections streams pages through a small
+state machine:
+
+    BEFORE -> INCLUSION -> EXCLUSION -> DONE
+
+and stops reading as soon as the heading that follows the criteria is
+seen, or when the page cap is reached. The result reports pages scanned
+against the total so the I/O saved is visible.
+"""
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.pdf_text import PDFTextDocument
+
+logger = logging.getLogger(__name__)
+
+# Pages read before giving up on finding the end of the criteria
+DEFAULT_MAX_SCAN_PAGES = 60
+
+BEFORE, INCLUSION, EXCLUSION, DONE = "before", "inclusion", "exclusion", "done"
+
+ELIGIBILITY_HEADING = re.compile(
+    r"^(?P<number>\d+(?:\.\d+)*)?\.?\s*(?:key\s+|main\s+)?(?P<kind>inclusion|exclusion)\s+criteria"
+    r"\s*(?:\(continued\))?\s*:?$",
+    re.IGNORECASE
+)
+NUMBERED_HEADING = re.compile(r"^(?P<number>\d+(?:\.\d+)*)\.?\s+(?P<title>[A-Z][^.:;]{2,60})$")
+CAPS_HEADING = re.compile(r"^[A-Z][A-Z /&,\-]{3,60}$")
+# Sections that commonly follow eligibility; used when headings are not numbered
+FOLLOWING_SECTIONS = re.compile(
+    r"study (treatment|design|procedures|drug|intervention|assessments|plan)|treatment plan|"
+    r"investigational product|randomi[sz]ation|schedule of|statistic|withdrawal|discontinuation|"
+    r"concomitant|lifestyle|screen failure|enrol?lment",
+    re.IGNORECASE
+)
+ITEM_CONTINUATION = re.compile(r"^[a-z(]")
+PAGE_FURNITURE = re.compile(r"^(page\s+)?\d+(\s+of\s+\d+)?$", re.IGNORECASE)
+
+
+def _section_number(number: Optional[str]) -> Optional[Tuple[int, ...]]:
+    return tuple(int(part) for part in number.split(".")) if number else None
+
+
+def _next_sections(number: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    """Numbers of the headings that can directly follow section `number`, e.g. 5.1 -> 5.2, 6."""
+    return [number[:level] + (number[level] + 1,) for level in range(len(number))]
+
+
+def _is_title_case(title: str) -> bool:
+    words = [word for word in re.findall(r"[A-Za-z]+", title) if len(word) > 3]
+    return bool(words) and all(word[0].isupper() for word in words)
+
+
+class EligibilitySectionScanner:
+    """Line-by-line state machine collecting inclusion and exclusion criteria."""
+
+    def __init__(self):
+        self.state = BEFORE
+        self.sections: Dict[str, List[str]] = {INCLUSION: [], EXCLUSION: []}
+        self.seen = set()
+        self._heading_number: Optional[Tuple[int, ...]] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state == DONE
+
+    def _ends_section(self, line: str) -> bool:
+        numbered = NUMBERED_HEADING.match(line)
+        if numbered and _is_title_case(numbered.group("title")):
+            if self._heading_number is None:
+                return bool(FOLLOWING_SECTIONS.search(numbered.group("title")))
+            return _section_number(numbered.group("number")) in _next_sections(self._heading_number)
+        if CAPS_HEADING.match(line) and sum(len(word) >= 4 for word in line.split()) >= 2:
+            return True
+        return _is_title_case(line) and len(line.split()) <= 8 and bool(FOLLOWING_SECTIONS.search(line))
+
+    def feed(self, line: str) -> None:
+        """Advance the state machine by one line of page text."""
+        line = re.sub(r"\s+", " ", line).strip()
+        if self.done or not line or PAGE_FURNITURE.match(line):
+            return
+
+        heading = ELIGIBILITY_HEADING.match(line)
+        if heading:
+            self.state = heading.group("kind").lower()
+            self.seen.add(self.state)
+            self._heading_number = _section_number(heading.group("number")) or self._heading_number
+            return
+
+        if self.state == BEFORE:
+            return
+
+        if self._ends_section(line):
+            # Keep looking if only one of the two sections has been seen so far
+            self.state = DONE if self.seen == {INCLUSION, EXCLUSION} else BEFORE
+            return
+
+        items = self.sections[self.state]
+        if items and ITEM_CONTINUATION.match(line):
+            items[-1] = f"{items[-1]} {line}"
+        else:
+            items.append(line)
+
+
+def scan_eligibility_sections(source, backend: Optional[str] = None,
+                              max_pages: Optional[int] = DEFAULT_MAX_SCAN_PAGES) -> Dict:
+    """
+    Read pages until the eligibility sections end or max_pages is reached.
+
+    Args:
+        source: PDF path or binary file object
+        backend: Text extraction backend; the fastest installed one when None
+        max_pages: Page cap, or None to allow reading the whole document
+
+    Returns:
+        Dictionary with inclusion and exclusion (lists of criteria),
+        pages_scanned, total_pages, complete (both sections found and
+        their end seen) and text (the criteria as plain text)
+    """
+    scanner = EligibilitySectionScanner()
+    pages_scanned = 0
+
+    with PDFTextDocument(source, backend=backend) as document:
+        for page in document.pages(stop=max_pages):
+            pages_scanned += 1
+            for line in page.text.split("\n"):
+                scanner.feed(line)
+            if scanner.done:
+                break
+        total_pages = document.page_count
+
+    inclusion, exclusion = scanner.sections[INCLUSION], scanner.sections[EXCLUSION]
+    text_parts = []
+    if inclusion:
+        text_parts += ["Inclusion Criteria:"] + inclusion
+    if exclusion:
+        text_parts += ["Exclusion Criteria:"] + exclusion
+
+    logger.info(
+        f"Scanned {pages_scanned} of {total_pages} pages: {len(inclusion)} inclusion and "
+        f"{len(exclusion)} exclusion criteria{'' if scanner.done else ' (end of criteria not found)'}"
+    )
+    return {
+        "inclusion": inclusion,
+        "exclusion": exclusion,
+        "pages_scanned": pages_scanned,
+        "total_pages": total_pages,
+        "complete": scanner.done,
+        "text": "\n".join(text_parts),
+    }
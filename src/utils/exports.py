@@ -0,0 +1,107 @@
+"""
+Export payloads (CSV / Parquet) for eligible-patient lists.
+
+Payloads are built only when an export is requested and memoized per
+(key, data version, format). CSV is encoded in row chunks written into a
+single buffer, so building a payload holds the finished bytes plus one
+chunk rather than a list of chunks and a joined copy.
+"""
+import io
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterator, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": "csv", "mime": "text/csv"},
+    "Parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+# Rows serialized per CSV chunk
+CSV_CHUNK_ROWS = 50_000
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield the CSV encoding of df in chunks, header first."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=(start == 0)).encode("utf-8")
+
+
+def to_parquet_bytes(df: pd.DataFrame, compression: str = "zstd") -> bytes:
+    """Serialize df to compressed Parquet (requires pyarrow)."""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False, compression=compression)
+    return buffer.getvalue()
+
+
+def build_export(df: pd.DataFrame, fmt: str) -> bytes:
+    """Serialize df in one of EXPORT_FORMATS."""
+    if fmt == "CSV":
+        buffer = io.BytesIO()
+        for chunk in iter_csv_chunks(df):
+            buffer.write(chunk)
+        return buffer.getvalue()
+    if fmt == "Parquet":
+        return to_parquet_bytes(df)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def write_export(df: pd.DataFrame, path: str, fmt: str = "CSV") -> Path:
+    """Stream an export straight to disk, chunk by chunk for CSV."""
+    path = Path(path)
+    with open(path, "wb") as f:
+        if fmt == "CSV":
+            for chunk in iter_csv_chunks(df):
+                f.write(chunk)
+        else:
+            f.write(build_export(df, fmt))
+    logger.info(f"Wrote {len(df)} rows to {path}")
+    return path
+
+
+class ExportCache:
+    """Small thread-safe LRU of serialized export payloads."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: str, data_version: str, fmt: str,
+                     build: Callable[[], pd.DataFrame]) -> bytes:
+        """
+        Return the cached payload, serializing build() only on a miss.
+
+        Args:
+            key: Identifies the export, e.g. the trial file
+            data_version: Changes whenever the underlying data changes
+            fmt: One of EXPORT_FORMATS
+            build: Returns the DataFrame to export; not called on a hit
+        """
+        cache_key = (key, data_version, fmt)
+        with self._lock:
+            if cache_key in self._entries:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return self._entries[cache_key]
+
+        payload = build_export(build(), fmt)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[cache_key] = payload
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,30 @@
+"""
+General-purpose helper functions.
+"""
+import math
+from typing import List, Sequence, Tuple
+
+
+def paginate(items: Sequence, page: int, page_size: int) -> Tuple[List, int]:
+    """
+    Slice a sequence into a single page.
+
+    Args:
+        items: Sequence to slice
+        page: 1-based page number, clamped to the valid range
+        page_size: Number of items per page
+
+    Returns:
+        Tuple of (items_on_page, total_pages)
+    """
+    total_pages = page_count(len(items), page_size)
+    page = min(max(int(page), 1), total_pages)
+    start = (page - 1) * page_size
+    return list(items[start:start + page_size]), total_pages
+
+
+def page_count(total_items: int, page_size: int) -> int:
+    """Number of pages needed for total_items, never less than one."""
+    if page_size <= 0:
+        raise ValueError(f"page_size must be positive, got {page_size}")
+    return max(1, math.ceil(total_items / page_size))
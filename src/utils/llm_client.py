@@ -0,0 +1,168 @@
+"""
+Shared OpenAI client and streaming JSON parsing.
+
+get_openai_client returns one client per (api key, base URL) for the
+whole process. Its connection pool keeps connections alive between
+uploads, so only the first request pays for the TCP and TLS handshake.
+
+stream_json_fields parses a streamed completion incrementally and yields
+each top-level field of the JSON object as soon as its value is complete.
+This lets the UI show stage or mutation before the rest of the response
+has arrived.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = "gpt-4o-mini"
+
+# Seconds; override with TRIALMATCH_LLM_CONNECT_TIMEOUT / TRIALMATCH_LLM_READ_TIMEOUT
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None,
+                      connect_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                      max_connections: int = DEFAULT_MAX_CONNECTIONS, max_retries: int = 2):
+    """
+    Process-wide pooled OpenAI client for an API key and base URL.
+
+    Timeouts and pool settings only apply when the client is first created.
+    """
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _create_client(api_key, base_url, connect_timeout, read_timeout, max_connections, max_retries)
+            _clients[key] = client
+        return client
+
+
+def _create_client(api_key, base_url, connect_timeout, read_timeout, max_connections, max_retries):
+    import openai
+
+    connect_timeout = connect_timeout or float(os.environ.get("TRIALMATCH_LLM_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+    read_timeout = read_timeout or float(os.environ.get("TRIALMATCH_LLM_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))
+    timeout = openai.Timeout(read_timeout, connect=connect_timeout)
+    # Limits class of whichever httpx build the SDK ships with
+    limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY
+    )
+    http_client = openai.DefaultHttpxClient(limits=limits, timeout=timeout)
+    logger.info(f"Created pooled OpenAI client (base_url={base_url or 'default'}, max_connections={max_connections})")
+    return openai.OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=max_retries,
+        http_client=http_client
+    )
+
+
+def close_clients() -> None:
+    """Close every pooled client (used at shutdown and in tests)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for one streamed JSON object.
+
+    feed() returns the (key, value) pairs whose values were completed by
+    the new text. Markdown code fences before the object are ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._value_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self.fields: Dict[str, Any] = {}
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self._buffer += text
+        completed = []
+
+        while self._position < len(self._buffer):
+            char = self._buffer[self._position]
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._value_start = self._position + 1
+                self._position += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_value(completed)
+            elif char == ":" and self._depth == 1 and self._key is None:
+                self._key = json.loads(self._buffer[self._value_start:self._position])
+                self._value_start = self._position + 1
+            elif char == "," and self._depth == 1:
+                self._complete_value(completed)
+                self._value_start = self._position + 1
+
+            self._position += 1
+
+        return completed
+
+    def _complete_value(self, completed: List[Tuple[str, Any]]) -> None:
+        if self._key is None:
+            return
+        value = json.loads(self._buffer[self._value_start:self._position])
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+        self._key = None
+
+    @property
+    def complete(self) -> bool:
+        return self._started and self._depth == 0
+
+
+def stream_json_fields(chunks: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each top-level field of a JSON object streamed as text chunks."""
+    parser = IncrementalJSONParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    if not parser.complete:
+        raise json.JSONDecodeError("Streamed JSON object is incomplete", parser._buffer, len(parser._buffer))
+
+
+def stream_chat_text(client, messages: List[Dict], model: str = LLM_MODEL, **kwargs) -> Iterator[str]:
+    """Yield the content deltas of a streamed chat completion."""
+    stream = client.chat.completions.create(model=model, messages=messages, stream=True, **kwargs)
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
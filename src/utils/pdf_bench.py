@@ -0,0 +1,176 @@
+"""
+Synthetic protocol PDFs and a backend benchmark for PDF text extraction.
+
+    python -m src.utils.pdf_bench --documents 5 --pages 60
+
+Writes a corpus of synthetic protocols (filler sections around an
+Inclusion/Exclusion block) to a temporary directory and reports pages per
+second for every installed extraction backend, and how many pages the
+early-exit eligibility scan reads.
+"""
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from src.utils.criteria_scan import scan_eligibility_sections
+from src.utils.pdf_text import PDFTextDocument, available_backends
+
+logger = logging.getLogger(__name__)
+
+FILLER_SENTENCES = [
+    "The study drug is administered orally once daily in 21-day cycles.",
+    "Pharmacokinetic samples are collected before dosing on day 1 of each cycle.",
+    "Adverse events are graded according to CTCAE version 5.0.",
+    "Tumour response is assessed by RECIST 1.1 every six weeks.",
+    "The sponsor monitors data quality through regular site visits.",
+    "Dose modifications follow the guidance in the investigator brochure.",
+    "Quality of life questionnaires are completed at baseline and every cycle.",
+]
+
+INCLUSION_CRITERIA = [
+    "Histologically confirmed stage IIIB or IV non-small cell lung cancer",
+    "Documented EGFR exon 19 deletion or L858R mutation",
+    "ECOG performance status of 0 or 1",
+    "Adequate bone marrow, liver and renal function",
+    "At least one measurable lesion per RECIST 1.1",
+]
+
+EXCLUSION_CRITERIA = [
+    "Prior treatment with an EGFR tyrosine kinase inhibitor",
+    "Symptomatic or untreated brain metastases",
+    "History of interstitial lung disease",
+    "Active infection requiring systemic therapy",
+]
+
+
+def write_synthetic_protocol(path: str, pages: int = 60, eligibility_page: int = 20,
+                             lines_per_page: int = 40, seed: int = 0) -> Path:
+    """
+    Write a protocol-like PDF.
+
+    Inclusion criteria fill `eligibility_page` (1-based), exclusion
+    criteria fill the next page and a "Study Treatment" section starts the
+    page after that. All other pages are numbered filler sections.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    rng = random.Random(seed)
+    path = Path(path)
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    _, height = letter
+
+    for number in range(1, pages + 1):
+        if number == eligibility_page:
+            lines = ["5. Inclusion Criteria"] + [f"{i}. {c}" for i, c in enumerate(INCLUSION_CRITERIA, 1)]
+        elif number == eligibility_page + 1:
+            lines = ["6. Exclusion Criteria"] + [f"{i}. {c}" for i, c in enumerate(EXCLUSION_CRITERIA, 1)]
+        elif number == eligibility_page + 2:
+            lines = ["7. Study Treatment"]
+        else:
+            lines = [f"Section {number}. Study Procedures"]
+        if not eligibility_page <= number <= eligibility_page + 1:
+            lines += [rng.choice(FILLER_SENTENCES) for _ in range(lines_per_page - len(lines))]
+
+        text = pdf.beginText(50, height - 50)
+        text.setFont("Helvetica", 9)
+        for line in lines:
+            text.textLine(line)
+        pdf.drawText(text)
+        pdf.showPage()
+
+    pdf.save()
+    return path
+
+
+def build_corpus(directory: str, documents: int = 5, pages: int = 60) -> List[Path]:
+    """Write `documents` synthetic protocols with eligibility sections at varying pages."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    return [
+        write_synthetic_protocol(
+            directory / f"protocol_{i:03d}.pdf",
+            pages=pages,
+            eligibility_page=min(10 + 5 * i, max(pages - 2, 1)),
+            seed=i
+        )
+        for i in range(documents)
+    ]
+
+
+def benchmark_backends(paths: List[Path], backends: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Extract every page of every document with each backend (no fallback).
+
+    Returns:
+        DataFrame with backend, documents, pages, characters, seconds and pages_per_second
+    """
+    rows = []
+    for backend in backends or available_backends():
+        pages = characters = 0
+        start = time.perf_counter()
+        for path in paths:
+            with PDFTextDocument(path, backend=backend, fallback=False) as document:
+                for page in document.pages():
+                    pages += 1
+                    characters += len(page.text)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "backend": backend,
+            "documents": len(paths),
+            "pages": pages,
+            "characters": characters,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 1) if elapsed else float("inf"),
+        })
+        logger.info(f"{backend}: {pages} pages in {elapsed:.2f}s")
+    return pd.DataFrame(rows)
+
+
+def benchmark_scan(paths: List[Path], backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Early-exit eligibility scan of each document.
+
+    Returns:
+        DataFrame with document, pages_scanned, total_pages, complete and seconds
+    """
+    rows = []
+    for path in paths:
+        start = time.perf_counter()
+        scan = scan_eligibility_sections(path, backend=backend, max_pages=None)
+        rows.append({
+            "document": Path(path).name,
+            "pages_scanned": scan["pages_scanned"],
+            "total_pages": scan["total_pages"],
+            "complete": scan["complete"],
+            "seconds": round(time.perf_counter() - start, 3),
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction backends")
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--corpus-dir", default=None, help="Reuse or keep the corpus here")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = build_corpus(args.corpus_dir or tmp_dir, args.documents, args.pages)
+        print(benchmark_backends(paths).to_string(index=False))
+        scans = benchmark_scan(paths)
+        print()
+        print(scans.to_string(index=False))
+        print(f"Eligibility scan read {scans['pages_scanned'].sum()} of {scans['total_pages'].sum()} pages")
+
+
+if __name__ == "__main__":
+    main()
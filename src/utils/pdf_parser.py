@@ -1,61 +1,75 @@
 """
 PDF parsing utilities for clinical trial documents.
+
+Text extraction goes through src.utils.pdf_text, which picks the fastest
+installed backend. LLM calls use the process-wide pooled client from
+src.utils.llm_client. openai and the PDF libraries are imported only when
+they are used, so importing this module stays cheap for the rest of the app.
 """
-import pdfplumber
-import openai
 import json
 import logging
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.criteria_scan import DEFAULT_MAX_SCAN_PAGES, scan_eligibility_sections
+from src.utils.llm_client import LLM_MODEL, get_openai_client, stream_chat_text, stream_json_fields
+from src.utils.pdf_text import iter_pages
 
 logger = logging.getLogger(__name__)
 
 class PDFParser:
     """Handles PDF parsing and AI-powered content extraction."""
     
-    def __init__(self, openai_api_key: str):
-        openai.api_key = openai_api_key
+    def __init__(self, openai_api_key: str, pdf_backend: Optional[str] = None,
+                 base_url: Optional[str] = None):
+        """
+        Args:
+            openai_api_key: OpenAI API key
+            pdf_backend: Text extraction backend name ("pypdf", "pdfplumber");
+                the fastest installed one when None
+            base_url: Alternative OpenAI-compatible endpoint
+        """
+        # Pooled client shared by every parser in the process
+        self.client = get_openai_client(openai_api_key, base_url)
+        self.pdf_backend = pdf_backend
         logger.info("PDFParser initialized")
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract all text from PDF file."""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                all_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+            all_text = "\n".join(page.text for page in iter_pages(pdf_path, self.pdf_backend))
             logger.info(f"Extracted {len(all_text)} characters from {pdf_path}")
             return all_text
         except Exception as e:
             logger.error(f"Error extracting text from PDF {pdf_path}: {e}")
             raise
     
-    def extract_criteria_sections(self, pdf_path: str) -> Tuple[List[str], List[str]]:
-        """Extract inclusion and exclusion criteria sections."""
-        inclusion = []
-        exclusion = []
+    def extract_criteria_sections(self, pdf_path: str,
+                                  max_pages: Optional[int] = DEFAULT_MAX_SCAN_PAGES) -> Tuple[List[str], List[str]]:
+        """
+        Extract inclusion and exclusion criteria sections.
+        
+        Pages are read only until the criteria end (see scan_criteria_sections).
+        """
+        scan = self.scan_criteria_sections(pdf_path, max_pages)
+        return scan["inclusion"], scan["exclusion"]
+    
+    def scan_criteria_sections(self, pdf_path: str, max_pages: Optional[int] = DEFAULT_MAX_SCAN_PAGES) -> Dict:
+        """
+        Early-exit scan for the eligibility sections.
         
+        Returns:
+            Dictionary with inclusion, exclusion, pages_scanned, total_pages,
+            complete and text (empty lists and zero pages on error)
+        """
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if not text:
-                        continue
-                    
-                    lines = text.split("\n")
-                    for line in lines:
-                        line_lower = line.lower().strip()
-                        if "inclusion" in line_lower and len(line.strip()) > 10:
-                            inclusion.append(line.strip())
-                        elif "exclusion" in line_lower and len(line.strip()) > 10:
-                            exclusion.append(line.strip())
-            
-            logger.info(f"Extracted {len(inclusion)} inclusion and {len(exclusion)} exclusion criteria")
-            return inclusion, exclusion
-            
+            return scan_eligibility_sections(pdf_path, self.pdf_backend, max_pages)
         except Exception as e:
             logger.error(f"Error extracting criteria from PDF {pdf_path}: {e}")
-            return [], []
+            return {"inclusion": [], "exclusion": [], "pages_scanned": 0, "total_pages": 0,
+                    "complete": False, "text": ""}
     
-    def interpret_criteria_with_ai(self, text: str) -> Dict:
-        """Use AI to interpret and structure trial criteria."""
+    def _criteria_messages(self, text: str) -> List[Dict]:
+        # Short structured fields come first so they stream in before the raw criteria lists
         prompt = f"""
         You are a clinical trial document parser. Extract the following from the trial text below:
         - Stage requirements (as list of strings, e.g. ["I", "IIIA"])
@@ -64,24 +78,27 @@ class PDFParser:
         - Raw inclusion criteria (list of strings)
         - Raw exclusion criteria (list of strings)
 
-        Only return a valid JSON object with the following keys:
+        Only return a valid JSON object with the following keys, in this order:
         stage, mutation_required, performance_status_max, raw_inclusion, raw_exclusion.
 
         Trial text:
         {text}
         """
-
+        return [
+            {"role": "system", "content": "You are a helpful clinical trial parser."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def interpret_criteria_with_ai(self, text: str) -> Dict:
+        """Use AI to interpret and structure trial criteria."""
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful clinical trial parser."},
-                    {"role": "user", "content": prompt}
-                ],
+            response = self.client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=self._criteria_messages(text),
                 temperature=0
             )
 
-            parsed = response["choices"][0]["message"]["content"]
+            parsed = response.choices[0].message.content
             structured = json.loads(parsed)
             logger.info("Successfully parsed criteria with AI")
             return structured
@@ -92,3 +109,26 @@ class PDFParser:
         except Exception as e:
             logger.error(f"Error in AI interpretation: {e}")
             return {}
+    
+    def stream_criteria_with_ai(self, text: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming variant of interpret_criteria_with_ai.
+        
+        Yields (field, value) pairs as soon as each value is complete.
+        
+        Raises:
+            json.JSONDecodeError: If the stream ends before the JSON object is
+                complete (truncated or timed-out completion)
+            Exception: Any API error; fields yielded before it are partial and
+                must not be treated as a finished analysis
+        """
+        try:
+            chunks = stream_chat_text(self.client, self._criteria_messages(text), temperature=0)
+            yield from stream_json_fields(chunks)
+            logger.info("Successfully streamed criteria with AI")
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed JSON from AI output: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in streamed AI interpretation: {e}")
+            raise
@@ -0,0 +1,211 @@
+"""
+PDF text extraction with interchangeable backends.
+
+Two backends are supported:
+
+- pypdf: fast, pure Python, but loses layout on some documents
+- pdfplumber: layout-aware and more robust, but several times slower
+
+PDFTextDocument reads pages one at a time with the fastest available
+backend. A page is re-extracted with the layout-aware backend only when
+the fast one returns an empty or garbled page. Backend libraries are
+imported when a document is opened, so importing this module is cheap.
+"""
+import importlib.util
+import logging
+import re
+from contextlib import ExitStack
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Glyphs pdfminer could not map to unicode come out as "(cid:123)"
+_CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+
+class PageText(NamedTuple):
+    number: int
+    text: str
+    backend: str
+
+
+class ExtractionBackend:
+    """Opens a PDF and extracts the text of single pages."""
+
+    name = ""
+    module = ""
+    layout_aware = False
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def open(self, source):
+        """Return an open document handle; closed through close()."""
+        raise NotImplementedError
+
+    def page_count(self, handle) -> int:
+        raise NotImplementedError
+
+    def page_text(self, handle, index: int) -> str:
+        raise NotImplementedError
+
+    def close(self, handle) -> None:
+        pass
+
+
+class PyPDFBackend(ExtractionBackend):
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, source):
+        from pypdf import PdfReader
+        return PdfReader(source)
+
+    def page_count(self, handle) -> int:
+        return len(handle.pages)
+
+    def page_text(self, handle, index: int) -> str:
+        return handle.pages[index].extract_text() or ""
+
+    def close(self, handle) -> None:
+        handle.close()
+
+
+class PDFPlumberBackend(ExtractionBackend):
+    name = "pdfplumber"
+    module = "pdfplumber"
+    layout_aware = True
+
+    def open(self, source):
+        import pdfplumber
+        return pdfplumber.open(source)
+
+    def page_count(self, handle) -> int:
+        return len(handle.pages)
+
+    def page_text(self, handle, index: int) -> str:
+        page = handle.pages[index]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # Drop the page's cached layout objects; long protocols otherwise keep every page in memory
+            page.close()
+
+    def close(self, handle) -> None:
+        handle.close()
+
+
+# Fastest first
+BACKENDS: Dict[str, ExtractionBackend] = {
+    backend.name: backend for backend in [PyPDFBackend(), PDFPlumberBackend()]
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the installed backends, fastest first."""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def get_backend(backend: Union[str, ExtractionBackend, None] = None) -> ExtractionBackend:
+    """Resolve a backend name (None or "auto" for the fastest installed one)."""
+    if isinstance(backend, ExtractionBackend):
+        return backend
+    if backend in (None, "auto"):
+        names = available_backends()
+        if not names:
+            raise ImportError("No PDF backend installed. Install with: pip install pypdf pdfplumber")
+        return BACKENDS[names[0]]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; expected one of {list(BACKENDS)}")
+    return BACKENDS[backend]
+
+
+def is_garbled(text: str, min_letter_ratio: float = 0.4) -> bool:
+    """Heuristic for pages whose extraction failed: empty, unmapped glyphs, or mostly non-letters."""
+    characters = [c for c in text if not c.isspace()]
+    if not characters:
+        return True
+    if "\ufffd" in text or len(_CID_PATTERN.findall(text)) >= 3:
+        return True
+    letters = sum(c.isalpha() for c in characters)
+    return letters / len(characters) < min_letter_ratio
+
+
+class PDFTextDocument:
+    """Page-by-page text of one PDF, with layout-aware fallback for bad pages."""
+
+    def __init__(self, source, backend: Union[str, ExtractionBackend, None] = None,
+                 fallback: Union[str, ExtractionBackend, bool, None] = True):
+        """
+        Args:
+            source: Path or binary file object
+            backend: Backend name or instance; the fastest installed one by default
+            fallback: Backend used for empty or garbled pages. True picks the
+                installed layout-aware backend, False/None disables fallback
+        """
+        self.source = source
+        self.backend = get_backend(backend)
+        if fallback is True:
+            fallback = next(
+                (BACKENDS[name] for name in available_backends() if BACKENDS[name].layout_aware),
+                None
+            )
+        self.fallback = get_backend(fallback) if fallback else None
+        if self.fallback is not None and self.fallback.name == self.backend.name:
+            self.fallback = None
+
+        self.page_count = 0
+        self.fallback_pages = 0
+        self._handle = None
+        self._fallback_handle = None
+        self._stack = ExitStack()
+
+    def __enter__(self) -> "PDFTextDocument":
+        self._handle = self._open(self.backend)
+        self.page_count = self.backend.page_count(self._handle)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+
+    def _open(self, backend: ExtractionBackend):
+        if hasattr(self.source, "seek"):
+            self.source.seek(0)
+        handle = backend.open(self.source)
+        self._stack.callback(backend.close, handle)
+        return handle
+
+    def page(self, index: int) -> PageText:
+        """Text of one page (0-based index)."""
+        text = self.backend.page_text(self._handle, index)
+        if self.fallback is None or not is_garbled(text):
+            return PageText(index + 1, text, self.backend.name)
+
+        if self._fallback_handle is None:
+            self._fallback_handle = self._open(self.fallback)
+        fallback_text = self.fallback.page_text(self._fallback_handle, index)
+        if is_garbled(fallback_text) and len(fallback_text.strip()) <= len(text.strip()):
+            return PageText(index + 1, text, self.backend.name)
+
+        self.fallback_pages += 1
+        logger.debug(f"Page {index + 1} re-extracted with {self.fallback.name}")
+        return PageText(index + 1, fallback_text, self.fallback.name)
+
+    def pages(self, start: int = 0, stop: Optional[int] = None) -> Iterator[PageText]:
+        """Yield pages in order; only the current page is held in memory."""
+        stop = self.page_count if stop is None else min(stop, self.page_count)
+        for index in range(start, stop):
+            yield self.page(index)
+
+
+def iter_pages(source, backend: Union[str, ExtractionBackend, None] = None,
+               fallback: Union[str, ExtractionBackend, bool, None] = True) -> Iterator[PageText]:
+    """Stream the pages of a PDF; the document is closed when the generator finishes."""
+    with PDFTextDocument(source, backend, fallback) as document:
+        yield from document.pages()
+
+
+def extract_text(source, backend: Union[str, ExtractionBackend, None] = None,
+                 fallback: Union[str, ExtractionBackend, bool, None] = True) -> str:
+    """All text of a PDF, pages separated by newlines."""
+    return "\n".join(page.text for page in iter_pages(source, backend, fallback))
@@ -0,0 +1,139 @@
+"""
+Reuse of parsed criteria for re-uploaded trial protocol text.
+
+Site copies and re-exports of a protocol often carry exactly the same
+eligibility text as one that has already been parsed. ProtocolIndex keys
+each parsed protocol on a fingerprint of its normalized line set (case and
+whitespace collapsed, line order ignored), so a re-upload is found with a
+single dictionary lookup and its stored structured criteria are reused
+without an LLM call.
+
+The app indexes only the scanned eligibility text, so every line is
+eligibility content: any added, edited or removed line gives a different
+fingerprint and the protocol is parsed again. Partially re-parsing only
+the changed lines is deliberately not attempted, since structured criteria
+cannot be reliably un-merged when a line is removed or edited.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_lines(text: str) -> List[str]:
+    """Lower-cased, whitespace-collapsed, non-empty lines."""
+    lines = (re.sub(r"\s+", " ", line).strip().lower() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+def protocol_fingerprint(text: str) -> str:
+    """SHA-256 of the sorted set of normalized lines."""
+    return hashlib.sha256("\n".join(sorted(set(normalize_lines(text)))).encode()).hexdigest()
+
+
+class ProtocolIndex:
+    """Parsed protocols and their structured criteria, keyed by line-set fingerprint."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Optional JSON file the index is loaded from and saved to
+        """
+        self.path = Path(path) if path else None
+        self.documents: Dict[str, Dict] = {}
+        self._by_fingerprint: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.llm_calls_saved = 0
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def add(self, doc_id: str, text: str, criteria: Dict, name: Optional[str] = None) -> None:
+        """Store a parsed protocol's fingerprint and structured criteria."""
+        fingerprint = protocol_fingerprint(text)
+        with self._lock:
+            self._remove(doc_id)
+            self.documents[doc_id] = {"fingerprint": fingerprint, "criteria": criteria, "name": name or doc_id}
+            self._by_fingerprint[fingerprint] = doc_id
+        if self.path:
+            self.save()
+
+    def _remove(self, doc_id: str) -> None:
+        document = self.documents.pop(doc_id, None)
+        if document is not None and self._by_fingerprint.get(document["fingerprint"]) == doc_id:
+            del self._by_fingerprint[document["fingerprint"]]
+
+    def query(self, text: str) -> Optional[Dict]:
+        """
+        Find a stored protocol with the same normalized lines.
+
+        Returns:
+            None, or a dict with doc_id, name and criteria
+        """
+        fingerprint = protocol_fingerprint(text)
+        with self._lock:
+            doc_id = self._by_fingerprint.get(fingerprint)
+            if doc_id is None:
+                return None
+            document = self.documents[doc_id]
+        return {"doc_id": doc_id, "name": document["name"], "criteria": document["criteria"]}
+
+    def get_or_parse(self, doc_id: str, text: str, parse: Callable[[], Dict],
+                     name: Optional[str] = None) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Reuse the criteria of a protocol with the same lines, or parse and index it.
+
+        Args:
+            doc_id: Identifier stored for this protocol, e.g. a content hash
+            text: Extracted protocol text
+            parse: Called (e.g. the LLM interpretation) when no stored protocol matches
+            name: Display name stored with the protocol (defaults to doc_id)
+
+        Returns:
+            Tuple of (structured_criteria, match) where match is the query
+            result that was reused, or None if parse() was called
+        """
+        match = self.query(text)
+        if match:
+            self.llm_calls_saved += 1
+            logger.info(f"Reusing criteria of {match['doc_id']} for {doc_id}")
+            return match["criteria"], match
+
+        criteria = parse()
+        if criteria:
+            self.add(doc_id, text, criteria, name=name)
+        return criteria, None
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {doc_id: dict(document) for doc_id, document in self.documents.items()}
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+        tmp_path.replace(self.path)
+
+    def load(self) -> None:
+        with open(self.path, "r") as f:
+            payload = json.load(f)
+        skipped = 0
+        with self._lock:
+            for doc_id, document in payload.items():
+                if "fingerprint" not in document:
+                    # Entries from the earlier MinHash index only kept line checksums
+                    skipped += 1
+                    continue
+                self.documents[doc_id] = {
+                    "fingerprint": document["fingerprint"],
+                    "criteria": document["criteria"],
+                    "name": document.get("name", doc_id),
+                }
+                self._by_fingerprint[document["fingerprint"]] = doc_id
+        logger.info(f"Loaded {len(self.documents)} protocols from {self.path} ({skipped} outdated entries skipped)")
+
+    def __len__(self) -> int:
+        return len(self.documents)
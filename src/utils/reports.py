@@ -0,0 +1,218 @@
+"""
+PDF report rendering for eligible-patient lists.
+
+Style objects are built once per process and reused for every report.
+Large patient tables are split into fixed-size chunks with a repeated
+header row so reportlab can flow them across pages without laying out
+one huge table. reportlab is imported lazily to keep app startup cheap.
+
+Reports for every trial can be rendered in parallel worker processes,
+either from the UI or headlessly:
+
+    python -m src.utils.reports --output-dir reports --workers 4
+"""
+import argparse
+import io
+import logging
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REPORT_COLUMNS = ['patient_id', 'age', 'stage', 'mutation_status', 'performance_status']
+TABLE_HEADER = ['Patient ID', 'Age', 'Stage', 'Mutation', 'Performance Status']
+
+# Rows per table chunk; keeps reportlab layout cost linear for big cohorts
+TABLE_CHUNK_ROWS = 250
+
+
+@lru_cache(maxsize=None)
+def get_report_styles() -> Dict:
+    """Build the paragraph and table styles once per process."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'sheet': styles,
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=30,
+            textColor=colors.HexColor('#1f77b4')
+        ),
+        'table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+        'col_widths': [1.2*inch, 0.8*inch, 0.8*inch, 1.5*inch, 1.2*inch],
+        'top_margin': 0.5*inch,
+    }
+
+
+def render_trial_report(trial: Dict, eligible_patients: pd.DataFrame,
+                        generated_at: Optional[pd.Timestamp] = None) -> bytes:
+    """
+    Render the eligible-patients PDF report for one trial.
+
+    Args:
+        trial: Trial data as loaded by DataLoader
+        eligible_patients: DataFrame with REPORT_COLUMNS for eligible patients
+        generated_at: Timestamp printed on the report, defaults to now
+
+    Returns:
+        PDF document as bytes
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+    report_styles = get_report_styles()
+    styles = report_styles['sheet']
+    generated_at = generated_at or pd.Timestamp.now()
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=report_styles['top_margin'])
+
+    content = [
+        Paragraph("TrialMatch AI - Eligible Patients Report", report_styles['title']),
+        Paragraph(f"Trial: {trial['title']}", styles['Heading2']),
+        Paragraph(f"Generated: {generated_at.strftime('%Y-%m-%d %H:%M')}", styles['Normal']),
+        Spacer(1, 20),
+        Paragraph("Trial Information:", styles['Heading3']),
+        Paragraph(f"<b>Trial ID:</b> {trial.get('trial_id', 'N/A')}", styles['Normal']),
+        Paragraph(f"<b>Description:</b> {trial.get('description', 'N/A')}", styles['Normal']),
+        Spacer(1, 15),
+        Paragraph(f"Eligible Patients ({len(eligible_patients)}):", styles['Heading3']),
+    ]
+
+    rows = [
+        [str(value) for value in row]
+        for row in eligible_patients[REPORT_COLUMNS].itertuples(index=False, name=None)
+    ]
+    for start in range(0, max(len(rows), 1), TABLE_CHUNK_ROWS):
+        table = Table(
+            [TABLE_HEADER] + rows[start:start + TABLE_CHUNK_ROWS],
+            colWidths=report_styles['col_widths'],
+            repeatRows=1
+        )
+        table.setStyle(report_styles['table'])
+        content.append(table)
+
+    doc.build(content)
+    return buffer.getvalue()
+
+
+def report_filename(trial: Dict, trial_file: str) -> str:
+    """File name used for a trial's report in bulk output directories."""
+    trial_id = str(trial.get('trial_id') or Path(trial_file).stem)
+    return f"eligible_patients_{re.sub(r'[^A-Za-z0-9_.-]+', '_', trial_id)}.pdf"
+
+
+# Cohort shared with worker processes, set once per worker by the initializer
+_worker_patients: Optional[pd.DataFrame] = None
+
+
+def _init_worker(patients: pd.DataFrame) -> None:
+    global _worker_patients
+    _worker_patients = patients
+
+
+def _render_to_file(trial_file: str, trial: Dict, output_dir: str,
+                    generated_at: pd.Timestamp) -> str:
+    """Worker task: match one trial against the cohort and write its report."""
+    from src.matching.engine import TrialMatchEngine
+
+    engine = TrialMatchEngine()
+    mask = engine.eligible_mask(_worker_patients, trial['criteria'])
+    eligible = _worker_patients.loc[mask, REPORT_COLUMNS]
+
+    path = Path(output_dir) / report_filename(trial, trial_file)
+    path.write_bytes(render_trial_report(trial, eligible, generated_at))
+    return str(path)
+
+
+def render_all_reports(patients: pd.DataFrame, trials: Dict, output_dir: str,
+                       workers: Optional[int] = None) -> Dict:
+    """
+    Render reports for every trial in parallel worker processes.
+
+    Args:
+        patients: Full patient cohort
+        trials: Trial data keyed by trial file
+        output_dir: Directory the PDF reports are written to
+        workers: Number of worker processes, defaults to the CPU count
+
+    Returns:
+        Dictionary with keys: reports, failed, elapsed_seconds, reports_per_second
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    generated_at = pd.Timestamp.now()
+    reports: List[str] = []
+    failed: List[str] = []
+
+    start = time.perf_counter()
+    # Spawn rather than fork: forking the multi-threaded Streamlit server can
+    # deadlock a child on a lock held by another thread at fork time
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(patients,)) as pool:
+        futures = {
+            pool.submit(_render_to_file, trial_file, trial, output_dir, generated_at): trial_file
+            for trial_file, trial in trials.items()
+        }
+        for future in as_completed(futures):
+            try:
+                reports.append(future.result())
+            except Exception as e:
+                logger.error(f"Error rendering report for {futures[future]}: {e}")
+                failed.append(futures[future])
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'reports': sorted(reports),
+        'failed': sorted(failed),
+        'elapsed_seconds': elapsed,
+        'reports_per_second': len(reports) / elapsed if elapsed > 0 else 0.0,
+    }
+    logger.info(
+        f"Rendered {len(reports)} reports to {output_dir} in {elapsed:.2f}s "
+        f"({result['reports_per_second']:.1f} reports/s, {len(failed)} failed)"
+    )
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Headless entry point for nightly bulk report generation."""
+    from src.data.loader import DataLoader
+
+    parser = argparse.ArgumentParser(description="Render eligible-patient PDF reports for all trials")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    loader = DataLoader(args.data_dir)
+    result = render_all_reports(loader.load_patients(), loader.load_trials(), args.output_dir, args.workers)
+    print(f"{len(result['reports'])} reports in {result['elapsed_seconds']:.2f}s "
+          f"({result['reports_per_second']:.1f} reports/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,23 @@ TrialMatch AI - Main Streamlit Application
 """
 import streamlit as st
 import pandas as pd
+import json
+import hashlib
+import io
 import logging
+import os
 from pathlib import Path
 
 # Import our custom modules
+from src.matching.analytics import CohortAnalytics
 from src.matching.engine import TrialMatchEngine
+from src.matching.search import TrialSearchIndex
+from src.matching.sweep import CriteriaSweep, ps_max_choices
 from src.data.loader import DataLoader
-from src.utils.pdf_parser import PDFParser
+from src.data.manifest import TrialReloader
+from src.data.repository import PatientRepository
+from src.utils.exports import EXPORT_FORMATS, ExportCache
+from src.utils.helpers import page_count
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +28,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Patient CSV and trials/ directory; overridden by the load harness to use synthetic cohorts
+DATA_DIR = os.environ.get("TRIALMATCH_DATA_DIR", "data")
+
+# Maximum number of patient ids offered in the search selectbox
+PATIENT_SEARCH_LIMIT = 50
+
+# Seconds between checks of the trial files for changes
+TRIAL_RELOAD_INTERVAL = 2.0
+
+# Rows/trials rendered per page of match results
+RESULTS_PAGE_SIZE = 10
+
+ELIGIBLE_PATIENT_COLUMNS = ['patient_id', 'age', 'stage', 'mutation_status', 'performance_status']
+
+# Parsed protocols kept for reuse on re-upload across restarts
+PROTOCOL_INDEX_PATH = "protocol_index.json"
+
 # Page config
 st.set_page_config(
     page_title="TrialMatch AI", 
@@ -53,21 +80,95 @@ st.markdown("""
 
 @st.cache_data
 def load_app_data():
-    """Load all application data with caching."""
+    """Load patient data with caching."""
     try:
-        data_loader = DataLoader()
+        data_loader = DataLoader(DATA_DIR)
+        # Taken before reading, so it describes the files this frame was read from
+        data_version = data_loader.data_version()
         patients = data_loader.load_patients()
-        trials = data_loader.load_trials()
+        patients.attrs["data_version"] = data_version
         
         if not data_loader.validate_patient_data(patients):
             st.error("Patient data validation failed!")
-            return None, None
+            return None
         
-        return patients, trials
+        return patients
     except Exception as e:
         st.error(f"Error loading data: {e}")
         logger.error(f"Data loading error: {e}")
-        return None, None
+        return None
+
+@st.cache_data
+def get_validation_report(_patients):
+    """Value-level violations in the loaded cohort (empty when clean)."""
+    return DataLoader(DATA_DIR).validate_patient_values(_patients)
+
+@st.cache_resource
+def get_trial_reloader():
+    """Matching engine shared by all sessions, kept in sync with the trial files."""
+    loader = DataLoader(DATA_DIR, search_index=TrialSearchIndex())
+    return TrialReloader(loader, TrialMatchEngine(), min_interval=TRIAL_RELOAD_INTERVAL)
+
+@st.cache_resource
+def get_cohort_analytics(_patients):
+    """Cohort aggregates, kept up to date by trial reloads."""
+    analytics = CohortAnalytics()
+    analytics.add_patients(_patients)
+    get_trial_reloader().subscribe(analytics.apply_trial_changes)
+    return analytics
+
+@st.cache_resource
+def get_export_cache():
+    """Process-wide cache of serialized export payloads."""
+    return ExportCache()
+
+@st.cache_resource
+def get_protocol_index():
+    """Near-duplicate index of parsed protocols, shared by all sessions."""
+    from src.utils.protocol_index import ProtocolIndex
+    return ProtocolIndex(path=PROTOCOL_INDEX_PATH)
+
+@st.cache_resource
+def get_pdf_parser(api_key):
+    """PDF parser (and its pooled LLM client) shared by all sessions."""
+    # Deferred so the PDF libraries and openai only load when a PDF is analysed
+    from src.utils.pdf_parser import PDFParser
+    return PDFParser(api_key)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def extract_protocol_text(file_digest, _pdf_bytes):
+    """
+    Eligibility text of an uploaded protocol, cached per file digest.
+    
+    Reruns and tab switches reuse the result instead of parsing the PDF again.
+    """
+    # Deferred so the PDF libraries only load when a PDF is analysed
+    from src.utils.criteria_scan import scan_eligibility_sections
+    from src.utils.pdf_text import extract_text
+    
+    # Stop reading once the eligibility sections end; fall back to the full text
+    scan = scan_eligibility_sections(io.BytesIO(_pdf_bytes))
+    if scan["inclusion"] or scan["exclusion"]:
+        return dict(scan, full_text=False)
+    return dict(scan, text=extract_text(io.BytesIO(_pdf_bytes)), full_text=True)
+
+def criteria_digest(criteria):
+    """Short stable id for a criteria dict, used in export cache keys."""
+    return hashlib.sha1(json.dumps(criteria, sort_keys=True).encode()).hexdigest()[:12]
+
+def get_data_version(patients):
+    """
+    Fingerprint of the files the loaded patients came from, used to invalidate cached exports.
+    
+    Taken when load_app_data read them, not from the files now on disk, so
+    an export is never cached under a newer version than its rows.
+    """
+    return patients.attrs["data_version"]
+
+@st.cache_resource
+def get_patient_repository(_patients):
+    """Build the patient id index once per process."""
+    return PatientRepository(_patients)
 
 def main():
     """Main application function."""
@@ -77,14 +178,32 @@ def main():
     st.markdown("**Your AI-powered clinical trial matching platform for NSCLC patients**")
     
     # Load data
-    patients, trials = load_app_data()
+    patients = load_app_data()
     
-    if patients is None or trials is None:
+    if patients is None:
         st.stop()
     
-    # Initialize matching engine
-    engine = TrialMatchEngine()
-    engine.load_trials(trials)
+    violations = get_validation_report(patients)
+    if not violations.empty:
+        st.warning(f"Patient data has {int(violations['violations'].sum())} invalid values; "
+                   "affected patients may be matched incorrectly.")
+        with st.expander("Data validation details"):
+            st.dataframe(violations, hide_index=True)
+    
+    # Matching engine, with changed trial files hot-reloaded
+    reloader = get_trial_reloader()
+    try:
+        reloader.refresh()
+    except Exception as e:
+        logger.error(f"Trial reload error: {e}")
+    engine = reloader.engine
+    search_index = reloader.loader.search_index
+    trials = engine.trials
+    analytics = get_cohort_analytics(patients)
+    
+    if not trials:
+        st.error("No trial definitions found")
+        st.stop()
     
     # Sidebar stats
     with st.sidebar:
@@ -93,15 +212,15 @@ def main():
         st.metric("Active Trials", len(trials))
         
         # Mutation distribution
-        mutation_counts = patients['mutation_status'].value_counts()
         st.subheader("Mutation Distribution")
-        st.bar_chart(mutation_counts)
+        st.bar_chart(analytics.counts('mutation_status'))
     
     # Main tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "👤 Patient Matching", 
         "🧪 Trial Overview", 
         "📄 PDF Analysis", 
+        "📈 Analytics",
         "📋 Reports & Logs"
     ])
     
@@ -110,35 +229,51 @@ def main():
         st.session_state.patient_notes = {}
     
     with tab1:
-        patient_matching_tab(patients, engine)
+        patient_matching_tab(patients, engine, search_index)
     
     with tab2:
-        trial_overview_tab(patients, trials, engine)
+        trial_overview_tab(patients, trials, engine, search_index)
     
     with tab3:
         pdf_analysis_tab()
     
     with tab4:
-        reports_tab()
+        analytics_tab(analytics)
+    
+    with tab5:
+        reports_tab(patients, trials)
     
     # Footer
     st.markdown("---")
     st.markdown("**TrialMatch AI** - Powered by Advanced ML Algorithms | © 2024")
 
-def patient_matching_tab(patients, engine):
+def patient_matching_tab(patients, engine, search_index):
     """Patient-centric matching interface."""
     st.header("👤 Patient-Centric Trial Matching")
     
     col1, col2 = st.columns([1, 2])
     
+    repository = get_patient_repository(patients)
+    
     with col1:
+        search_query = st.text_input(
+            "Search Patient ID",
+            placeholder="Type the start of an ID, e.g. P10",
+            help=f"Shows up to {PATIENT_SEARCH_LIMIT} matching patients"
+        )
+        patient_ids = repository.search(search_query, limit=PATIENT_SEARCH_LIMIT)
+        
+        if not patient_ids:
+            st.info("No patients match this search.")
+            return
+        
         selected_patient_id = st.selectbox(
             "Select Patient ID", 
-            patients["patient_id"].tolist(),
+            patient_ids,
             help="Choose a patient to see matching trials"
         )
         
-        patient = patients[patients["patient_id"] == selected_patient_id].iloc[0]
+        patient = repository.get(selected_patient_id)
         
         # Patient info display
         st.subheader("Patient Information")
@@ -156,7 +291,40 @@ def patient_matching_tab(patients, engine):
     with col2:
         st.subheader("Matching Clinical Trials")
         
-        matches = engine.find_matches_for_patient(patient)
+        keywords = st.text_input(
+            "Search Trials",
+            placeholder="e.g. osimertinib, brain metastases",
+            key=f"trial_search_{selected_patient_id}",
+            help="Ranks the trials this patient is eligible for by keyword"
+        )
+        
+        if keywords:
+            hits = search_index.search_eligible(keywords, patient, engine, limit=RESULTS_PAGE_SIZE)
+            matches = [
+                {
+                    "trial_title": hit["title"],
+                    "trial_id": hit["trial_id"],
+                    "is_match": True,
+                    "reasons": hit["reasons"],
+                    "description": engine.trials[hit["trial_file"]].get("description", "")
+                }
+                for hit in hits
+            ]
+            if len(matches) == RESULTS_PAGE_SIZE:
+                st.caption(f"Top {len(matches)} eligible trials matching \"{keywords}\"; refine the search to see others")
+            else:
+                st.caption(f"{len(matches)} eligible trials matching \"{keywords}\"")
+        else:
+            page = st.number_input(
+                "Page",
+                min_value=1,
+                value=1,
+                step=1,
+                key=f"trial_page_{selected_patient_id}",
+                help=f"Matching trials are listed first, {RESULTS_PAGE_SIZE} per page"
+            )
+            matches, total_pages = engine.get_match_page(patient, page, RESULTS_PAGE_SIZE)
+            st.caption(f"Page {min(page, total_pages)} of {total_pages} ({len(engine.trials)} trials)")
         
         for match in matches:
          with st.expander(
@@ -181,11 +349,72 @@ def patient_matching_tab(patients, engine):
             )
             st.session_state.patient_notes[note_key] = notes
 
-def trial_overview_tab(patients, trials, engine):
+def render_paginated_table(df, key):
+    """Render one page of a DataFrame with page controls."""
+    total_pages = page_count(len(df), RESULTS_PAGE_SIZE)
+    page = st.number_input(
+        "Page",
+        min_value=1,
+        max_value=total_pages,
+        value=1,
+        step=1,
+        key=key
+    )
+    start = (page - 1) * RESULTS_PAGE_SIZE
+    st.dataframe(df.iloc[start:start + RESULTS_PAGE_SIZE], use_container_width=True)
+    st.caption(f"Page {page} of {total_pages} ({len(df)} patients)")
+
+def render_export_controls(build, export_key, file_stem, data_version):
+    """
+    Offer CSV/Parquet export without serializing on every rerun.
+    
+    The payload is built only after "Prepare Export" is clicked and is
+    memoized per (export_key, data_version, format) in the export cache.
+    """
+    fmt = st.radio(
+        "Export format",
+        list(EXPORT_FORMATS),
+        horizontal=True,
+        key=f"export_format_{export_key}"
+    )
+    ready_key = f"export_ready_{export_key}_{fmt}"
+    
+    if st.button("📦 Prepare Export", key=f"prepare_{export_key}_{fmt}"):
+        st.session_state[ready_key] = True
+    
+    if st.session_state.get(ready_key):
+        try:
+            payload = get_export_cache().get_or_build(export_key, data_version, fmt, build)
+        except ImportError:
+            st.warning("Parquet export requires pyarrow. Install with: pip install pyarrow")
+            return
+        
+        st.download_button(
+            label="📥 Export Eligible Patients",
+            data=payload,
+            file_name=f"{file_stem}.{EXPORT_FORMATS[fmt]['extension']}",
+            mime=EXPORT_FORMATS[fmt]['mime'],
+            key=f"download_{export_key}_{fmt}"
+        )
+
+def trial_overview_tab(patients, trials, engine, search_index):
     """Trial-centric overview interface."""
     st.header("🧪 Clinical Trial Overview")
     
-    trial_files = list(trials.keys())
+    keywords = st.text_input(
+        "Search Trials",
+        placeholder="e.g. osimertinib, brain metastases",
+        help="Searches trial titles, descriptions and raw criteria"
+    )
+    if keywords:
+        # Every hit goes into the selector, so matching trials are never cut off
+        trial_files = [hit["trial_file"] for hit in search_index.search(keywords, limit=None) if hit["trial_file"] in trials]
+        if not trial_files:
+            st.info("No trials match this search.")
+            return
+        st.caption(f"{len(trial_files)} of {len(trials)} trials match \"{keywords}\", best first")
+    else:
+        trial_files = list(trials.keys())
     selected_trial = st.selectbox("Select Clinical Trial", trial_files)
     
     trial = trials[selected_trial]
@@ -204,107 +433,28 @@ def trial_overview_tab(patients, trials, engine):
     with col2:
         st.subheader("Eligible Patients")
         
-        eligible_patients = []
-        for _, patient in patients.iterrows():
-            is_match, reasons = engine.match_patient_to_trial(patient, trial['criteria'])
-            if is_match:
-                eligible_patients.append({
-                    'patient_id': patient['patient_id'],
-                    'age': patient['age'],
-                    'stage': patient['stage'],
-                    'mutation_status': patient['mutation_status'],
-                    'performance_status': patient['performance_status']
-                })
+        eligible_mask = engine.eligible_mask(patients, trial['criteria'])
+        eligible_df = patients.loc[eligible_mask, ELIGIBLE_PATIENT_COLUMNS]
         
-        if eligible_patients:
-            eligible_df = pd.DataFrame(eligible_patients)
-            st.dataframe(eligible_df, use_container_width=True)
+        if not eligible_df.empty:
+            render_paginated_table(eligible_df, key=f"eligible_page_{selected_trial}")
             
             # Export functionality
-            csv = eligible_df.to_csv(index=False)
-            st.download_button(
-                label="📥 Export Eligible Patients",
-                data=csv,
-                file_name=f"eligible_patients_{trial['trial_id']}.csv",
-                mime="text/csv"
+            render_export_controls(
+                lambda: eligible_df,
+                export_key=f"{selected_trial}_{criteria_digest(trial['criteria'])}",
+                file_stem=f"eligible_patients_{trial['trial_id']}",
+                data_version=get_data_version(patients)
             )
             
             # PDF Report Generation
             if st.button("📄 Generate PDF Report"):
                 try:
-                    from reportlab.lib.pagesizes import letter
-                    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-                    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                    from reportlab.lib.units import inch
-                    from reportlab.lib import colors
-                    import io
-                    
-                    # Create PDF in memory
-                    buffer = io.BytesIO()
-                    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch)
-                    
-                    # Styles
-                    styles = getSampleStyleSheet()
-                    title_style = ParagraphStyle(
-                        'CustomTitle',
-                        parent=styles['Heading1'],
-                        fontSize=16,
-                        spaceAfter=30,
-                        textColor=colors.HexColor('#1f77b4')
-                    )
-                    
-                    # Content
-                    content = []
-                    
-                    # Title
-                    content.append(Paragraph(f"TrialMatch AI - Eligible Patients Report", title_style))
-                    content.append(Paragraph(f"Trial: {trial['title']}", styles['Heading2']))
-                    content.append(Paragraph(f"Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
-                    content.append(Spacer(1, 20))
-                    
-                    # Trial Info
-                    content.append(Paragraph("Trial Information:", styles['Heading3']))
-                    content.append(Paragraph(f"<b>Trial ID:</b> {trial.get('trial_id', 'N/A')}", styles['Normal']))
-                    content.append(Paragraph(f"<b>Description:</b> {trial.get('description', 'N/A')}", styles['Normal']))
-                    content.append(Spacer(1, 15))
-                    
-                    # Patient Table
-                    content.append(Paragraph(f"Eligible Patients ({len(eligible_patients)}):", styles['Heading3']))
+                    from src.utils.reports import render_trial_report
                     
-                    # Create table data
-                    table_data = [['Patient ID', 'Age', 'Stage', 'Mutation', 'Performance Status']]
-                    for patient in eligible_patients:
-                        table_data.append([
-                            patient['patient_id'],
-                            str(patient['age']),
-                            patient['stage'],
-                            patient['mutation_status'],
-                            str(patient['performance_status'])
-                        ])
-                    
-                    # Create and style table
-                    table = Table(table_data, colWidths=[1.2*inch, 0.8*inch, 0.8*inch, 1.5*inch, 1.2*inch])
-                    table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                    ]))
-                    
-                    content.append(table)
-                    
-                    # Build PDF
-                    doc.build(content)
-                    buffer.seek(0)
-                    
-                    # Download button
                     st.download_button(
                         label="📥 Download PDF Report",
-                        data=buffer.getvalue(),
+                        data=render_trial_report(trial, eligible_df),
                         file_name=f"eligible_patients_{trial['trial_id']}.pdf",
                         mime="application/pdf"
                     )
@@ -333,17 +483,44 @@ def pdf_analysis_tab():
             return
 
         with st.spinner("Analyzing PDF..."):
-            # Save uploaded file temporarily
-            temp_path = f"temp_{uploaded_file.name}"
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-
             try:
-                parser = PDFParser(st.secrets['OPENAI_API_KEY'])
-                full_text = parser.extract_text_from_pdf(temp_path)
+                parser = get_pdf_parser(st.secrets['OPENAI_API_KEY'])
 
-                # Extract criteria with AI
-                structured_criteria = parser.interpret_criteria_with_ai(full_text[:4000])  # limit for API
+                pdf_bytes = uploaded_file.getvalue()
+                file_digest = hashlib.sha256(pdf_bytes).hexdigest()
+                extraction = extract_protocol_text(file_digest, pdf_bytes)
+                protocol_text = extraction["text"]
+                if extraction["full_text"]:
+                    st.caption("No eligibility headings found; analysed the full document")
+                else:
+                    st.caption(
+                        f"Read {extraction['pages_scanned']} of {extraction['total_pages']} pages "
+                        f"to find the eligibility criteria"
+                    )
+
+                def stream_criteria():
+                    # Show each field as soon as the model has finished writing it.
+                    # An incomplete stream raises, so partial criteria are never indexed.
+                    fields = {}
+                    preview = st.empty()
+                    try:
+                        for key, value in parser.stream_criteria_with_ai(protocol_text[:4000]):  # limit for API
+                            fields[key] = value
+                            preview.json(fields)
+                    finally:
+                        preview.empty()
+                    return fields
+
+                # Extract criteria with AI, unless a protocol with the same lines was already parsed.
+                # Keyed by content, so different files uploaded under one name stay apart.
+                structured_criteria, reused = get_protocol_index().get_or_parse(
+                    file_digest,
+                    protocol_text,
+                    stream_criteria,
+                    name=uploaded_file.name
+                )
+                if reused:
+                    st.info(f"Reused criteria from protocol {reused['name']} (same eligibility text)")
 
                 if structured_criteria:
                     st.success("✅ PDF Analysis Complete!")
@@ -362,34 +539,23 @@ def pdf_analysis_tab():
                     # 🔗 NEW: Match patients against extracted criteria
                     st.subheader("👥 Eligible Patients (from uploaded PDF)")
 
-                    patients, _ = load_app_data()
+                    patients = load_app_data()
                     if patients is not None:
                         engine = TrialMatchEngine()
                         engine.load_trials({"uploaded_pdf": {"criteria": structured_criteria}})
 
-                        eligible_patients = []
-                        for _, patient in patients.iterrows():
-                            is_match, reasons = engine.match_patient_to_trial(patient, structured_criteria)
-                            if is_match:
-                                eligible_patients.append({
-                                    'patient_id': patient['patient_id'],
-                                    'age': patient['age'],
-                                    'stage': patient['stage'],
-                                    'mutation_status': patient['mutation_status'],
-                                    'performance_status': patient['performance_status']
-                                })
-
-                        if eligible_patients:
-                            eligible_df = pd.DataFrame(eligible_patients)
-                            st.dataframe(eligible_df, use_container_width=True)
-
-                            # Export CSV
-                            csv = eligible_df.to_csv(index=False)
-                            st.download_button(
-                                label="📥 Export Eligible Patients",
-                                data=csv,
-                                file_name="eligible_patients_from_pdf.csv",
-                                mime="text/csv"
+                        eligible_mask = engine.eligible_mask(patients, structured_criteria)
+                        eligible_df = patients.loc[eligible_mask, ELIGIBLE_PATIENT_COLUMNS]
+
+                        if not eligible_df.empty:
+                            render_paginated_table(eligible_df, key="eligible_page_uploaded_pdf")
+
+                            # Export
+                            render_export_controls(
+                                lambda: eligible_df,
+                                export_key=f"uploaded_pdf_{criteria_digest(structured_criteria)}",
+                                file_stem="eligible_patients_from_pdf",
+                                data_version=get_data_version(patients)
                             )
                         else:
                             st.info("No patients currently match this trial's criteria.")
@@ -399,17 +565,74 @@ def pdf_analysis_tab():
 
             except Exception as e:
                 st.error(f"Error analyzing PDF: {str(e)}")
-            finally:
-                # Clean up temp file
-                import os
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
 
 
-def reports_tab():
+def analytics_tab(analytics):
+    """Cohort analytics from precomputed aggregates."""
+    st.header("📈 Cohort Analytics")
+    
+    summary = analytics.eligibility_summary()
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Eligibility by Trial")
+        st.dataframe(summary[['trial_id', 'title', 'eligible', 'eligibility_rate']], use_container_width=True)
+    
+    with col2:
+        st.subheader("Stage × Mutation")
+        st.dataframe(analytics.stage_mutation_crosstab(), use_container_width=True)
+    
+    st.subheader("Trial Breakdown")
+    trial_file = st.selectbox("Trial", summary['trial_file'].tolist(), key="analytics_trial")
+    field = st.radio("Break down by", ['mutation_status', 'stage'], horizontal=True, key="analytics_field")
+    if trial_file:
+        st.dataframe(analytics.eligibility_by(trial_file, field), use_container_width=True)
+        
+        # What-if criteria sweep
+        st.subheader("What-if Criteria")
+        criteria = analytics.trials[trial_file]['criteria']
+        current_stages = criteria.get('stage', [])
+        add_stages = st.multiselect(
+            "Also allow stages",
+            [stage for stage in analytics.counts('stage').index if stage not in current_stages],
+            key="whatif_stages"
+        )
+        ps_values, ps_default = ps_max_choices(criteria)
+        ps_options = st.multiselect(
+            "Max performance status", ps_values,
+            default=ps_default,
+            key=f"whatif_ps_{trial_file}"
+        )
+        sweep = CriteriaSweep(analytics.cell_snapshot())
+        st.dataframe(
+            sweep.trial_variants(criteria, add_stages, sorted(ps_options) or None),
+            use_container_width=True
+        )
+
+def reports_tab(patients, trials):
     """Reports and logging interface."""
     st.header("📋 Reports & System Logs")
     
+    # Bulk PDF reports
+    st.subheader("Bulk Trial Reports")
+    output_dir = st.text_input("Output directory", value="reports")
+    if st.button("📄 Generate Reports for All Trials"):
+        try:
+            from src.utils.reports import render_all_reports
+            
+            with st.spinner(f"Rendering {len(trials)} reports..."):
+                result = render_all_reports(patients, trials, output_dir)
+            st.success(
+                f"✅ Wrote {len(result['reports'])} reports to {output_dir} "
+                f"in {result['elapsed_seconds']:.1f}s ({result['reports_per_second']:.1f} reports/s)"
+            )
+            if result['failed']:
+                st.error(f"Failed trials: {', '.join(result['failed'])}")
+        except ImportError:
+            st.warning("PDF generation requires reportlab. Install with: pip install reportlab")
+        except Exception as e:
+            st.error(f"Error generating reports: {e}")
+    
     # Patient notes summary
     if st.session_state.patient_notes:
         st.subheader("Patient Notes Summary")
@@ -0,0 +1,98 @@
+"""
+Unit tests for incremental cohort analytics.
+"""
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.matching.analytics import CohortAnalytics
+from src.matching.engine import TrialMatchEngine
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+class TestCohortAnalytics:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        loader = DataLoader(str(DATA_DIR))
+        self.patients = loader.load_patients()
+        self.trials = loader.load_trials()
+        self.engine = TrialMatchEngine()
+
+    def build(self, patients, trials):
+        analytics = CohortAnalytics()
+        analytics.add_patients(patients)
+        analytics.apply_trial_changes(trials, [])
+        return analytics
+
+    def expected_eligible(self, patients, trials):
+        return {
+            trial_file: int(self.engine.eligible_mask(patients, trial["criteria"]).sum())
+            for trial_file, trial in trials.items()
+        }
+
+    def test_counts_match_value_counts(self):
+        """Test cohort counts equal a full value_counts."""
+        analytics = self.build(self.patients, self.trials)
+
+        expected = self.patients['stage'].value_counts()
+        assert analytics.counts('stage').to_dict() == expected.to_dict()
+        assert analytics.counts('mutation_status')['EGFR+'] == (self.patients['mutation_status'] == 'EGFR+').sum()
+        assert analytics.counts('mutation_status')['None'] == self.patients['mutation_status'].isna().sum()
+        assert analytics.stage_mutation_crosstab().to_numpy().sum() == len(self.patients)
+
+    def test_eligibility_matches_engine(self):
+        """Test per-trial eligible counts equal a full re-match."""
+        analytics = self.build(self.patients, self.trials)
+        summary = analytics.eligibility_summary().set_index('trial_file')
+
+        assert summary['eligible'].to_dict() == self.expected_eligible(self.patients, self.trials)
+        egfr = analytics.eligibility_by('trials/egfr.json', 'mutation_status')
+        assert egfr['eligible'].sum() == summary.loc['trials/egfr.json', 'eligible']
+
+    def test_incremental_patients_equal_full_build(self):
+        """Test adding then removing patients keeps aggregates exact."""
+        analytics = self.build(self.patients.iloc[:120], self.trials)
+        analytics.add_patients(self.patients.iloc[120:])
+        full = self.build(self.patients, self.trials)
+
+        pd.testing.assert_frame_equal(analytics.eligibility_summary(), full.eligibility_summary())
+
+        analytics.remove_patients(self.patients.iloc[:50])
+        remaining = self.patients.iloc[50:]
+        assert analytics.total_patients == len(remaining)
+        summary = analytics.eligibility_summary().set_index('trial_file')
+        assert summary['eligible'].to_dict() == self.expected_eligible(remaining, self.trials)
+
+    def test_trial_amendment_and_removal(self):
+        """Test trial changes update only that trial's aggregates."""
+        analytics = self.build(self.patients, self.trials)
+
+        amended = dict(self.trials["trials/egfr.json"])
+        amended["criteria"] = dict(amended["criteria"], performance_status_max=4)
+        analytics.apply_trial_changes({"trials/egfr.json": amended}, ["trials/combo.json"])
+
+        summary = analytics.eligibility_summary().set_index('trial_file')
+        assert "trials/combo.json" not in summary.index
+        expected = self.expected_eligible(self.patients, {"trials/egfr.json": amended})
+        assert summary.loc['trials/egfr.json', 'eligible'] == expected["trials/egfr.json"]
+
+    def test_new_cells_after_trials_loaded(self):
+        """Test patients with unseen attribute combinations are evaluated."""
+        analytics = self.build(self.patients.iloc[:0], self.trials)
+        new_patient = pd.DataFrame([{
+            'patient_id': 'N1', 'stage': 'IV', 'mutation_status': 'EGFR+', 'performance_status': 0
+        }])
+        analytics.add_patients(new_patient)
+
+        summary = analytics.eligibility_summary().set_index('trial_file')
+        assert summary.loc['trials/egfr.json', 'eligible'] == 1
+        assert summary.loc['trials/egfr.json', 'eligibility_rate'] == 1.0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
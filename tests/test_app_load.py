@@ -0,0 +1,64 @@
+"""
+Tests for the Streamlit session load harness.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.app_load import PHASES, summarize, write_synthetic_cohort
+from src.data.loader import DataLoader
+
+REPO_ROOT = Path(__file__).parent.parent
+
+class TestAppLoad:
+
+    def test_synthetic_cohort(self, tmp_path):
+        """Test the synthetic data directory loads and validates like the real one."""
+        write_synthetic_cohort(tmp_path, patients=250, seed=3)
+        loader = DataLoader(str(tmp_path))
+        patients = loader.load_patients()
+
+        assert len(patients) == 250
+        assert patients['patient_id'].is_unique
+        assert loader.validate_patient_data(patients)
+        assert len(loader.load_trials()) == 5
+
+    def test_summarize(self):
+        """Test per-phase percentiles are reported in milliseconds."""
+        timings = [("initial_load", 1.0)] + [("select_patient", i / 1000) for i in range(1, 101)]
+        summary = summarize(timings).set_index("phase")
+
+        assert list(summary.index) == ["initial_load", "select_patient"]
+        assert summary.loc["select_patient", "reruns"] == 100
+        assert summary.loc["select_patient", "p50_ms"] == 51.0
+        assert summary.loc["select_patient", "max_ms"] == 100.0
+
+    def test_harness_end_to_end(self):
+        """Test scripted sessions run concurrently against the app without errors."""
+        result = subprocess.run(
+            [sys.executable, "-m", "src.utils.app_load", "--patients", "300", "--sessions", "2",
+             "--concurrency", "2", "--json"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+
+        report = json.loads(result.stdout)
+        phases = pd.DataFrame(report["phases"])
+        assert report["errors"] == []
+        assert set(phases["phase"]) <= set(PHASES)
+        assert {"initial_load", "select_patient", "switch_trial"} <= set(phases["phase"])
+        assert (phases["p95_ms"] >= phases["p50_ms"]).all()
+        assert report["peak_rss_mb"] > 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
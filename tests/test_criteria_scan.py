@@ -0,0 +1,87 @@
+"""
+Unit tests for the early-exit eligibility section scan.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.criteria_scan import (
+    DONE, EXCLUSION, INCLUSION, EligibilitySectionScanner, scan_eligibility_sections
+)
+from src.utils.pdf_bench import EXCLUSION_CRITERIA, INCLUSION_CRITERIA, write_synthetic_protocol
+
+def feed_all(lines):
+    scanner = EligibilitySectionScanner()
+    for line in lines:
+        scanner.feed(line)
+    return scanner
+
+class TestEligibilitySectionScanner:
+
+    def test_numbered_sections(self):
+        """Test sections end at the next heading of the same level."""
+        scanner = feed_all([
+            "Table of Contents",
+            "5.1 Inclusion Criteria ........ 23",
+            "4.2 Study Rationale",
+            "5.1 Inclusion Criteria",
+            "1. Age 18 years or older",
+            "2. ECOG performance status of 0 or 1, confirmed",
+            "within 14 days of enrolment",
+            "7. Adequate Organ Function",
+            "5.2 Exclusion Criteria:",
+            "1. Prior EGFR inhibitor",
+            "Page 24 of 210",
+            "5.3 Lifestyle Considerations",
+            "1. Not collected",
+        ])
+
+        assert scanner.state == DONE
+        assert scanner.sections[INCLUSION] == [
+            "1. Age 18 years or older",
+            "2. ECOG performance status of 0 or 1, confirmed within 14 days of enrolment",
+            "7. Adequate Organ Function",
+        ]
+        assert scanner.sections[EXCLUSION] == ["1. Prior EGFR inhibitor"]
+
+    def test_unnumbered_sections(self):
+        """Test unnumbered protocols end at a known following section or caps heading."""
+        scanner = feed_all(["Inclusion Criteria", "- Stage IV NSCLC", "Exclusion Criteria",
+                            "- Brain metastases", "STUDY TREATMENT", "- ignored"])
+        assert scanner.state == DONE
+        assert scanner.sections[EXCLUSION] == ["- Brain metastases"]
+
+    def test_keeps_looking_for_missing_section(self):
+        """Test the scan continues when only inclusion criteria have been seen."""
+        scanner = feed_all(["Inclusion Criteria", "- Stage IV", "Study Design", "Exclusion Criteria",
+                            "- Prior chemotherapy"])
+        assert scanner.state == EXCLUSION
+        assert scanner.sections[INCLUSION] == ["- Stage IV"]
+
+class TestScanEligibilitySections:
+
+    def test_stops_after_eligibility(self, tmp_path):
+        """Test only the pages up to the end of the criteria are read."""
+        path = write_synthetic_protocol(tmp_path / "protocol.pdf", pages=30, eligibility_page=8)
+        scan = scan_eligibility_sections(path)
+
+        assert scan["complete"]
+        assert (scan["pages_scanned"], scan["total_pages"]) == (10, 30)
+        assert [item.split(". ", 1)[1] for item in scan["inclusion"]] == INCLUSION_CRITERIA
+        assert [item.split(". ", 1)[1] for item in scan["exclusion"]] == EXCLUSION_CRITERIA
+        assert scan["text"].startswith("Inclusion Criteria:\n1. Histologically")
+
+    def test_page_cap(self, tmp_path):
+        """Test the scan gives up at max_pages when the criteria come later."""
+        path = write_synthetic_protocol(tmp_path / "protocol.pdf", pages=12, eligibility_page=9)
+        scan = scan_eligibility_sections(path, max_pages=5)
+
+        assert not scan["complete"]
+        assert scan["pages_scanned"] == 5
+        assert scan["inclusion"] == [] and scan["text"] == ""
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
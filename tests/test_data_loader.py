@@ -0,0 +1,55 @@
+"""
+Unit tests for the data loader.
+"""
+import pytest
+import shutil
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+class TestDataLoaderFiles:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.loader = DataLoader(str(DATA_DIR))
+
+    def test_load_sample_data(self):
+        """Test the bundled sample data loads."""
+        assert len(self.loader.load_patients()) == 200
+        assert len(self.loader.load_trials()) == 5
+
+    def test_data_version_changes_with_files(self, tmp_path):
+        """Test the data version tracks file rewrites."""
+        shutil.copytree(DATA_DIR, tmp_path / "data")
+        loader = DataLoader(str(tmp_path / "data"))
+
+        before = loader.data_version()
+        assert loader.data_version() == before
+
+        with open(tmp_path / "data" / "sample_patients.csv", "a") as f:
+            f.write("P9999,50,Male,IV,EGFR+,False,1\n")
+
+        assert loader.data_version() != before
+
+    def test_data_version_tracks_discovered_trials(self, tmp_path):
+        """Test added or edited trial files outside the defaults change the version."""
+        shutil.copytree(DATA_DIR, tmp_path / "data")
+        loader = DataLoader(str(tmp_path / "data"))
+        before = loader.data_version()
+
+        extra = tmp_path / "data" / "trials" / "met_exon14.json"
+        extra.write_text('{"trial_id": "T9001", "criteria": {"stage": ["IV"]}}')
+        added = loader.data_version()
+        assert added != before
+
+        extra.write_text('{"trial_id": "T9001", "criteria": {"stage": ["IIIB", "IV"]}}')
+        assert loader.data_version() != added
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
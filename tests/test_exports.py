@@ -0,0 +1,71 @@
+"""
+Unit tests for eligible-patient exports.
+"""
+import io
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.exports import ExportCache, build_export, iter_csv_chunks, write_export
+
+class TestExports:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.df = pd.DataFrame({
+            'patient_id': [f"P{i}" for i in range(7)],
+            'stage': ['IV'] * 7,
+            'performance_status': list(range(7))
+        })
+
+    def test_csv_chunks_match_full_export(self):
+        """Test chunked CSV output equals a single to_csv call."""
+        chunks = list(iter_csv_chunks(self.df, chunk_rows=3))
+        assert len(chunks) == 3
+        assert b"".join(chunks).decode() == self.df.to_csv(index=False)
+
+    def test_empty_csv_has_header(self):
+        """Test exporting no rows still yields the header."""
+        assert build_export(self.df.iloc[:0], "CSV").decode().strip() == "patient_id,stage,performance_status"
+
+    def test_parquet_round_trip(self):
+        """Test Parquet payloads read back to the same frame."""
+        pytest.importorskip("pyarrow")
+        payload = build_export(self.df, "Parquet")
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(payload)), self.df)
+
+    def test_write_export(self, tmp_path):
+        """Test streaming an export to disk."""
+        path = write_export(self.df, tmp_path / "out.csv")
+        assert pd.read_csv(path)['performance_status'].tolist() == list(range(7))
+
+    def test_cache_builds_once_per_version(self):
+        """Test payloads are memoized per (key, data version, format)."""
+        cache = ExportCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return self.df
+
+        first = cache.get_or_build("trial", "v1", "CSV", build)
+        second = cache.get_or_build("trial", "v1", "CSV", build)
+        cache.get_or_build("trial", "v2", "CSV", build)
+
+        assert first is second
+        assert len(calls) == 2
+        assert cache.hits == 1
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the cache stays bounded."""
+        cache = ExportCache(max_entries=2)
+        for key in ["a", "b", "c"]:
+            cache.get_or_build(key, "v1", "CSV", lambda: self.df)
+        assert len(cache) == 2
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
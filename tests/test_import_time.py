@@ -0,0 +1,72 @@
+"""
+Cold-start import budget tests.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+its cumulative import time is compared against a budget. Budgets can be
+overridden with the TRIALMATCH_ENGINE_IMPORT_BUDGET_MS and
+TRIALMATCH_APP_IMPORT_BUDGET_MS environment variables on slow machines.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Optional dependencies that must only load when their feature is used
+HEAVY_MODULES = ["pdfplumber", "openai", "reportlab", "plotly", "matplotlib"]
+
+
+def measure_import(module: str):
+    """Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of (cumulative import time in ms, set of loaded module names)
+    """
+    code = (
+        f"import sys, {module}\n"
+        "print('\\n'.join(sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative_us = int(fields[1])
+
+    assert cumulative_us is not None, f"No importtime entry for {module}"
+    return cumulative_us / 1000, set(result.stdout.split())
+
+
+def budget_ms(env_var: str, default: int) -> float:
+    return float(os.environ.get(env_var, default))
+
+
+class TestImportTime:
+
+    def test_engine_import_budget(self):
+        """Test the matching engine imports quickly and without extras."""
+        elapsed_ms, loaded = measure_import("src.matching.engine")
+
+        assert elapsed_ms < budget_ms("TRIALMATCH_ENGINE_IMPORT_BUDGET_MS", 1500)
+        assert not loaded.intersection(HEAVY_MODULES)
+
+    def test_app_shell_import_budget(self):
+        """Test the Streamlit app shell defers PDF, AI and report dependencies."""
+        pytest.importorskip("streamlit")
+        elapsed_ms, loaded = measure_import("streamlit_app")
+
+        assert elapsed_ms < budget_ms("TRIALMATCH_APP_IMPORT_BUDGET_MS", 4000)
+        # plotly is pulled in by streamlit itself, so it is not checked here
+        assert not loaded.intersection(["pdfplumber", "openai", "reportlab", "matplotlib"])
@@ -0,0 +1,177 @@
+"""
+Unit tests for append-only incremental matching.
+"""
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.follow import CSVFollower
+from src.matching.engine import TrialMatchEngine
+from src.matching.incremental import IncrementalMatcher
+
+HEADER = "patient_id,age,gender,stage,mutation_status,smoker,performance_status\n"
+
+class TestIncrementalMatching:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = TrialMatchEngine()
+        self.engine.load_trials({
+            "test_egfr.json": {
+                "trial_id": "TEST001",
+                "title": "Test EGFR Trial",
+                "criteria": {"mutation_required": "EGFR+", "stage": ["IV"], "performance_status_max": 1}
+            }
+        })
+
+    def append(self, path, text):
+        with open(path, "a") as f:
+            f.write(text)
+
+    def read_output(self, path):
+        return [json.loads(line) for line in open(path)]
+
+    def test_only_new_rows_are_matched(self, tmp_path):
+        """Test each poll processes just the appended rows."""
+        registry = tmp_path / "registry.csv"
+        output = tmp_path / "matches.jsonl"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\n")
+
+        matcher = IncrementalMatcher(self.engine, CSVFollower(registry), output)
+        assert matcher.process_new() == 1
+        assert matcher.process_new() == 0
+
+        self.append(registry, "P2,50,Male,II,EGFR+,False,0\nP3,70,Male,IV,EGFR+,False,0\n")
+        assert matcher.process_new() == 2
+
+        records = self.read_output(output)
+        assert [r["patient_id"] for r in records] == ["P1", "P2", "P3"]
+        assert [r["matched_trials"] for r in records] == [["TEST001"], [], ["TEST001"]]
+
+    def test_partial_line_waits_for_newline(self, tmp_path):
+        """Test a row still being written is not consumed."""
+        registry = tmp_path / "registry.csv"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\nP2,50,Ma")
+
+        follower = CSVFollower(registry)
+        assert follower.read_new_rows()["patient_id"].tolist() == ["P1"]
+        follower.commit()
+
+        self.append(registry, "le,II,None,False,0\n")
+        rows = follower.read_new_rows()
+        follower.commit()
+        assert rows["patient_id"].tolist() == ["P2"]
+        assert rows["gender"].tolist() == ["Male"]
+        assert follower.rows == 2
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        """Test a restarted follower continues from the saved offset."""
+        registry = tmp_path / "registry.csv"
+        state = tmp_path / "state.json"
+        output = tmp_path / "matches.jsonl"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\n")
+
+        IncrementalMatcher(self.engine, CSVFollower(registry, state), output).process_new()
+        self.append(registry, "P2,50,Male,IV,EGFR+,False,0\n")
+
+        resumed = CSVFollower(registry, state)
+        assert resumed.rows == 1
+        assert IncrementalMatcher(self.engine, resumed, output).process_new() == 1
+        assert [r["patient_id"] for r in self.read_output(output)] == ["P1", "P2"]
+
+    def test_truncated_file_restarts(self, tmp_path):
+        """Test a rewritten, shorter registry is read from the top."""
+        registry = tmp_path / "registry.csv"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\nP2,50,Male,IV,EGFR+,False,0\n")
+
+        follower = CSVFollower(registry)
+        follower.read_new_rows()
+        follower.commit()
+
+        registry.write_text(HEADER + "P9,40,Male,I,None,False,0\n")
+        assert follower.read_new_rows()["patient_id"].tolist() == ["P9"]
+
+    def test_rewritten_or_rotated_file_restarts(self, tmp_path):
+        """Test a file rewritten in place, or replaced, is read from the top even if it grew."""
+        registry = tmp_path / "registry.csv"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\n")
+        follower = CSVFollower(registry)
+        follower.read_new_rows()
+        follower.commit()
+
+        registry.write_text(HEADER + "P8,40,Male,I,None,False,0\nP9,41,Male,I,None,False,0\n")
+        assert follower.read_new_rows()["patient_id"].tolist() == ["P8", "P9"]
+        follower.commit()
+
+        rotated = tmp_path / "rotated.csv"
+        rotated.write_text(HEADER + "Q1,40,Male,I,None,False,0\nQ2,41,Male,I,None,False,0\nQ3,42,Male,I,None,False,0\n")
+        rotated.replace(registry)
+        assert follower.read_new_rows()["patient_id"].tolist() == ["Q1", "Q2", "Q3"]
+
+    def test_quoted_header_and_bounded_reads(self, tmp_path):
+        """Test quoted header commas parse and large appends arrive in bounded chunks."""
+        registry = tmp_path / "registry.csv"
+        registry.write_text('patient_id,"notes, free text",stage\n' + "".join(
+            f'P{i},"seen, ok",IV\n' for i in range(100)
+        ))
+
+        follower = CSVFollower(registry, max_bytes=256)
+        chunks = []
+        while True:
+            rows = follower.read_new_rows()
+            if rows.empty:
+                break
+            follower.commit()
+            chunks.append(rows)
+
+        assert len(chunks) > 1
+        assert list(chunks[0].columns) == ["patient_id", "notes, free text", "stage"]
+        assert [pid for chunk in chunks for pid in chunk["patient_id"]] == [f"P{i}" for i in range(100)]
+        assert follower.rows == 100
+
+    def test_byte_order_mark_header(self, tmp_path):
+        """Test a UTF-8 byte order mark does not end up in the first column name."""
+        registry = tmp_path / "registry.csv"
+        registry.write_bytes(b"\xef\xbb\xbf" + (HEADER + "P1,60,Female,IV,EGFR+,True,1\n").encode())
+        output = tmp_path / "matches.jsonl"
+
+        matcher = IncrementalMatcher(self.engine, CSVFollower(registry), output)
+        assert matcher.process_new() == 1
+        assert matcher.follower.header[0] == "patient_id"
+        assert self.read_output(output)[0]["matched_trials"] == ["TEST001"]
+
+    def test_chunk_dtypes_are_stable(self, tmp_path):
+        """Test blank cells in one chunk do not change column dtypes between chunks."""
+        registry = tmp_path / "registry.csv"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\n")
+        follower = CSVFollower(registry)
+        first = follower.read_new_rows()
+        follower.commit()
+
+        self.append(registry, "P2,50,Male,IV,EGFR+,,\n")
+        second = follower.read_new_rows()
+
+        assert first.dtypes.to_dict() == second.dtypes.to_dict()
+        assert first["performance_status"].tolist() == [1]
+        assert second["smoker"].isna().all() and second["performance_status"].isna().all()
+
+    def test_failed_write_keeps_offset(self, tmp_path):
+        """Test rows are read again when writing their results fails."""
+        registry = tmp_path / "registry.csv"
+        registry.write_text(HEADER + "P1,60,Female,IV,EGFR+,True,1\n")
+        matcher = IncrementalMatcher(self.engine, CSVFollower(registry), tmp_path / "missing" / "matches.jsonl")
+
+        with pytest.raises(FileNotFoundError):
+            matcher.process_new()
+        assert matcher.follower.offset == 0
+
+        matcher.output_path = tmp_path / "matches.jsonl"
+        assert matcher.process_new() == 1
+        assert [r["patient_id"] for r in self.read_output(matcher.output_path)] == ["P1"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
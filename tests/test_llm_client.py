@@ -0,0 +1,179 @@
+"""
+Unit tests for the pooled LLM client and streamed JSON parsing.
+
+The OpenAI SDK is pointed at a local stub server that serves chat
+completions, optionally as server-sent events with a delay per chunk.
+"""
+import json
+import threading
+import time
+import pytest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.llm_client import (
+    IncrementalJSONParser, close_clients, get_openai_client, stream_json_fields
+)
+from src.utils.pdf_parser import PDFParser
+
+CRITERIA = {
+    "stage": ["IIIB", "IV"],
+    "mutation_required": ["EGFR+"],
+    "performance_status_max": 1,
+    "raw_inclusion": ["Stage IIIB/IV NSCLC, \"confirmed\" {histology}", "ECOG 0-1"],
+    "raw_exclusion": ["Prior EGFR TKI"],
+}
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.connections.add(self.client_address)
+        time.sleep(self.server.delay)
+
+        if not body.get("stream"):
+            payload = json.dumps({
+                "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": self.server.content}}]
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        content = self.server.content
+        for start in range(0, len(content), self.server.chunk_size):
+            self._write_event({
+                "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": None,
+                             "delta": {"content": content[start:start + self.server.chunk_size]}}]
+            })
+            time.sleep(self.server.chunk_delay)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_event(self, event):
+        self._write_chunk(f"data: {json.dumps(event)}\n\n".encode())
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub(content, delay=0.0, chunk_size=12, chunk_delay=0.02):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    server.connections = set()
+    server.content = content
+    server.delay = delay
+    server.chunk_size = chunk_size
+    server.chunk_delay = chunk_delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+class TestIncrementalJSONParser:
+
+    def test_fields_complete_in_order(self):
+        """Test each field is emitted once its value is complete, even fed per character."""
+        text = "```json\n" + json.dumps(CRITERIA, indent=2) + "\n```"
+        parser = IncrementalJSONParser()
+        emitted = []
+        for position, char in enumerate(text):
+            for key, value in parser.feed(char):
+                emitted.append((key, position))
+
+        assert [key for key, _ in emitted] == list(CRITERIA)
+        assert parser.fields == CRITERIA
+        assert parser.complete
+        # stage is available long before the object closes
+        assert emitted[0][1] < len(text) // 3
+
+    def test_incomplete_stream_raises(self):
+        """Test a truncated object is reported after the fields that did arrive."""
+        fields = []
+        with pytest.raises(json.JSONDecodeError):
+            for field in stream_json_fields(['{"stage": ["IV"], "raw_inclusion": ["Age']):
+                fields.append(field)
+        assert fields == [("stage", ["IV"])]
+
+class TestPooledClient:
+
+    def teardown_method(self):
+        close_clients()
+
+    def test_client_shared_per_key_and_url(self):
+        """Test one client instance is reused per API key and base URL."""
+        client = get_openai_client("key-a", "http://127.0.0.1:9/v1")
+        assert get_openai_client("key-a", "http://127.0.0.1:9/v1") is client
+        assert get_openai_client("key-a", "http://127.0.0.1:10/v1") is not client
+        assert PDFParser("key-a", base_url="http://127.0.0.1:9/v1").client is client
+
+    def test_requests_reuse_connection(self):
+        """Test consecutive calls go over one kept-alive connection."""
+        server, base_url = start_stub(json.dumps(CRITERIA))
+        try:
+            parser = PDFParser("test-key", base_url=base_url)
+            for _ in range(3):
+                assert parser.interpret_criteria_with_ai("protocol text") == CRITERIA
+            assert len(server.connections) == 1
+        finally:
+            server.shutdown()
+
+    def test_streaming_yields_fields_early(self):
+        """Test streamed fields arrive before the completion has finished."""
+        content = json.dumps(CRITERIA)
+        server, base_url = start_stub(content, chunk_size=8, chunk_delay=0.02)
+        try:
+            parser = PDFParser("test-key", base_url=base_url)
+            start = time.perf_counter()
+            arrivals = {}
+            for key, value in parser.stream_criteria_with_ai("protocol text"):
+                arrivals[key] = (time.perf_counter() - start, value)
+            total = time.perf_counter() - start
+
+            assert {key: value for key, (_, value) in arrivals.items()} == CRITERIA
+            assert arrivals["stage"][0] < total / 2
+        finally:
+            server.shutdown()
+
+    def test_truncated_stream_raises(self):
+        """Test a stream that ends mid-object raises after the fields that arrived."""
+        content = json.dumps(CRITERIA)
+        server, base_url = start_stub(content[:len(content) // 2], chunk_delay=0)
+        try:
+            parser = PDFParser("test-key", base_url=base_url)
+            fields = {}
+            with pytest.raises(json.JSONDecodeError):
+                for key, value in parser.stream_criteria_with_ai("protocol text"):
+                    fields[key] = value
+            assert fields and set(fields) < set(CRITERIA)
+        finally:
+            server.shutdown()
+
+    def test_read_timeout(self):
+        """Test a slow endpoint fails fast with the configured read timeout."""
+        server, base_url = start_stub(json.dumps(CRITERIA), delay=2.0)
+        try:
+            get_openai_client("test-key", base_url, read_timeout=0.2, max_retries=0)
+            parser = PDFParser("test-key", base_url=base_url)
+            start = time.perf_counter()
+            assert parser.interpret_criteria_with_ai("protocol text") == {}
+            assert time.perf_counter() - start < 1.5
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""
+Unit tests for trial change detection and hot reload.
+"""
+import json
+import os
+import pytest
+import shutil
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.data.manifest import TrialManifest, TrialReloader
+from src.data.storage import SQLiteBackend
+from src.matching.engine import TrialMatchEngine
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+class TestTrialReload:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = TrialMatchEngine()
+
+    def make_reloader(self, tmp_path):
+        shutil.copytree(DATA_DIR / "trials", tmp_path / "trials")
+        self.trials_dir = tmp_path / "trials"
+        return TrialReloader(DataLoader(str(tmp_path)), self.engine, min_interval=0)
+
+    def write_trial(self, name, trial):
+        path = self.trials_dir / name
+        path.write_text(json.dumps(trial))
+        return path
+
+    def test_initial_refresh_loads_everything(self, tmp_path):
+        """Test the first refresh adds every trial file."""
+        reloader = self.make_reloader(tmp_path)
+        changes = reloader.refresh()
+
+        assert len(changes["updated"]) == 5
+        assert self.engine.trials == DataLoader(str(DATA_DIR)).load_trials()
+
+    def test_only_changed_files_are_reparsed(self, tmp_path):
+        """Test add, change and remove are applied incrementally."""
+        reloader = self.make_reloader(tmp_path)
+        reloader.refresh()
+        assert reloader.refresh() == {"updated": {}, "removed": []}
+
+        egfr = json.loads((self.trials_dir / "egfr.json").read_text())
+        egfr["criteria"]["performance_status_max"] = 2
+        self.write_trial("egfr.json", egfr)
+        self.write_trial("new.json", {"trial_id": "NEW1", "title": "New", "criteria": {}})
+        (self.trials_dir / "combo.json").unlink()
+
+        changes = reloader.refresh()
+
+        assert sorted(changes["updated"]) == ["trials/egfr.json", "trials/new.json"]
+        assert changes["removed"] == ["trials/combo.json"]
+        assert self.engine.trials["trials/egfr.json"]["criteria"]["performance_status_max"] == 2
+        assert "trials/combo.json" not in self.engine.trials
+        assert len(self.engine.trials) == 5
+
+    def test_backend_trials_are_reloaded(self):
+        """Test hot reload reads changes from a storage backend instead of the files."""
+        backend = SQLiteBackend(":memory:")
+        trials = DataLoader(str(DATA_DIR)).load_trials()
+        backend.save_trials(trials)
+        reloader = TrialReloader(DataLoader(str(DATA_DIR), backend=backend), self.engine, min_interval=0)
+
+        assert reloader.refresh()["updated"] == trials
+        assert reloader.refresh() == {"updated": {}, "removed": []}
+
+        egfr = dict(trials["trials/egfr.json"], title="EGFR (amended)")
+        backend.save_trials({"trials/egfr.json": egfr})
+        backend.delete_trials(["trials/combo.json"])
+        changes = reloader.refresh()
+
+        assert changes == {"updated": {"trials/egfr.json": egfr}, "removed": ["trials/combo.json"]}
+        assert self.engine.trials["trials/egfr.json"]["title"] == "EGFR (amended)"
+        assert len(self.engine.trials) == 4
+        backend.close()
+
+    def test_touch_without_content_change(self, tmp_path):
+        """Test an mtime-only change is not treated as an amendment."""
+        reloader = self.make_reloader(tmp_path)
+        reloader.refresh()
+
+        path = self.trials_dir / "egfr.json"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert reloader.refresh()["updated"] == {}
+
+    def test_invalid_json_keeps_previous_version(self, tmp_path):
+        """Test a broken amendment does not drop the running trial."""
+        reloader = self.make_reloader(tmp_path)
+        reloader.refresh()
+        before = self.engine.trials["trials/egfr.json"]
+
+        (self.trials_dir / "egfr.json").write_text("{ not json")
+        reloader.refresh()
+
+        assert self.engine.trials["trials/egfr.json"] == before
+
+    def test_refresh_is_throttled(self, tmp_path):
+        """Test scans closer than min_interval are skipped."""
+        reloader = self.make_reloader(tmp_path)
+        reloader.min_interval = 60
+        assert reloader.refresh() is not None
+        assert reloader.refresh() is None
+        assert reloader.refresh(force=True) is not None
+
+    def test_manifest_records_fingerprints(self, tmp_path):
+        """Test manifest entries hold mtime, size and content hash."""
+        manifest = TrialManifest()
+        changes = manifest.diff(DATA_DIR, ["trials/egfr.json", "trials/missing.json"])
+
+        assert changes["added"] == ["trials/egfr.json"]
+        assert set(manifest.entries["trials/egfr.json"]) == {"mtime_ns", "size", "sha256"}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
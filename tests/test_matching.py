@@ -12,6 +12,17 @@ sys.path.append(str(Path(__file__).parent.parent))
 from src.matching.engine import TrialMatchEngine
 from src.data.loader import DataLoader
 
+# Criteria shapes the row-wise matcher handles in its own way, e.g. from LLM-extracted protocols
+IRREGULAR_CRITERIA = [
+    {"performance_status_max": None},
+    {"performance_status_max": "ECOG 0-1"},
+    {"performance_status_max": 1.5},
+    {"stage": "IIIB/IV"},
+    {"stage": "IV", "mutation_required": ["EGFR+", "ALK+"]},
+    {"stage": None},
+    {"mutation_required": ("EGFR+",)},
+]
+
 class TestTrialMatchEngine:
     
     def setup_method(self):
@@ -137,6 +148,65 @@ class TestTrialMatchEngine:
         # Should not match KRAS trial (wrong mutation)
         kras_match = next(m for m in matches if "KRAS" in m["trial_title"])
         assert kras_match["is_match"] == False
+        
+    def test_eligible_mask_agrees_with_row_matching(self):
+        """Test vectorized eligibility matches the row-wise engine."""
+        loader = DataLoader()
+        patients = loader.load_patients()
+        trials = loader.load_trials()
+        
+        criteria_list = [trial["criteria"] for trial in trials.values()] + IRREGULAR_CRITERIA
+        
+        for criteria in criteria_list:
+            mask = self.engine.eligible_mask(patients, criteria)
+            expected = [
+                self.engine.match_patient_to_trial(patient, criteria)[0]
+                for _, patient in patients.iterrows()
+            ]
+            assert mask.tolist() == expected, criteria
+            
+    def test_trial_mask_agrees_with_row_matching(self):
+        """Test vectorized trial ranking matches the row-wise engine."""
+        loader = DataLoader()
+        patients = loader.load_patients()
+        trials = loader.load_trials()
+        for position, criteria in enumerate(IRREGULAR_CRITERIA):
+            trials[f"trials/irregular_{position}.json"] = {"title": f"Irregular {position}", "criteria": criteria}
+        self.engine.load_trials(trials)
+
+        for _, patient in patients.iterrows():
+            expected = [
+                self.engine.match_patient_to_trial(patient, trial["criteria"])[0]
+                for trial in self.engine.trials.values()
+            ]
+            assert self.engine.trial_mask(patient).tolist() == expected
+
+        self.engine.apply_trial_changes({}, ["trials/egfr.json"])
+        assert "trials/egfr.json" not in self.engine.trial_mask(patients.iloc[0]).index
+
+    def test_get_match_page_lists_matches_first(self):
+        """Test paginated matches are ranked with eligible trials first."""
+        matches, total_pages = self.engine.get_match_page(self.test_patient_match, page=1, page_size=1)
+        
+        assert total_pages == 2
+        assert len(matches) == 1
+        assert matches[0]["trial_id"] == "TEST001"
+        assert matches[0]["is_match"] == True
+        
+        matches, _ = self.engine.get_match_page(self.test_patient_match, page=5, page_size=1)
+        assert matches[0]["trial_id"] == "TEST002"
+
+    def test_get_match_page_isolates_malformed_trials(self):
+        """Test a trial with an unusable performance status limit fails on its own."""
+        self.engine.apply_trial_changes({
+            "bad.json": {"title": "Bad PS", "criteria": {"performance_status_max": "ECOG 0-1"}}
+        }, [])
+        matches, _ = self.engine.get_match_page(self.test_patient_match, page=1, page_size=10)
+        
+        bad = next(m for m in matches if m["trial_file"] == "bad.json")
+        assert bad["is_match"] == False
+        assert bad["reasons"][0].startswith("Error during matching")
+        assert [m["trial_id"] for m in matches if m["is_match"]] == ["TEST001"]
 
 class TestDataLoader:
     
@@ -0,0 +1,92 @@
+"""
+Unit tests for PDF text extraction backends.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.pdf_bench import benchmark_backends, build_corpus, write_synthetic_protocol
+from src.utils.pdf_parser import PDFParser
+from src.utils.pdf_text import (
+    BACKENDS, PDFTextDocument, PyPDFBackend, available_backends, extract_text,
+    get_backend, is_garbled, iter_pages
+)
+
+class GarbledPyPDFBackend(PyPDFBackend):
+    """pypdf backend that fails on one page, as happens with broken font maps."""
+    name = "garbled-pypdf"
+
+    def page_text(self, handle, index):
+        return "(cid:3)(cid:17)(cid:42) 0 1 2" if index == 1 else super().page_text(handle, index)
+
+class TestPDFText:
+
+    @pytest.fixture
+    def protocol(self, tmp_path):
+        return write_synthetic_protocol(tmp_path / "protocol.pdf", pages=5, eligibility_page=2)
+
+    def test_fastest_backend_selected(self):
+        """Test auto selection prefers pypdf and fallback is layout-aware."""
+        assert available_backends() == ["pypdf", "pdfplumber"]
+        assert get_backend("auto").name == "pypdf"
+        assert BACKENDS["pdfplumber"].layout_aware
+        with pytest.raises(ValueError):
+            get_backend("PyPDF2")
+
+    @pytest.mark.parametrize("backend", ["pypdf", "pdfplumber"])
+    def test_backends_extract_same_content(self, protocol, backend):
+        """Test each backend streams every page with the eligibility text."""
+        pages = list(iter_pages(protocol, backend=backend, fallback=False))
+
+        assert [page.number for page in pages] == [1, 2, 3, 4, 5]
+        assert {page.backend for page in pages} == {backend}
+        assert "Inclusion Criteria" in pages[1].text
+        assert "Exclusion Criteria" in pages[2].text
+
+    def test_file_object_source(self, protocol):
+        """Test uploads can be read from a binary file object."""
+        with open(protocol, "rb") as f:
+            assert "Study Treatment" in extract_text(f)
+
+    def test_garbled_page_falls_back(self, protocol):
+        """Test only the bad page is re-extracted with the layout-aware backend."""
+        with PDFTextDocument(protocol, backend=GarbledPyPDFBackend()) as document:
+            pages = list(document.pages())
+
+        assert [page.backend for page in pages] == ["garbled-pypdf", "pdfplumber", "garbled-pypdf",
+                                                     "garbled-pypdf", "garbled-pypdf"]
+        assert "Inclusion Criteria" in pages[1].text
+        assert document.fallback_pages == 1
+
+    def test_is_garbled(self):
+        """Test the garbled-page heuristic."""
+        assert is_garbled("")
+        assert is_garbled("   \n ")
+        assert is_garbled("(cid:3)(cid:4)(cid:5) text")
+        assert is_garbled("12 34 %% 56 ## 78")
+        assert not is_garbled("Inclusion Criteria\n1. ECOG performance status of 0 or 1")
+
+    def test_parser_uses_shared_extraction(self, protocol):
+        """Test PDFParser text extraction goes through the backends."""
+        parser = PDFParser("test-key", pdf_backend="pypdf")
+        text = parser.extract_text_from_pdf(str(protocol))
+        inclusion, exclusion = parser.extract_criteria_sections(str(protocol))
+
+        assert text == extract_text(protocol, backend="pypdf")
+        assert len(inclusion) == 5 and inclusion[0].startswith("1. Histologically")
+        assert len(exclusion) == 4
+
+    def test_benchmark_reports_every_backend(self, tmp_path):
+        """Test the benchmark covers all installed backends on the same corpus."""
+        paths = build_corpus(tmp_path, documents=2, pages=3)
+        results = benchmark_backends(paths)
+
+        assert list(results["backend"]) == available_backends()
+        assert (results["pages"] == 6).all()
+        assert (results["pages_per_second"] > 0).all()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+"""
+Unit tests for reusing parsed protocol criteria.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.utils.protocol_index import ProtocolIndex
+
+BACKGROUND = "\n".join(
+    f"Section {i}: the study drug is administered on day {i} of each cycle and "
+    f"pharmacokinetic samples are collected at visit {i} by the site coordinator."
+    for i in range(1, 40)
+)
+
+PROTOCOL = BACKGROUND + """
+Inclusion Criteria:
+Stage IIIB or IV non-small cell lung cancer
+EGFR mutation confirmed by local testing
+ECOG performance status 0-1
+Exclusion Criteria:
+Prior treatment with an EGFR inhibitor
+"""
+
+CRITERIA = {"stage": ["IIIB", "IV"], "mutation_required": "EGFR+", "performance_status_max": 1}
+
+class TestProtocolIndex:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.index = ProtocolIndex()
+        self.parse_calls = 0
+
+    def parse(self, criteria=CRITERIA):
+        def _parse():
+            self.parse_calls += 1
+            return criteria
+        return _parse
+
+    def test_identical_protocol_skips_parse(self):
+        """Test an identical upload reuses stored criteria."""
+        self.index.get_or_parse("digest-1", PROTOCOL, self.parse(), name="v1.pdf")
+        criteria, match = self.index.get_or_parse("digest-2", PROTOCOL, self.parse(), name="copy.pdf")
+
+        assert self.parse_calls == 1
+        assert criteria == CRITERIA
+        assert match["doc_id"] == "digest-1"
+        assert match["name"] == "v1.pdf"
+        assert self.index.llm_calls_saved == 1
+
+    def test_formatting_only_difference_reuses_criteria(self):
+        """Test a copy differing only in case, whitespace and line order reuses criteria."""
+        self.index.get_or_parse("v1", PROTOCOL, self.parse())
+        reformatted = PROTOCOL.replace("ECOG performance status 0-1", "ECOG  Performance Status 0-1  ")
+        reformatted = "\n\n".join(reversed(reformatted.splitlines()))
+
+        criteria, match = self.index.get_or_parse("v2", reformatted, self.parse())
+
+        assert self.parse_calls == 1
+        assert match["doc_id"] == "v1"
+
+    def test_any_line_edit_reparses(self):
+        """Test an edit without eligibility keywords still triggers a new parse."""
+        protocol = PROTOCOL + "Active infection requiring systemic therapy\n"
+        self.index.get_or_parse("v1", protocol, self.parse())
+        edited = protocol.replace("systemic therapy", "hospitalisation")
+
+        assert self.index.query(edited) is None
+        criteria, match = self.index.get_or_parse("v2", edited, self.parse())
+        assert self.parse_calls == 2
+        assert match is None
+
+    def test_eligibility_amendment_reparses(self):
+        """Test edited or removed eligibility lines trigger a new parse."""
+        self.index.get_or_parse("v1", PROTOCOL, self.parse())
+        edited = PROTOCOL.replace("ECOG performance status 0-1", "ECOG performance status 0-2")
+        loosened = dict(CRITERIA, performance_status_max=2)
+
+        criteria, match = self.index.get_or_parse("v2", edited, self.parse(loosened))
+        assert self.parse_calls == 2
+        assert match is None
+        assert criteria == loosened
+        assert self.index.query(edited)["doc_id"] == "v2"
+
+        removed = PROTOCOL.replace("Prior treatment with an EGFR inhibitor\n", "")
+        assert self.index.query(removed) is None
+
+    def test_same_name_different_content_kept_apart(self):
+        """Test protocols are keyed by content, not by upload name."""
+        edited = PROTOCOL.replace("0-1", "0-2")
+        self.index.add("digest-1", PROTOCOL, CRITERIA, name="protocol.pdf")
+        self.index.add("digest-2", edited, dict(CRITERIA, performance_status_max=2), name="protocol.pdf")
+
+        assert len(self.index) == 2
+        assert self.index.query(PROTOCOL)["criteria"] == CRITERIA
+        assert self.index.query(edited)["criteria"]["performance_status_max"] == 2
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test a persisted index matches after reloading."""
+        path = tmp_path / "protocol_index.json"
+        ProtocolIndex(path=str(path)).add("v1", PROTOCOL, CRITERIA, name="v1.pdf")
+
+        reloaded = ProtocolIndex(path=str(path))
+        assert len(reloaded) == 1
+        match = reloaded.query(PROTOCOL)
+        assert match["criteria"] == CRITERIA
+        assert match["name"] == "v1.pdf"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
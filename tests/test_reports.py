@@ -0,0 +1,72 @@
+"""
+Unit tests for PDF report rendering.
+"""
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+pytest.importorskip("reportlab")
+
+from src.data.loader import DataLoader
+from src.utils.reports import (
+    get_report_styles, render_all_reports, render_trial_report, report_filename
+)
+
+class TestReports:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.trial = {
+            "trial_id": "TEST001",
+            "title": "Test EGFR Trial",
+            "description": "Test trial for EGFR patients",
+            "criteria": {"mutation_required": "EGFR+", "stage": ["IV"]}
+        }
+
+    def make_patients(self, count):
+        return pd.DataFrame({
+            'patient_id': [f"P{i}" for i in range(count)],
+            'age': [60] * count,
+            'stage': ['IV'] * count,
+            'mutation_status': ['EGFR+'] * count,
+            'performance_status': [1] * count
+        })
+
+    def test_styles_are_cached(self):
+        """Test style objects are built once per process."""
+        assert get_report_styles() is get_report_styles()
+
+    def test_render_trial_report(self):
+        """Test a single report renders to PDF bytes."""
+        pdf = render_trial_report(self.trial, self.make_patients(3))
+        assert pdf.startswith(b"%PDF")
+
+    def test_large_table_spans_pages(self):
+        """Test large patient tables flow across several pages."""
+        small = render_trial_report(self.trial, self.make_patients(5))
+        large = render_trial_report(self.trial, self.make_patients(600))
+        assert large.count(b"/Type /Page\n") > small.count(b"/Type /Page\n")
+
+    def test_report_filename_is_sanitized(self):
+        """Test trial ids are made filesystem safe."""
+        assert report_filename({"trial_id": "NCT 01/02"}, "x.json") == "eligible_patients_NCT_01_02.pdf"
+        assert report_filename({}, "trials/egfr.json") == "eligible_patients_egfr.pdf"
+
+    def test_render_all_reports(self, tmp_path):
+        """Test bulk rendering writes one report per trial."""
+        loader = DataLoader()
+        trials = loader.load_trials()
+
+        result = render_all_reports(loader.load_patients(), trials, str(tmp_path), workers=2)
+
+        assert len(result['reports']) == len(trials)
+        assert result['failed'] == []
+        assert result['reports_per_second'] > 0
+        assert all(Path(path).read_bytes().startswith(b"%PDF") for path in result['reports'])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""
+Unit tests for the patient repository.
+"""
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.repository import PatientRepository
+
+class TestPatientRepository:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.patients = pd.DataFrame({
+            'patient_id': ['P1000', 'P1001', 'P1010', 'P2000', 'p1002'],
+            'age': [60, 45, 56, 44, 70],
+            'stage': ['III', 'IV', 'II', 'IV', 'I'],
+        })
+        self.repository = PatientRepository(self.patients)
+
+    def test_get_returns_row(self):
+        """Test constant-time lookup by patient id."""
+        patient = self.repository.get('P1010')
+        assert patient['age'] == 56
+        assert patient['stage'] == 'II'
+
+    def test_get_unknown_patient(self):
+        """Test lookup of a missing id returns None."""
+        assert self.repository.get('P9999') is None
+        assert 'P9999' not in self.repository
+        assert 'P1000' in self.repository
+
+    def test_search_by_prefix(self):
+        """Test prefix search is sorted and case-insensitive."""
+        assert self.repository.search('P100') == ['P1000', 'P1001', 'p1002']
+        assert self.repository.search('p2') == ['P2000']
+        assert self.repository.search('X') == []
+
+    def test_search_respects_limit(self):
+        """Test that result lists are bounded."""
+        assert len(self.repository.search('', limit=2)) == 2
+        assert len(self.repository.search('')) == 5
+
+    def test_duplicate_ids_keep_first(self):
+        """Test duplicate ids resolve to the first row."""
+        patients = pd.DataFrame({
+            'patient_id': ['P1', 'P1', 'P2'],
+            'age': [50, 60, 70],
+        })
+        repository = PatientRepository(patients)
+        assert len(repository) == 2
+        assert repository.get('P1')['age'] == 50
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Unit tests for the trial full-text search index.
+"""
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.data.manifest import TrialManifest
+from src.matching.engine import TrialMatchEngine
+from src.matching.search import TrialSearchIndex, tokenize
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+OSIMERTINIB = {
+    "trial_id": "T2001",
+    "title": "Osimertinib in EGFR Mutant NSCLC",
+    "description": "Third-generation EGFR inhibitor for patients with brain metastases.",
+    "raw_inclusion": ["EGFR exon 19 deletion or L858R", "Stable brain metastases allowed"],
+    "raw_exclusion": ["Prior osimertinib"],
+    "criteria": {"stage": ["IV"], "mutation_required": "EGFR+", "performance_status_max": 1}
+}
+
+class TestTrialSearchIndex:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.trials = DataLoader(str(DATA_DIR)).load_trials()
+        self.index = TrialSearchIndex()
+        self.index.apply_trial_changes(self.trials, [])
+
+    def test_tokenize(self):
+        """Test tokens are lower-cased and stopwords dropped."""
+        assert tokenize("Trial for PD-L1 High patients") == ["trial", "pd", "l1", "high", "patients"]
+
+    def test_search_ranks_relevant_trials(self):
+        """Test keyword hits are ranked with the most specific trial first."""
+        self.index.apply_trial_changes({"trials/osimertinib.json": OSIMERTINIB}, [])
+
+        hits = self.index.search("osimertinib brain metastases")
+        assert [hit["trial_file"] for hit in hits] == ["trials/osimertinib.json"]
+        assert hits[0]["trial_id"] == "T2001"
+
+        hits = self.index.search("EGFR")
+        assert {hit["trial_file"] for hit in hits} >= {"trials/egfr.json", "trials/osimertinib.json"}
+        assert all(a["score"] >= b["score"] for a, b in zip(hits, hits[1:]))
+        assert self.index.search("the and of") == []
+
+    def test_incremental_updates_equal_rebuild(self):
+        """Test scores after updates and removals equal a fresh build."""
+        self.index.apply_trial_changes({"trials/osimertinib.json": OSIMERTINIB}, ["trials/combo.json"])
+        amended = dict(self.trials["trials/egfr.json"], description="Amended EGFR trial with osimertinib.")
+        self.index.apply_trial_changes({"trials/egfr.json": amended}, [])
+
+        expected = {f: t for f, t in self.trials.items() if f != "trials/combo.json"}
+        expected.update({"trials/osimertinib.json": OSIMERTINIB, "trials/egfr.json": amended})
+        rebuilt = TrialSearchIndex()
+        rebuilt.apply_trial_changes(expected, [])
+
+        for query in ["osimertinib", "egfr trial", "combination therapy", "nsclc"]:
+            assert self.index.search(query) == rebuilt.search(query)
+        assert "trials/combo.json" not in self.index
+        assert len(self.index) == len(rebuilt)
+
+    def test_search_eligible_filters_by_engine(self):
+        """Test only trials the patient can enter are returned."""
+        self.index.apply_trial_changes({"trials/osimertinib.json": OSIMERTINIB}, [])
+        engine = TrialMatchEngine()
+        engine.load_trials(dict(self.trials, **{"trials/osimertinib.json": OSIMERTINIB}))
+
+        eligible = pd.Series({"stage": "IV", "mutation_status": "EGFR+", "performance_status": 0})
+        ineligible = pd.Series({"stage": "IV", "mutation_status": "KRAS G12C", "performance_status": 0})
+
+        hits = self.index.search_eligible("osimertinib egfr", eligible, engine)
+        assert "trials/osimertinib.json" in [hit["trial_file"] for hit in hits]
+        assert all(hit["reasons"] for hit in hits)
+        assert self.index.search_eligible("osimertinib", ineligible, engine) == []
+
+    def test_loader_maintains_index(self, tmp_path):
+        """Test load_trials builds the index and reload_trials keeps it in sync."""
+        (tmp_path / "trials").mkdir()
+        for name in ["egfr.json", "combo.json"]:
+            (tmp_path / "trials" / name).write_text((DATA_DIR / "trials" / name).read_text())
+
+        index = TrialSearchIndex()
+        loader = DataLoader(str(tmp_path), search_index=index)
+        loader.load_trials(loader.discover_trial_files())
+        assert len(index) == 2
+
+        manifest = TrialManifest()
+        loader.reload_trials(manifest)
+        (tmp_path / "trials" / "combo.json").unlink()
+        loader.reload_trials(manifest)
+        assert "trials/combo.json" not in index
+        assert [hit["trial_file"] for hit in index.search("egfr")] == ["trials/egfr.json"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
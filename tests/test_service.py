@@ -0,0 +1,167 @@
+"""
+Unit tests for the HTTP matching service.
+"""
+import json
+import threading
+import pytest
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.matching.engine import TrialMatchEngine
+from src.service.batching import Backpressure, LatencyHistogram, MicroBatcher
+from src.service.loadgen import run_load
+from src.service.server import MatchingService, create_server
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+PATIENT = {
+    "patient_id": "EHR1",
+    "stage": "IV",
+    "mutation_status": "EGFR+",
+    "performance_status": 1
+}
+
+class TestMicroBatcher:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = TrialMatchEngine()
+        self.engine.load_trials(DataLoader(str(DATA_DIR)).load_trials())
+
+    def test_concurrent_requests_share_batches(self):
+        """Test requests arriving within the window are evaluated together."""
+        batcher = MicroBatcher(self.engine, workers=1, batch_window_ms=50).start()
+        try:
+            futures = [batcher.submit(dict(PATIENT, patient_id=f"P{i}")) for i in range(20)]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            batcher.close()
+
+        assert batcher.batched_requests == 20
+        assert batcher.batches < 20
+        egfr = next(m for m in results[0] if m["trial_file"] == "trials/egfr.json")
+        assert egfr["is_match"] == True
+
+    def test_batch_agrees_with_engine(self):
+        """Test batched evaluation equals per-patient matching."""
+        patients = DataLoader(str(DATA_DIR)).load_patients()
+        batcher = MicroBatcher(self.engine)
+
+        results = batcher.evaluate(patients.head(50).to_dict("records"))
+        for (_, patient), matches in zip(patients.head(50).iterrows(), results):
+            expected = [m["is_match"] for m in self.engine.find_matches_for_patient(patient)]
+            assert [m["is_match"] for m in matches] == expected
+
+    def test_full_queue_raises_backpressure(self):
+        """Test a bounded queue rejects work instead of growing."""
+        batcher = MicroBatcher(self.engine, max_queue=1)  # not started
+        batcher.submit(PATIENT)
+        with pytest.raises(Backpressure):
+            batcher.submit(PATIENT)
+
+class TestLatencyHistogram:
+
+    def test_percentiles(self):
+        """Test percentiles come from bucket upper bounds."""
+        histogram = LatencyHistogram()
+        for latency in [0.5] * 98 + [30, 700]:
+            histogram.record(latency)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["p50_ms"] == 1
+        assert snapshot["p99_ms"] == 50
+        assert snapshot["max_ms"] == 700
+
+class TestMatchingServer:
+
+    def setup_method(self):
+        """Start the service on a free local port."""
+        loader = DataLoader(str(DATA_DIR))
+        engine = TrialMatchEngine()
+        engine.load_trials(loader.load_trials())
+        self.batcher = MicroBatcher(engine, workers=2).start()
+        self.server = create_server(MatchingService(engine, loader.load_patients(), self.batcher), port=0)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.close()
+
+    def request(self, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        try:
+            with urllib.request.urlopen(urllib.request.Request(self.url + path, data=data)) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_match_posted_patient(self):
+        """Test patient -> trials for a posted record."""
+        status, body = self.request("/match/patient", PATIENT)
+        assert status == 200
+        assert "T1001" in [m["trial_id"] for m in body["matches"] if m["is_match"]]
+
+    def test_match_known_patient(self):
+        """Test patient -> trials for a loaded patient id."""
+        assert self.request("/patients/P1003/trials")[0] == 200
+        assert self.request("/patients/NOPE/trials")[0] == 404
+
+    def test_missing_fields_rejected(self):
+        """Test incomplete patient records get a 400."""
+        assert self.request("/match/patient", {"patient_id": "X"})[0] == 400
+
+    def test_mistyped_fields_rejected(self):
+        """Test a mistyped record gets a 400 and does not affect valid records."""
+        assert self.request("/match/patient", dict(PATIENT, performance_status="one"))[0] == 400
+        assert self.request("/match/patient", dict(PATIENT, performance_status=1.5))[0] == 400
+        assert self.request("/match/patient", dict(PATIENT, stage=4))[0] == 400
+        assert self.request("/match/patient", [PATIENT])[0] == 400
+
+        status, body = self.request("/match/patient", dict(PATIENT, performance_status="1"))
+        assert status == 200
+        assert "T1001" in [m["trial_id"] for m in body["matches"] if m["is_match"]]
+
+    def test_bad_pagination_rejected(self):
+        """Test non-integer pagination parameters get a 400."""
+        assert self.request("/trials/T1001/patients?page=abc")[0] == 400
+        assert self.request("/trials/T1001/patients?page_size=0")[0] == 400
+
+    def test_trial_patients_paginated(self):
+        """Test trial -> patients with pagination."""
+        status, body = self.request("/trials/T1001/patients?page=1&page_size=5")
+        assert status == 200
+        assert len(body["patients"]) == min(5, body["total"])
+        assert self.request("/trials/UNKNOWN/patients")[0] == 404
+
+        pages = [
+            self.request(f"/trials/T1001/patients?page={page}&page_size=5")[1]["patients"]
+            for page in range(1, body["total_pages"] + 1)
+        ]
+        everyone = self.request(f"/trials/T1001/patients?page_size={body['total']}")[1]["patients"]
+        assert [patient for page in pages for patient in page] == everyone
+        status, last = self.request("/trials/T1001/patients?page=999&page_size=5")
+        assert last["page"] == body["total_pages"]
+        assert last["patients"] == pages[-1]
+
+    def test_load_generator_and_metrics(self):
+        """Test the load generator and latency histogram endpoint."""
+        result = run_load(self.url, requests=100, concurrency=8)
+        assert result["statuses"] == {200: 100}
+        assert result["p99_ms"] >= result["p50_ms"]
+
+        status, metrics = self.request("/metrics/latency")
+        assert status == 200
+        assert metrics["latency"]["count"] >= 100
+        assert metrics["mean_batch_size"] >= 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
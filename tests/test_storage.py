@@ -0,0 +1,115 @@
+"""
+Unit tests for the SQLite storage backend.
+"""
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.data.storage import SQLiteBackend, StorageBackend, build_patient_filter
+from src.matching.engine import TrialMatchEngine
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+class TestSQLiteBackend:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        file_loader = DataLoader(str(DATA_DIR))
+        self.patients = file_loader.load_patients()
+        self.trials = file_loader.load_trials()
+
+        self.backend = SQLiteBackend(":memory:")
+        self.backend.import_patients_csv(DATA_DIR / "sample_patients.csv", chunksize=64)
+        self.backend.save_trials(self.trials)
+
+    def teardown_method(self):
+        self.backend.close()
+
+    def test_bulk_import_round_trip(self):
+        """Test patients and trials read back unchanged."""
+        loader = DataLoader(str(DATA_DIR), backend=self.backend)
+
+        patients = loader.load_patients()
+        pd.testing.assert_frame_equal(patients, self.patients, check_dtype=False)
+        assert loader.load_trials() == self.trials
+        assert list(loader.load_trials(["trials/egfr.json"])) == ["trials/egfr.json"]
+
+    def test_indexes_exist(self):
+        """Test the filter columns are indexed."""
+        indexes = {
+            row[1] for row in self.backend._conn.execute(
+                "SELECT type, name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        assert {"idx_patients_stage", "idx_patients_mutation",
+                "idx_patients_ps", "idx_trials_trial_id"} <= indexes
+
+    def test_pushdown_matches_engine(self):
+        """Test SQL candidate selection gives the same eligible patients."""
+        engine = TrialMatchEngine()
+
+        for trial in self.trials.values():
+            expected = engine.find_eligible_patients(self.patients, trial["criteria"])
+            actual = engine.find_eligible_patients(self.backend, trial["criteria"])
+            assert actual["patient_id"].tolist() == expected["patient_id"].tolist()
+
+    def test_pushdown_narrows_candidates(self):
+        """Test simple criteria are evaluated inside SQLite."""
+        criteria = {"stage": ["IV"], "mutation_required": "EGFR+", "performance_status_max": 1}
+        candidates = self.backend.query_patients(criteria)
+
+        assert len(candidates) < len(self.patients)
+        assert set(candidates["stage"]) <= {"IV"}
+
+    def test_filter_skips_unsupported_values(self):
+        """Test non-scalar criteria are left for the engine to check."""
+        where, params = build_patient_filter({"stage": [["IV"]], "performance_status_max": None})
+        assert where == []
+        assert params == []
+
+        # A single stage string is a substring test, not an exact match
+        assert build_patient_filter({"stage": "IIIB/IV", "performance_status_max": None}) == ([], [])
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test a backend missing interface methods fails when constructed."""
+        class PatientsOnly(StorageBackend):
+            def load_patients(self):
+                return pd.DataFrame()
+
+        with pytest.raises(TypeError):
+            PatientsOnly()
+
+    def test_trial_hashes_match_default(self):
+        """Test trial hashes cover every stored trial and change only for edited trials."""
+        hashes = self.backend.trial_hashes()
+        default = StorageBackend.trial_hashes(self.backend)
+        assert list(hashes) == list(default) == list(self.trials)
+
+        self.backend.save_trials({"trials/egfr.json": dict(self.trials["trials/egfr.json"], title="Changed")})
+        assert [f for f in hashes if hashes[f] != self.backend.trial_hashes()[f]] == ["trials/egfr.json"]
+        assert self.backend.trial_hashes(["trials/egfr.json"]).keys() == {"trials/egfr.json"}
+
+    def test_save_patients_requires_columns(self):
+        """Test incomplete patient frames are rejected."""
+        with pytest.raises(ValueError):
+            self.backend.save_patients(pd.DataFrame({"patient_id": ["P1"]}))
+
+    def test_duplicate_patient_ids_rejected(self, tmp_path):
+        """Test duplicate ids raise instead of silently collapsing into one row."""
+        with pytest.raises(ValueError, match="duplicate patient_id"):
+            self.backend.save_patients(pd.concat([self.patients.head(3), self.patients.head(1)]))
+
+        # Duplicate in a later chunk: the whole import is rolled back
+        duplicated = tmp_path / "patients.csv"
+        pd.concat([self.patients, self.patients.head(1)]).to_csv(duplicated, index=False)
+        with pytest.raises(ValueError, match="Duplicate patient_id"):
+            self.backend.import_patients_csv(duplicated, chunksize=64)
+        assert len(self.backend.load_patients()) == len(self.patients)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Unit tests for what-if criteria sweeps.
+"""
+import pytest
+import pandas as pd
+import sys
+from itertools import product
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.matching.engine import TrialMatchEngine
+from src.matching.sweep import CriteriaSweep, ps_max_choices
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+STAGE_OPTIONS = [None, [], ["IV"], ["III", "IV"], ["I", "II", "IIIA"]]
+MUTATION_OPTIONS = [None, "EGFR+", ["EGFR+", "PD-L1 High"], ["KRAS"]]
+PS_OPTIONS = [-1, 0, 1, 2, 4]
+
+class TestCriteriaSweep:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        patients = DataLoader(str(DATA_DIR)).load_patients()
+        # Add rows with missing values to cover the engine's NaN handling
+        extra = pd.DataFrame([
+            {'patient_id': 'X1', 'stage': 'IV', 'mutation_status': 'EGFR+', 'performance_status': None},
+            {'patient_id': 'X2', 'stage': None, 'mutation_status': 'EGFR+', 'performance_status': 0},
+        ])
+        self.patients = pd.concat([patients, extra], ignore_index=True)
+        self.engine = TrialMatchEngine()
+        self.sweep = CriteriaSweep.from_patients(self.patients)
+
+    def engine_count(self, stages, mutations, ps_max):
+        criteria = {"performance_status_max": ps_max}
+        if stages is not None:
+            criteria["stage"] = stages
+        if mutations is not None:
+            criteria["mutation_required"] = mutations
+        return int(self.engine.eligible_mask(self.patients, criteria).sum())
+
+    def test_count_matches_engine(self):
+        """Test single-variant counts equal a full engine re-match."""
+        for stages, mutations, ps_max in product(STAGE_OPTIONS, MUTATION_OPTIONS, PS_OPTIONS):
+            assert self.sweep.count(stages, mutations, ps_max) == self.engine_count(stages, mutations, ps_max), \
+                (stages, mutations, ps_max)
+
+    def test_sweep_grid_matches_engine(self):
+        """Test a whole grid of variants in one call."""
+        grid = self.sweep.sweep(STAGE_OPTIONS, MUTATION_OPTIONS, PS_OPTIONS)
+
+        assert len(grid) == len(STAGE_OPTIONS) * len(MUTATION_OPTIONS) * len(PS_OPTIONS)
+        expected = [
+            self.engine_count(stages, mutations, ps_max)
+            for ps_max in PS_OPTIONS
+            for stages, mutations in product(STAGE_OPTIONS, MUTATION_OPTIONS)
+        ]
+        assert grid["eligible"].tolist() == expected
+
+    def test_trial_variants(self):
+        """Test what-if deltas around a real trial."""
+        trial = DataLoader(str(DATA_DIR)).load_trials()["trials/egfr.json"]
+        grid = self.sweep.trial_variants(trial["criteria"], add_stages=["I"], ps_max_options=[1, 2])
+
+        baseline = grid[(grid["stages"] == "II, III, IV") & (grid["performance_status_max"] == 1)]
+        assert baseline["change"].tolist() == [0]
+        assert baseline["eligible"].iloc[0] == int(self.engine.eligible_mask(self.patients, trial["criteria"]).sum())
+        assert (grid["change"] >= 0).all()
+        assert set(grid["stages"]) == {"II, III, IV", "II, III, IV, I"}
+
+    def test_unusual_ps_limits(self):
+        """Test PS choices and variants for limits outside 0-4, floats and non-numeric values."""
+        assert ps_max_choices({}) == ([0, 1, 2, 3, 4], [2])
+        assert ps_max_choices({"performance_status_max": 1.0}) == ([0, 1, 2, 3, 4], [1])
+        assert ps_max_choices({"performance_status_max": 5}) == ([0, 1, 2, 3, 4, 5], [5])
+        assert ps_max_choices({"performance_status_max": None}) == ([0, 1, 2, 3, 4], [])
+        assert ps_max_choices({"performance_status_max": "ECOG 0-1"}) == ([0, 1, 2, 3, 4], [])
+
+        grid = self.sweep.trial_variants({"performance_status_max": None})
+        assert grid["performance_status_max"].tolist() == [0, 1, 2, 3, 4]
+        assert (grid["change"] == grid["eligible"]).all()
+        assert self.engine.eligible_mask(self.patients, {"performance_status_max": None}).sum() == 0
+
+    pytest.main([__file__, "-v"])
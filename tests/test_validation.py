@@ -0,0 +1,114 @@
+"""
+Unit tests for value-level cohort validation.
+"""
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data.loader import DataLoader
+from src.data.storage import SQLiteBackend
+from src.data.validation import CohortValidator, validate_patients
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+def make_patients(rows):
+    columns = ['patient_id', 'age', 'gender', 'stage', 'mutation_status', 'smoker', 'performance_status']
+    return pd.DataFrame(rows, columns=columns)
+
+class TestCohortValidator:
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.patients = DataLoader(str(DATA_DIR)).load_patients()
+
+    def test_sample_data_is_valid(self):
+        """Test the bundled cohort passes every rule."""
+        validator = CohortValidator()
+        valid_rows = validator.validate_chunk(self.patients)
+
+        assert validator.valid
+        assert validator.report().empty
+        assert valid_rows.all()
+
+    def test_value_violations(self):
+        """Test each bad value is counted under its rule with the patient id as sample."""
+        patients = make_patients([
+            ["P1", 64, "Male", "IV", "EGFR+", True, 1],
+            ["P2", 71, "Female", "V", None, False, 7],
+            ["P3", -2, "Female", "IIIB", "KRAS G12C", "maybe", 1.5],
+            ["P4", 58, "Unknown", "II", None, False, "ECOG 1"],
+            ["P1", 66, "Male", "IV", "ALK+", True, None],
+        ])
+        validator = CohortValidator()
+        valid_rows = validator.validate_chunk(patients)
+        report = validator.report().set_index(["column", "rule"])
+
+        assert valid_rows.tolist() == [True, False, False, False, False]
+        assert report.loc[("patient_id", "duplicate"), "sample_ids"] == ["P1"]
+        assert report.loc[("age", "range"), "sample_ids"] == ["P3"]
+        assert report.loc[("stage", "domain"), "sample_ids"] == ["P2"]
+        assert report.loc[("gender", "domain"), "sample_ids"] == ["P4"]
+        assert report.loc[("smoker", "type"), "sample_ids"] == ["P3"]
+        assert report.loc[("performance_status", "range"), "sample_ids"] == ["P2", "P3"]
+        assert report.loc[("performance_status", "type"), "sample_ids"] == ["P4"]
+        assert report.loc[("performance_status", "missing"), "sample_ids"] == ["P1"]
+
+    def test_smoker_must_be_boolean(self):
+        """Test numeric 1/0 smoker values are rejected while booleans and their text pass."""
+        numeric = self.patients.assign(smoker=1)
+        assert validate_patients(numeric)["violations"].tolist() == [len(self.patients)]
+
+        mixed = self.patients.head(5).assign(smoker=pd.Series([True, "False", 1, 0.0, None], dtype=object))
+        report = validate_patients(mixed)
+        assert report["sample_ids"].tolist() == [list(mixed["patient_id"].iloc[2:])]
+
+    def test_missing_column(self):
+        """Test a missing column is reported against every row."""
+        report = validate_patients(self.patients.drop(columns=["smoker"]))
+
+        assert report.to_dict(orient="records") == [{
+            "rule": "missing_column", "column": "smoker",
+            "violations": len(self.patients), "sample_ids": list(self.patients["patient_id"].head(5))
+        }]
+
+    def test_chunks_match_single_pass(self):
+        """Test duplicates across chunks are found and counts match one full pass."""
+        patients = pd.concat([self.patients, self.patients.head(3)], ignore_index=True)
+        patients.loc[10, "performance_status"] = 9
+
+        single = CohortValidator()
+        single.validate_chunk(patients)
+        chunked = CohortValidator(sample_size=2)
+        for start in range(0, len(patients), 7):
+            chunked.validate_chunk(patients.iloc[start:start + 7])
+
+        counts = chunked.report().set_index(["column", "rule"])["violations"]
+        assert counts.to_dict() == single.report().set_index(["column", "rule"])["violations"].to_dict()
+        assert counts[("patient_id", "duplicate")] == 3
+        assert chunked.report().set_index(["column", "rule"]).loc[("patient_id", "duplicate"), "sample_ids"] == \
+            list(self.patients["patient_id"].head(2))
+
+    def test_streaming_load_paths(self, tmp_path):
+        """Test the chunked CSV load and the SQLite import validate every chunk."""
+        patients = self.patients.copy()
+        patients.loc[5, "stage"] = "Stage 4"
+        patients.to_csv(tmp_path / "sample_patients.csv", index=False)
+
+        validator = CohortValidator()
+        loaded = DataLoader(str(tmp_path)).load_patients(validator=validator, chunksize=16)
+        assert len(loaded) == len(patients)
+        assert validator.report()[["rule", "column", "violations"]].values.tolist() == [["domain", "stage", 1]]
+
+        backend = SQLiteBackend(":memory:")
+        validator = CohortValidator()
+        assert backend.import_patients_csv(tmp_path / "sample_patients.csv", chunksize=16,
+                                           validator=validator) == len(patients)
+        assert validator.report()["sample_ids"].tolist() == [[patients.loc[5, "patient_id"]]]
+        backend.close()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])